@@ -1,23 +1,449 @@
 # AbletonMCP/init.py
-from __future__ import absolute_import, print_function, unicode_literals
+# Needs Live 11 or newer: the script uses Python 3 (selectors, yield from)
 
 from _Framework.ControlSurface import ControlSurface
 import socket
 import json
+import queue
+import selectors
+import struct
 import threading
 import time
 import traceback
-
-# Change queue import for Python 2
-try:
-    import Queue as queue  # Python 2
-except ImportError:
-    import queue  # Python 3
+import types
+from collections import OrderedDict, deque
 
 # Constants for socket communication
 DEFAULT_PORT = 9877
 HOST = "localhost"
 
+# Length-prefixed framing, negotiated per connection with a legacy "hello".
+# Header: 4-byte magic, 1-byte protocol version, 4-byte big-endian body length.
+# From version 2 responses echo the request "id" and may arrive out of order.
+# From version 3 a response whose JSON is longer than STREAM_THRESHOLD
+# characters is streamed: its header carries STREAMED_LENGTH and the body
+# follows as chunks, each a 4-byte big-endian length and that many bytes,
+# ended by an empty chunk. Chunks are encoded as the socket drains, so a large
+# reply is never held as one string in Live's process.
+# Keep in sync with MCP_Server/protocol.py.
+FRAME_MAGIC = b"AMCP"
+PROTOCOL_VERSION = 3
+STREAMED_FRAME_VERSION = 3
+FRAME_HEADER = struct.Struct("!4sBI")
+CHUNK_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+STREAMED_LENGTH = 0xFFFFFFFF
+STREAM_THRESHOLD = 256 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Main-thread work is queued and drained in update_display until this many
+# milliseconds of the tick are used; at least one task runs per tick
+MAIN_THREAD_BUDGET_MS = 10.0
+
+# Admission control for main-thread commands: at most this many may be queued
+# or running at once, overall and per client. Commands over either limit are
+# refused straight away with a "busy" error and a retry_after_ms hint based on
+# how long queued commands currently wait (clamped to this range).
+MAX_PENDING_COMMANDS = 64
+MAX_PENDING_PER_CLIENT = 16
+BUSY_RETRY_MIN_MS = 10.0
+BUSY_RETRY_MAX_MS = 2000.0
+
+# Long-running handlers are generators resumed on later ticks (see _step_tasks);
+# they report progress to the caller at most this often (seconds)
+TASK_PROGRESS_INTERVAL = 0.25
+
+# The session snapshot is kept up to date part by part: the song-level parts
+# below, "tracks" (the track list) and ("track", i). Changes mark parts dirty
+# and each tick re-reads dirty parts, oldest first, within the main-thread
+# budget (at least one per tick). Leftover budget re-reads every part once per
+# SNAPSHOT_REFRESH_INTERVAL seconds to pick up edits no listener reported.
+SNAPSHOT_LISTS = ("session", "scenes", "return_tracks", "locators")
+SNAPSHOT_REFRESH_INTERVAL = 1.0
+
+# Browser URI index: categories crawled, how deep, and how often it is rebuilt
+# to drop items that disappeared from the library (seconds)
+BROWSER_INDEX_ROOTS = ("instruments", "sounds", "drums", "audio_effects", "midi_effects")
+BROWSER_INDEX_MAX_DEPTH = 10
+BROWSER_INDEX_REFRESH_INTERVAL = 600.0
+
+# Categories walked by get_browser_tree and crawl_browser for category_type "all"
+BROWSER_CATEGORIES = ("instruments", "sounds", "drums", "audio_effects", "midi_effects", "plugins")
+
+# crawl_browser pages: default node count, main-thread time per page (ms), how
+# long an idle crawl is kept for resuming (seconds), and how many are kept
+BROWSER_CRAWL_PAGE_SIZE = 500
+BROWSER_CRAWL_PAGE_MS = 20.0
+BROWSER_CRAWL_TTL = 300.0
+BROWSER_CRAWL_MAX = 8
+
+# Resolved get_browser_items_at_path paths kept, least recently used dropped first
+BROWSER_PATH_CACHE_SIZE = 512
+
+# Change notifications a client can subscribe to (protocol version 2 only).
+# Changes are coalesced per object and pushed once per tick as frames of the
+# form {"event": "changes", "seq": n, "changes": [...]} without an "id".
+EVENT_KINDS = ("tempo", "is_playing", "tracks", "scenes", "clip_slots", "device_parameters",
+               "return_tracks", "locators")
+# Event kinds whose clip and parameter listeners are only registered while a
+# client is subscribed to them; there are too many to keep for the script's lifetime
+SUBSCRIBED_LISTENER_KINDS = ("clip_slots", "device_parameters")
+
+# Version counter keys; objects are keyed like ("track", 3) or ("clip", 3, 0)
+SONG_VERSION = ("song",)
+STRUCTURE_VERSION = ("structure",)
+
+# Listener change kind -> version counters it bumps
+CHANGE_VERSION_KEYS = {
+    "tracks": lambda key: [SONG_VERSION, STRUCTURE_VERSION],
+    "scenes": lambda key: [SONG_VERSION, STRUCTURE_VERSION],
+    "track": lambda key: [("track", key[1])],
+    "clip_slot": lambda key: [("track", key[1]), ("clip", key[1], key[2])],
+    "devices": lambda key: [("track", key[1]), ("devices", key[1])],
+    "device_parameter": lambda key: [("device", key[1], key[2])],
+}
+
+# Listener change kind -> session snapshot parts it makes stale; device
+# parameters and the transport are not part of the snapshot
+CHANGE_SNAPSHOT_PARTS = {
+    "tempo": lambda key: ["session"],
+    "master": lambda key: ["session"],
+    "is_playing": lambda key: [],
+    "tracks": lambda key: ["tracks", "session"],
+    # Every track has one clip slot per scene
+    "scenes": lambda key: ["scenes", "tracks"],
+    "scene": lambda key: ["scenes"],
+    "return_tracks": lambda key: ["return_tracks", "session"],
+    "cue_points": lambda key: ["locators"],
+    "track": lambda key: [("track", key[1])],
+    "clip_slot": lambda key: [("track", key[1])],
+    "devices": lambda key: [("track", key[1])],
+    "device_parameter": lambda key: [],
+}
+
+# Clip properties whose changes are reported as clip slot changes
+CLIP_LISTENED_PROPERTIES = ("name", "color", "looping", "loop_start", "loop_end", "start_marker", "end_marker")
+
+# Command registry: every socket command is described once here.
+#   handler  - name of the AbletonMCP method that runs it
+#   thread   - MAIN_THREAD commands are scheduled on Live's main thread,
+#              IO_THREAD commands are answered on the client's thread
+#   mutating - whether the command changes Live's state
+#   timeout  - seconds a client should wait for the reply
+#   params   - (name, type, default) in handler argument order; REQUIRED
+#              marks parameters without a default
+#   main_handler - for reads answered from the session snapshot, the method
+#              that reads the Live Object Model directly; used when the
+#              command already runs on the main thread (inside a batch)
+#   channel  - the handler also receives the client's event channel, which
+#              is None for connections that cannot receive pushed events
+#   refreshes - session snapshot parts (see SNAPSHOT_LISTS) a mutating command
+#              without a track_index may change; None for all of them
+# Clients fetch the table with "get_command_registry".
+MAIN_THREAD = "main"
+IO_THREAD = "io"
+REQUIRED = object()
+PARAM_TYPES = {"int": int, "float": float, "bool": bool}
+
+
+class Command(object):
+    """Registry entry describing one socket command"""
+
+    def __init__(self, handler, thread=IO_THREAD, mutating=False, timeout=None, params=(), main_handler=None,
+                 channel=False, refreshes=None):
+        self.handler = handler
+        self.thread = thread
+        self.mutating = mutating
+        self.timeout = timeout if timeout is not None else (15.0 if mutating else 10.0)
+        self.params = params
+        self.main_handler = main_handler
+        self.channel = channel
+        self.refreshes = refreshes
+
+    def bind(self, params):
+        """Build handler keyword arguments from request params using the schema"""
+        kwargs = {}
+        for name, type_name, default in self.params:
+            value = params.get(name, default)
+            if value is REQUIRED:
+                raise ValueError("Missing parameter: " + name)
+            if value is not None and type_name in PARAM_TYPES:
+                value = PARAM_TYPES[type_name](value)
+            kwargs[name] = value
+        return kwargs
+
+    def describe(self):
+        return {
+            "thread": self.thread,
+            "mutating": self.mutating,
+            "timeout": self.timeout,
+            "snapshot": self.main_handler is not None,
+            "params": [
+                {"name": name, "type": type_name,
+                 "required": default is REQUIRED,
+                 "default": None if default is REQUIRED else default}
+                for name, type_name, default in self.params
+            ]
+        }
+
+
+def _main(handler, params=(), mutating=True, timeout=None, refreshes=None):
+    return Command(handler, MAIN_THREAD, mutating, timeout, params, refreshes=refreshes)
+
+
+def _io(handler, params=(), timeout=None):
+    return Command(handler, IO_THREAD, False, timeout, params)
+
+
+def _snapshot(handler, main_handler, params=()):
+    return Command(handler, IO_THREAD, False, None, params, main_handler)
+
+
+# Values for refreshes: nothing in the snapshot, or one of its song-level parts
+NO_PARTS = ()
+SESSION = ("session",)
+SCENES = ("scenes",)
+LOCATORS = ("locators",)
+
+TRACK = ("track_index", "int", 0)
+CLIP = ("clip_index", "int", 0)
+DEVICE = ("device_index", "int", 0)
+VIEW_NAME = ("view_name", "str", "")
+ON = ("on", "bool", False)
+# Conditional reads: reply {"not_modified": true} if the object still has this version
+IF_VERSION = ("if_version", "int", None)
+# get_session_snapshot depth 0: a track's mixer state without clips or devices
+SESSION_TRACK_FIELDS = ("name", "is_audio_track", "is_midi_track", "mute", "solo", "arm", "volume", "panning",
+                        "sends", "clip_slot_count")
+# Projection and pagination of large replies; see _project and _page
+FIELDS = ("fields", "list", None)
+OFFSET = ("offset", "int", 0)
+LIMIT = ("limit", "int", None)
+
+
+def _page(count, offset, limit):
+    """The index range selected by offset/limit in a list of count items"""
+    start = min(max(offset, 0), count)
+    stop = count if limit is None else min(start + max(limit, 0), count)
+    return range(start, stop)
+
+
+def _project(info, fields, keep=("index", "version")):
+    """Keep only the requested keys of a reply dict (plus identifying ones); None keeps all"""
+    if fields is None:
+        return info
+    return dict((key, value) for key, value in info.items() if key in fields or key in keep)
+
+COMMANDS = {
+    # Protocol
+    "hello": _io("_hello", [("protocol_version", "int", 0)]),
+    "ping": _io("_ping"),
+    "get_command_registry": _io("_get_command_registry"),
+    "get_main_thread_queue_stats": _io("_get_main_thread_queue_stats"),
+    # Listeners are added and removed on the main thread
+    "subscribe": Command("_subscribe", MAIN_THREAD, params=[("events", "list", None)], channel=True),
+    "unsubscribe": Command("_unsubscribe", MAIN_THREAD, channel=True),
+    # Request ids are per connection, so cancel only reaches this connection's commands
+    "cancel": Command("_cancel", IO_THREAD, params=[("request_id", "int", REQUIRED)], channel=True),
+    "set_main_thread_budget": _io("_set_main_thread_budget", [("budget_ms", "float", MAIN_THREAD_BUDGET_MS)]),
+    # Several commands run back to back in one main-thread task
+    # Its sub-commands mark what they change themselves
+    "batch": _main("_run_batch", [("commands", "list", []), ("stop_on_error", "bool", True)], refreshes=NO_PARTS),
+
+    # Session, application and track queries
+    "get_session_info": _snapshot("_snapshot_session_info", "_get_session_info"),
+    # One walk of the whole set; depth 2 includes every device parameter
+    "get_session_snapshot": _main("_get_session_snapshot", [("depth", "int", 1)], mutating=False, timeout=30.0),
+    "get_application_info": _io("_get_application_info"),
+    "get_application_view_state": _io("_get_application_view_state"),
+    "get_application_process_usage": _io("_get_application_process_usage"),
+    "get_application_version": _io("_get_application_version"),
+    "get_application_document": _io("_get_application_document"),
+    "list_control_surfaces": _io("_list_control_surfaces"),
+    "list_scenes": _snapshot("_snapshot_scenes", "_list_scenes", [FIELDS, OFFSET, LIMIT]),
+    "get_track_info": _snapshot("_snapshot_track_info", "_get_track_info",
+                                [TRACK, IF_VERSION, FIELDS, OFFSET, LIMIT]),
+    "get_device_details": _main("_get_device_details", [TRACK, DEVICE], mutating=False),
+    "find_device_by_name": _main("_find_device_by_name", [TRACK, ("device_name", "str", "")], mutating=False),
+    "get_clip_info": _snapshot("_snapshot_clip_info", "_get_clip_info", [TRACK, CLIP, IF_VERSION]),
+    "list_locators": _snapshot("_snapshot_locators", "_list_locators"),
+    "list_return_tracks": _snapshot("_snapshot_return_tracks", "_list_return_tracks"),
+    "get_current_song_time_beats": _main("_get_current_song_time_beats", mutating=False),
+    "get_device_parameters": _main("_get_device_parameters", [TRACK, DEVICE, IF_VERSION, FIELDS, OFFSET, LIMIT],
+                                   mutating=False),
+
+    # Browser
+    # The browser is too large to mirror in the snapshot; walk it on the main thread
+    "get_browser_item": _main("_get_browser_item", [("uri", "str", None), ("path", "str", None)], mutating=False),
+    "get_browser_tree": _main("get_browser_tree", [("category_type", "str", "all"), ("max_depth", "int", 2)],
+                              mutating=False, timeout=30.0),
+    "get_browser_items_at_path": _main("get_browser_items_at_path", [("path", "str", ""), FIELDS, OFFSET, LIMIT],
+                                       mutating=False),
+    "load_browser_item": _main("_load_browser_item", [TRACK, ("item_uri", "str", "")]),
+    "crawl_browser": _main("_crawl_browser", [("category_type", "str", "all"),
+                                              ("max_depth", "int", BROWSER_INDEX_MAX_DEPTH),
+                                              ("page_size", "int", BROWSER_CRAWL_PAGE_SIZE),
+                                              ("cursor", "str", None)], mutating=False),
+    "refresh_browser_index": _main("_refresh_browser_index", mutating=False),
+    "get_browser_index_stats": _io("_get_browser_index_stats"),
+
+    # Tracks, clips and scenes
+    "create_midi_track": _main("_create_midi_track", [("index", "int", -1)]),
+    "create_audio_track": _main("_create_audio_track", [("index", "int", -1)]),
+    "set_track_name": _main("_set_track_name", [TRACK, ("name", "str", "")]),
+    "create_clip": _main("_create_clip", [TRACK, CLIP, ("length", "float", 4.0)]),
+    "add_notes_to_clip": _main("_add_notes_to_clip", [TRACK, CLIP, ("notes", "list", [])]),
+    "set_clip_name": _main("_set_clip_name", [TRACK, CLIP, ("name", "str", "")]),
+    "fire_clip": _main("_fire_clip", [TRACK, CLIP]),
+    "stop_clip": _main("_stop_clip", [TRACK, CLIP]),
+    "fire_scene": _main("_fire_scene", [("scene_index", "int", 0)]),
+    "create_scene": _main("_create_scene", [("scene_index", "int", -1)]),
+    "rename_scene": _main("_rename_scene", [("scene_index", "int", 0), ("name", "str", "")], refreshes=SCENES),
+    "stop_all_clips": _main("_stop_all_clips", [("quantized", "int", 1)]),
+
+    # Devices, mixer and automation
+    "set_device_parameter": _main("_set_device_parameter", [
+        TRACK, DEVICE, ("value", "float", 0),
+        ("parameter_index", "int", None), ("parameter_name", "str", None)]),
+    "delete_device": _main("_delete_device", [TRACK, DEVICE]),
+    "set_send_level": _main("_set_send_level", [TRACK, ("send_index", "int", 0), ("level", "float", 0.0)]),
+    "write_automation": _main("_write_automation", [
+        ("track_index", "int", REQUIRED), ("clip_index", "int", REQUIRED),
+        ("device_index", "int", REQUIRED), ("points", "list", REQUIRED),
+        ("parameter_index", "int", None), ("parameter_name", "str", None)]),
+
+    # Transport
+    # Clips that start or stop playing as a result are reported by their listeners
+    "set_tempo": _main("_set_tempo", [("tempo", "float", 120.0)], refreshes=SESSION),
+    "start_playback": _main("_start_playback", refreshes=NO_PARTS),
+    "stop_playback": _main("_stop_playback", refreshes=NO_PARTS),
+    "continue_playing": _main("_continue_playing", refreshes=NO_PARTS),
+    "play_selection": _main("_play_selection", refreshes=NO_PARTS),
+    "set_record_mode": _main("_set_record_mode", [ON], refreshes=NO_PARTS),
+    "set_metronome": _main("_set_metronome", [ON], refreshes=NO_PARTS),
+    "set_loop": _main("_set_loop", [ON], refreshes=NO_PARTS),
+    "set_loop_region": _main("_set_loop_region", [("start", "float", 0.0), ("length", "float", 0.0)],
+                             refreshes=NO_PARTS),
+    "set_clip_trigger_quantization": _main("_set_clip_trigger_quantization", [("quant", "int", 4)],
+                                           refreshes=NO_PARTS),
+    "set_arrangement_overdub": _main("_set_arrangement_overdub", [ON], refreshes=NO_PARTS),
+    "set_session_automation_record": _main("_set_session_automation_record", [ON], refreshes=NO_PARTS),
+    "trigger_session_record": _main("_trigger_session_record", [("record_length", "float", None)],
+                                    refreshes=NO_PARTS),
+    "re_enable_automation": _main("_re_enable_automation", refreshes=NO_PARTS),
+
+    # Arrangement position and cue points
+    "set_song_position": _main("_set_song_position", [("time", "float", 0.0)], refreshes=NO_PARTS),
+    "set_current_song_time_beats": _main("_set_current_song_time_beats", [("beats", "float", 0.0)],
+                                         refreshes=NO_PARTS),
+    "set_start_time": _main("_set_start_time", [("beats", "float", 0.0)], refreshes=NO_PARTS),
+    "set_back_to_arranger": _main("_set_back_to_arranger", [ON], refreshes=NO_PARTS),
+    "jump_by": _main("_jump_by", [("beats", "float", 0.0)], refreshes=NO_PARTS),
+    "jump_by_beats": _main("_jump_by", [("beats", "float", 0.0)], refreshes=NO_PARTS),
+    "create_locator": _main("_create_locator", [("time", "float", 0.0)], refreshes=LOCATORS),
+    "jump_to_next_cue": _main("_jump_to_next_cue", refreshes=NO_PARTS),
+    "jump_to_prev_cue": _main("_jump_to_prev_cue", refreshes=NO_PARTS),
+    "jump_to_cue": _main("_jump_to_cue", [("index", "int", 0)], refreshes=NO_PARTS),
+    "toggle_cue_at_current": _main("_toggle_cue_at_current", refreshes=LOCATORS),
+    "rename_cue_point": _main("_rename_cue_point", [("cue_index", "int", 0), ("name", "str", "")],
+                              refreshes=LOCATORS),
+
+    # Arrangement layout helpers
+    "duplicate_track_clip_to_arrangement": _main("_duplicate_track_clip_to_arrangement", [
+        TRACK, CLIP, ("start_beats", "float", 0.0), ("length_beats", "float", 0.0), ("loop", "bool", None)]),
+    # Arrangement clips are not part of the snapshot
+    "clear_arrangement": _main("_clear_arrangement", [("track_indices", "list", None)], refreshes=NO_PARTS),
+
+    # Application and Application.View
+    "show_message": _main("_show_message", [("message", "str", "")], refreshes=NO_PARTS),
+    "press_current_dialog_button": _main("_press_current_dialog_button", [("index", "int", 0)],
+                                         refreshes=NO_PARTS),
+    "application_view_available_main_views": _main("_application_view_available_main_views", mutating=False),
+    "application_view_is_view_visible": _main("_application_view_is_view_visible", [VIEW_NAME], mutating=False),
+    "application_view_focus_view": _main("_application_view_focus_view", [VIEW_NAME], refreshes=NO_PARTS),
+    "application_view_hide_view": _main("_application_view_hide_view", [VIEW_NAME], refreshes=NO_PARTS),
+    "application_view_show_view": _main("_application_view_show_view", [VIEW_NAME], refreshes=NO_PARTS),
+    "application_view_toggle_browse": _main("_application_view_toggle_browse", refreshes=NO_PARTS),
+    "application_view_scroll_view": _main("_application_view_scroll_view", [
+        ("direction", "int", 0), VIEW_NAME, ("modifier_pressed", "bool", False)], refreshes=NO_PARTS),
+    "application_view_zoom_view": _main("_application_view_zoom_view", [
+        ("direction", "int", 0), VIEW_NAME, ("modifier_pressed", "bool", False)], refreshes=NO_PARTS),
+}
+
+class ClientConnection(object):
+    """One connected client, owned by the I/O thread.
+
+    put() may be called from any thread: it queues a reply or event frame and
+    wakes the I/O thread, which encodes and writes it. The connection is also
+    the channel that subscriptions and cancel are keyed by.
+    """
+
+    def __init__(self, sock, address, wake):
+        self.sock = sock
+        self.address = address
+        self.version = 0  # Bare JSON until a hello switches to framing
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        # (legacy wait, message) pairs; deque appends and pops are thread-safe
+        self.outbox = deque()
+        self.closed = False
+        # The command a legacy client is waiting on; see AbletonMCP._dispatch_legacy
+        self.waiting = None
+        # Chunks of the streamed frame being written; later frames wait for it
+        self.stream = None
+        self._wake = wake
+
+    def put(self, message, waiting=None):
+        if not self.closed:
+            self.outbox.append((waiting, message))
+            self._wake()
+
+
+def _longer_than(value, limit):
+    """Whether value's JSON encoding is roughly longer than limit characters.
+
+    Walks the value only until the estimate passes the limit, so it is cheap
+    for small replies and bounded for large ones.
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            size += 2 + 4 * len(item)
+            stack.extend(item)
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            size += 2 + 2 * len(item)
+            stack.extend(item)
+        elif isinstance(item, str):
+            size += 2 + len(item)
+        else:
+            size += 8
+        if size > limit:
+            return True
+    return False
+
+
+def _stream_frame(message, version):
+    """Encode a message as a streamed frame, one bounded chunk at a time"""
+    yield FRAME_HEADER.pack(FRAME_MAGIC, version, STREAMED_LENGTH)
+    parts = []
+    size = 0
+    for part in json.JSONEncoder().iterencode(message):
+        parts.append(part)
+        size += len(part)
+        if size >= STREAM_CHUNK_SIZE:
+            data = "".join(parts).encode('utf-8')
+            yield CHUNK_HEADER.pack(len(data)) + data
+            parts = []
+            size = 0
+    if parts:
+        data = "".join(parts).encode('utf-8')
+        yield CHUNK_HEADER.pack(len(data)) + data
+    yield CHUNK_HEADER.pack(0)
+
+
 def create_instance(c_instance):
     """Create and return the AbletonMCP script instance"""
     return AbletonMCP(c_instance)
@@ -32,12 +458,102 @@ class AbletonMCP(ControlSurface):
         
         # Socket server for communication
         self.server = None
-        self.client_threads = []
         self.server_thread = None
+        self._selector = None
+        self._wake_receiver = self._wake_sender = None
+        self._clients = set()
+        self._wake_pending = False
         self.running = False
         
         # Cache the song reference for easier access
         self._song = self.song()
+
+        # Reported by hello/ping so clients can tell when Live was restarted
+        self._start_time = time.time()
+
+        # Main-thread work queue, drained in update_display
+        self._main_thread_queue = queue.Queue()
+        self._main_thread_budget_ms = MAIN_THREAD_BUDGET_MS
+        self._queue_stats_lock = threading.Lock()
+        # Admitted main-thread commands not yet answered, per client and in total
+        self._admission_lock = threading.Lock()
+        self._admitted = {}
+        self._admitted_total = 0
+        # (channel, request id) -> state of main-thread commands not yet answered,
+        # so they can be cancelled (see _cancel)
+        self._inflight = {}
+        # Moving average of how long queued commands wait for the main thread
+        self._wait_average_ms = 0.0
+        # (snapshot change seq, send, message) held until the snapshot includes
+        # that change (see _flush_deferred)
+        self._deferred_replies = []
+        # Long-running main-thread commands in progress, resumed every tick
+        self._tasks = []
+
+        # Read-only session snapshot, refreshed part by part on the main thread
+        # into a working copy that is then published (see _refresh_snapshot)
+        self._snapshot = None
+        self._snapshot_work = None
+        self._snapshot_ready = threading.Event()
+        # Dirty part -> seq of the oldest change not yet re-read, oldest first
+        self._snapshot_dirty = OrderedDict()
+        self._snapshot_seq = 0
+        # Nothing is published while parts marked up to this seq are dirty
+        self._snapshot_structure_seq = 0
+        # Refreshed parts not published yet
+        self._snapshot_changed = False
+        self._snapshot_sweep = deque()
+        self._snapshot_swept_at = 0.0
+
+        # Change subscriptions: client outbox -> subscribed event kinds
+        self._subscribers = {}
+        self._subscribers_lock = threading.Lock()
+        self._song_listeners = []
+        self._list_listeners = []
+        # Per track; clip listeners per (track, slot), and send and parameter
+        # listeners per track, so they can be re-registered on their own
+        self._track_listeners = {}
+        self._clip_listeners = {}
+        self._send_listeners = {}
+        self._parameter_listeners = {}
+        # SUBSCRIBED_LISTENER_KINDS whose listeners are registered
+        self._listened_kinds = set()
+        # Parameter values last returned per device, to notice unreported changes
+        self._parameter_values = {}
+        self._pending_changes = {}
+        self._rebind = set()
+        self._event_seq = 0
+        self._versions = {}
+        self._version_counter = 0
+
+        # Browser URI -> item, crawled a little at a time on the main thread.
+        # Lookups use the last complete index and the one being built.
+        self._browser_index = {}
+        self._browser_index_next = None
+        self._browser_index_pending = None
+        self._browser_index_built_at = 0.0
+        self._browser_index_stats = {"hits": 0, "misses": 0, "builds": 0, "stale": 0,
+                                     "path_hits": 0, "path_misses": 0}
+        # Lowercase browser path -> item, including every prefix that was walked
+        self._browser_path_cache = OrderedDict()
+        # crawl_browser state by crawl id, oldest first
+        self._browser_crawls = OrderedDict()
+        self._browser_crawl_counter = 0
+        self._queue_stats = {
+            "enqueued": 0,
+            "executed": 0,
+            "max_depth": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "busy_ticks": 0,
+            "budget_exhausted_ticks": 0,
+            "last_tick_ms": 0.0,
+            "tasks_started": 0,
+            "task_steps": 0,
+            "rejected": 0,
+            "expired": 0,
+            "cancelled": 0
+        }
         
         # Start the socket server
         self.start_server()
@@ -51,35 +567,45 @@ class AbletonMCP(ControlSurface):
         """Called when Ableton closes or the control surface is removed"""
         self.log_message("AbletonMCP disconnecting...")
         self.running = False
+        self._remove_listeners()
         
-        # Stop the server
-        if self.server:
-            try:
-                self.server.close()
-            except:
-                pass
-        
-        # Wait for the server thread to exit
+        # Stop the I/O thread; it closes the client connections on its way out
+        if self._wake_sender is not None:
+            self._wake_pending = False
+            self._wake()
         if self.server_thread and self.server_thread.is_alive():
             self.server_thread.join(1.0)
-            
-        # Clean up any client threads
-        for client_thread in self.client_threads[:]:
-            if client_thread.is_alive():
-                # We don't join them as they might be stuck
-                self.log_message("Client thread still alive during disconnect")
+            if self.server_thread.is_alive():
+                self.log_message("Server thread still alive during disconnect")
+        for sock in (self.server, self._wake_receiver, self._wake_sender):
+            if sock is not None:
+                try:
+                    sock.close()
+                except Exception:
+                    pass
+        if self._selector is not None:
+            self._selector.close()
         
         ControlSurface.disconnect(self)
         self.log_message("AbletonMCP disconnected")
     
     def start_server(self):
-        """Start the socket server in a separate thread"""
+        """Start the socket server and its I/O thread"""
         try:
             self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.server.bind((HOST, DEFAULT_PORT))
             self.server.listen(5)  # Allow up to 5 pending connections
-            
+            self.server.setblocking(False)
+
+            # Other threads queue replies and write a byte here to wake the selector
+            self._wake_receiver, self._wake_sender = socket.socketpair()
+            self._wake_receiver.setblocking(False)
+            self._wake_sender.setblocking(False)
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self.server, selectors.EVENT_READ)
+            self._selector.register(self._wake_receiver, selectors.EVENT_READ)
+
             self.running = True
             self.server_thread = threading.Thread(target=self._server_thread)
             self.server_thread.daemon = True
@@ -89,450 +615,1222 @@ class AbletonMCP(ControlSurface):
         except Exception as e:
             self.log_message("Error starting server: " + str(e))
             self.show_message("AbletonMCP: Error starting server - " + str(e))
-    
+
+    def _wake(self):
+        """Make the I/O thread look at client outboxes; callable from any thread"""
+        if self._wake_pending:
+            return
+        self._wake_pending = True
+        try:
+            self._wake_sender.send(b"\0")
+        except (IOError, OSError):
+            # The socket buffer is full, so the I/O thread is awake anyway
+            pass
+
     def _server_thread(self):
-        """Server thread implementation - handles client connections"""
+        """I/O thread: one selector loop that accepts, reads, decodes and writes
+        for every client, so the thread count does not grow with connections.
+
+        Complete requests go to _dispatch_command; I/O-thread commands are
+        answered inline and main-thread ones are queued for update_display.
+        """
         try:
             self.log_message("Server thread started")
-            # Set a timeout to allow regular checking of running flag
-            self.server.settimeout(1.0)
-            
             while self.running:
-                try:
-                    # Accept connections with timeout
-                    client, address = self.server.accept()
-                    self.log_message("Connection accepted from " + str(address))
-                    self.show_message("AbletonMCP: Client connected")
-                    
-                    # Handle client in a separate thread
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client,)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-                    
-                    # Keep track of client threads
-                    self.client_threads.append(client_thread)
-                    
-                    # Clean up finished client threads
-                    self.client_threads = [t for t in self.client_threads if t.is_alive()]
-                    
-                except socket.timeout:
-                    # No connection yet, just continue
-                    continue
-                except Exception as e:
-                    if self.running:  # Only log if still running
-                        self.log_message("Server accept error: " + str(e))
-                    time.sleep(0.5)
-            
+                for key, events in self._selector.select(self._select_timeout()):
+                    if key.fileobj is self.server:
+                        self._accept_client()
+                    elif key.fileobj is self._wake_receiver:
+                        self._drain_wake_socket()
+                    else:
+                        client = key.data
+                        if events & selectors.EVENT_READ:
+                            self._read_client(client)
+                        if events & selectors.EVENT_WRITE and not client.closed:
+                            self._write_client(client)
+                self._flush_outboxes()
+                self._expire_legacy_waits()
             self.log_message("Server thread stopped")
         except Exception as e:
-            self.log_message("Server thread error: " + str(e))
-    
-    def _handle_client(self, client):
-        """Handle communication with a connected client"""
-        self.log_message("Client handler started")
-        client.settimeout(None)  # No timeout for client socket
-        buffer = ''  # Changed from b'' to '' for Python 2
-        
-        try:
-            while self.running:
-                try:
-                    # Receive data
-                    data = client.recv(8192)
-                    
-                    if not data:
-                        # Client disconnected
-                        self.log_message("Client disconnected")
-                        break
-                    
-                    # Accumulate data in buffer with explicit encoding/decoding
-                    try:
-                        # Python 3: data is bytes, decode to string
-                        buffer += data.decode('utf-8')
-                    except AttributeError:
-                        # Python 2: data is already string
-                        buffer += data
-                    
-                    try:
-                        # Try to parse command from buffer
-                        command = json.loads(buffer)  # Removed decode('utf-8')
-                        buffer = ''  # Clear buffer after successful parse
-                        
-                        self.log_message("Received command: " + str(command.get("type", "unknown")))
-                        
-                        # Process the command and get response
-                        response = self._process_command(command)
-                        
-                        # Send the response with explicit encoding
-                        try:
-                            # Python 3: encode string to bytes
-                            client.sendall(json.dumps(response).encode('utf-8'))
-                        except AttributeError:
-                            # Python 2: string is already bytes
-                            client.sendall(json.dumps(response))
-                    except ValueError:
-                        # Incomplete data, wait for more
-                        continue
-                        
-                except Exception as e:
-                    self.log_message("Error handling client data: " + str(e))
-                    self.log_message(traceback.format_exc())
-                    
-                    # Send error response if possible
-                    error_response = {
-                        "status": "error",
-                        "message": str(e)
-                    }
-                    try:
-                        # Python 3: encode string to bytes
-                        client.sendall(json.dumps(error_response).encode('utf-8'))
-                    except AttributeError:
-                        # Python 2: string is already bytes
-                        client.sendall(json.dumps(error_response))
-                    except:
-                        # If we can't send the error, the connection is probably dead
-                        break
-                    
-                    # For serious errors, break the loop
-                    if not isinstance(e, ValueError):
-                        break
-        except Exception as e:
-            self.log_message("Error in client handler: " + str(e))
+            if self.running:
+                self.log_message("Server thread error: " + str(e))
+                self.log_message(traceback.format_exc())
         finally:
+            for client in list(self._clients):
+                self._close_client(client)
+
+    def _select_timeout(self):
+        """Seconds until the next legacy command times out, at most one"""
+        timeout = 1.0
+        now = time.time()
+        for client in self._clients:
+            if client.waiting is not None:
+                timeout = min(timeout, max(0.0, client.waiting["expires"] - now))
+        return timeout
+
+    def _accept_client(self):
+        try:
+            sock, address = self.server.accept()
+        except (IOError, OSError):
+            # Another wakeup took the connection, or the server is closing
+            return
+        sock.setblocking(False)
+        client = ClientConnection(sock, address, self._wake)
+        self._clients.add(client)
+        self._selector.register(sock, selectors.EVENT_READ, client)
+        self.log_message("Connection accepted from " + str(address))
+        self.show_message("AbletonMCP: Client connected")
+
+    def _drain_wake_socket(self):
+        try:
+            while self._wake_receiver.recv(4096):
+                pass
+        except (IOError, OSError):
+            pass
+        # Only after draining: a wake written meanwhile must not be swallowed
+        # with the flag still set, or later wakes would never write a byte.
+        # Outboxes are flushed after this, so wakes skipped until here are seen.
+        self._wake_pending = False
+
+    def _close_client(self, client):
+        if client.closed:
+            return
+        client.closed = True
+        self._clients.discard(client)
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            client.sock.close()
+        except Exception:
+            pass
+        if client.waiting is not None and client.waiting["state"] is not None:
+            # Nobody is left to tell the outcome to
+            client.waiting["state"]["cancelled"] = True
+        self._drop_subscriber(client)
+        self.log_message("Client disconnected")
+
+    def _read_client(self, client):
+        try:
+            data = client.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except (IOError, OSError) as e:
+            self.log_message("Error reading from client: " + str(e))
+            data = b""
+        if not data:
+            self._close_client(client)
+            return
+        client.inbuf += data
+        try:
+            self._process_input(client)
+        except Exception as e:
+            self.log_message("Error handling client data: " + str(e))
+            self.log_message(traceback.format_exc())
+            self._close_client(client)
+
+    def _process_input(self, client):
+        """Dispatch every complete request in the client's input buffer"""
+        while not client.closed:
+            if client.version:
+                command = self._take_frame(client)
+            elif client.waiting is None:
+                # Legacy clients send one bare JSON command and wait for its reply
+                command = self._take_legacy_command(client)
+            else:
+                return
+            if command is None:
+                return
+            self.log_message("Received command: " + str(command.get("type", "unknown")))
+            if client.version:
+                # Event frames need request ids to be told apart from replies
+                self._dispatch_command(command, client.put, client if client.version >= 2 else None,
+                                       client.put if client.version >= 2 else None, client)
+            else:
+                self._dispatch_legacy(client, command)
+
+    def _take_frame(self, client):
+        """Decode one frame from the input buffer, or None if it is incomplete"""
+        buffer = client.inbuf
+        while len(buffer) >= FRAME_HEADER.size:
+            magic, version, length = FRAME_HEADER.unpack_from(buffer)
+            if magic != FRAME_MAGIC:
+                raise IOError("Bad frame magic from client")
+            if length > MAX_FRAME_SIZE:
+                raise IOError("Frame too large: " + str(length))
+            end = FRAME_HEADER.size + length
+            if len(buffer) < end:
+                return None
+            body = bytes(buffer[FRAME_HEADER.size:end])
+            del buffer[:end]
             try:
-                client.close()
-            except:
+                return json.loads(body.decode('utf-8'))
+            except ValueError as e:
+                # The frame was intact but its body was not valid JSON, so there
+                # is no id to answer: pipelining clients fail every request
+                # they are waiting for, as one of them will never be answered
+                client.put({"status": "error", "message": "Invalid JSON: " + str(e), "connection_error": True})
+        return None
+
+    def _take_legacy_command(self, client):
+        """Parse the input buffer as one JSON command, or None if it is incomplete"""
+        if not client.inbuf:
+            return None
+        try:
+            command = json.loads(client.inbuf.decode('utf-8'))
+        except ValueError:
+            # Incomplete data, wait for more
+            return None
+        del client.inbuf[:]
+        return command
+
+    def _dispatch_legacy(self, client, command):
+        """Dispatch a bare JSON command and time it out like a blocking call would.
+
+        The reply, progress and the timeout are all handled on the I/O thread:
+        replies are tagged with the wait they answer, so one arriving after its
+        command timed out is dropped instead of reaching the client.
+        """
+        spec = COMMANDS.get(command.get("type", ""))
+        timeout = spec.timeout if spec else 10.0
+        waiting = {"state": None, "timeout": timeout, "expires": time.time() + timeout,
+                   "hello": command.get("type") == "hello"}
+        client.waiting = waiting
+        waiting["state"] = self._dispatch_command(
+            command, lambda response: client.put(response, waiting),
+            progress=lambda frame: client.put(None, waiting), client=client)
+
+    def _expire_legacy_waits(self):
+        now = time.time()
+        for client in list(self._clients):
+            waiting = client.waiting
+            if waiting is None or waiting["expires"] > now:
+                continue
+            if waiting["state"] is not None:
+                # The client is told it failed, so it must not happen later
+                waiting["state"]["cancelled"] = True
+            client.waiting = None
+            self._send_legacy(client, {
+                "status": "error",
+                "message": "Timeout waiting for operation to complete"
+            })
+
+    def _send_legacy(self, client, response, version=0):
+        client.outbuf += json.dumps(response).encode('utf-8')
+        client.version = version
+        self._write_client(client)
+        if not client.closed:
+            # The client may already have sent its next command
+            try:
+                self._process_input(client)
+            except Exception as e:
+                self.log_message("Error handling client data: " + str(e))
+                self._close_client(client)
+
+    def _flush_outboxes(self):
+        """Encode queued replies and events and start writing them"""
+        for client in list(self._clients):
+            if not client.outbox:
+                continue
+            while client.outbox and client.stream is None and not client.closed:
+                waiting, message = client.outbox.popleft()
+                if waiting is None and client.version >= STREAMED_FRAME_VERSION \
+                        and _longer_than(message, STREAM_THRESHOLD):
+                    client.stream = _stream_frame(message, client.version)
+                elif waiting is None:
+                    body = json.dumps(message).encode('utf-8')
+                    client.outbuf += FRAME_HEADER.pack(FRAME_MAGIC, client.version, len(body))
+                    client.outbuf += body
+                elif waiting is not client.waiting:
+                    # The command already timed out
+                    continue
+                elif message is None:
+                    # Progress restarts the timeout
+                    waiting["expires"] = time.time() + waiting["timeout"]
+                else:
+                    client.waiting = None
+                    # A successful hello switches the connection to framed messages
+                    # once its own reply is out
+                    version = 0
+                    if waiting["hello"] and message.get("status") == "success":
+                        version = message["result"].get("protocol_version", 0)
+                    self._send_legacy(client, message, version)
+            if not client.closed:
+                self._write_client(client)
+
+    def _write_client(self, client):
+        """Send as much buffered output as the socket takes and watch for
+        writability only while some is left.
+
+        A streamed frame is encoded one chunk per call, so other clients are
+        served between its chunks.
+        """
+        if client.stream is not None and len(client.outbuf) < STREAM_CHUNK_SIZE:
+            try:
+                client.outbuf += next(client.stream)
+            except StopIteration:
+                client.stream = None
+            except Exception as e:
+                # Part of the frame is already out; the connection cannot recover
+                self.log_message("Error encoding response: " + str(e))
+                self._close_client(client)
+                return
+        if client.outbuf:
+            try:
+                sent = client.sock.send(client.outbuf)
+                del client.outbuf[:sent]
+            except (BlockingIOError, InterruptedError):
                 pass
-            self.log_message("Client handler stopped")
-    
-    def _process_command(self, command):
-        """Process a command from the client and return a response"""
+            except (IOError, OSError) as e:
+                self.log_message("Error sending response: " + str(e))
+                self._close_client(client)
+                return
+        # Frames queued behind a finished stream are picked up on the next pass
+        pending = client.outbuf or client.stream is not None or client.outbox
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if pending else 0)
+        if self._selector.get_key(client.sock).events != events:
+            self._selector.modify(client.sock, events, client)
+
+    def _dispatch_command(self, command, reply, channel=None, progress=None, client=None):
+        """Route a command and pass its response to reply() once it is available.
+
+        Commands registered for MAIN_THREAD are queued for Live's main thread
+        (see _drain_main_thread_queue) and reply from there with "applied": true
+        once the change has been made, so the caller never blocks on them.
+        Replies to mutating commands are held until the session snapshot has
+        been refreshed, so a read sent after them sees the change. Responses
+        echo the request "id" when one was sent, which lets clients pipeline
+        requests. channel is the client's outbox when it can receive pushed
+        event frames.
+
+        Handlers that return a generator run as long-running tasks (see
+        _step_tasks). Their progress goes to progress(), when given, as frames
+        of the form {"id": ..., "progress": {...}} without a "status".
+
+        Main-thread commands are refused with a "busy" error when too many
+        are pending overall or from this client (see _admit). A command whose
+        "deadline" (seconds since the epoch) has passed by the time the main
+        thread gets to it is dropped and answered as cancelled, as is one
+        cancelled with the cancel command. Returns the state used to cancel a
+        main-thread command, or None.
+        """
         command_type = command.get("type", "")
         params = command.get("params", {})
-        
-        # Initialize response
-        response = {
-            "status": "success",
-            "result": {}
-        }
-        
-        try:
-            # Route the command to the appropriate handler
-            if command_type == "get_session_info":
-                response["result"] = self._get_session_info()
-            elif command_type == "get_application_info":
-                response["result"] = self._get_application_info()
-            elif command_type == "get_application_view_state":
-                response["result"] = self._get_application_view_state()
-            elif command_type == "get_application_process_usage":
-                response["result"] = self._get_application_process_usage()
-            elif command_type == "get_application_version":
-                response["result"] = self._get_application_version()
-            elif command_type == "get_application_document":
-                response["result"] = self._get_application_document()
-            elif command_type == "list_control_surfaces":
-                response["result"] = self._list_control_surfaces()
-            elif command_type == "list_scenes":
-                response["result"] = self._list_scenes()
-            elif command_type == "get_track_info":
-                track_index = params.get("track_index", 0)
-                response["result"] = self._get_track_info(track_index)
-            elif command_type == "get_device_details":
-                track_index = params.get("track_index", 0)
-                device_index = params.get("device_index", 0)
-                response["result"] = self._get_device_details(track_index, device_index)
-            elif command_type == "find_device_by_name":
-                track_index = params.get("track_index", 0)
-                device_name = params.get("device_name", "")
-                response["result"] = self._find_device_by_name(track_index, device_name)
-            elif command_type == "get_clip_info":
-                track_index = params.get("track_index", 0)
-                clip_index = params.get("clip_index", 0)
-                response["result"] = self._get_clip_info(track_index, clip_index)
-            elif command_type == "list_locators":
-                response["result"] = self._list_locators()
-            elif command_type == "list_return_tracks":
-                response["result"] = self._list_return_tracks()
-            # Commands that modify Live's state should be scheduled on the main thread
-            elif command_type in ["create_midi_track", "create_audio_track", "set_track_name",
-                                 "create_clip", "add_notes_to_clip", "set_clip_name",
-                                 "set_tempo", "fire_clip", "stop_clip", "fire_scene", "create_scene", "rename_scene", "write_automation", "show_message", "create_locator", "set_song_position", "set_send_level",
-                                 "start_playback", "stop_playback", "load_browser_item",
-                                 "get_device_parameters", "set_device_parameter", "delete_device",
-                                 # Arrangement/transport additions
-                                 "set_record_mode", "continue_playing", "jump_by", "set_back_to_arranger",
-                                 "set_start_time", "set_metronome", "set_clip_trigger_quantization",
-                                 "set_loop", "set_loop_region", "play_selection", "jump_to_next_cue",
-                                 "jump_to_prev_cue", "toggle_cue_at_current", "re_enable_automation",
-                                 "set_arrangement_overdub", "set_session_automation_record",
-                                 "trigger_session_record",
-                                 # New arrangement layout helpers
-                                 "duplicate_track_clip_to_arrangement", "clear_arrangement",
-                                 "rename_cue_point", "set_current_song_time_beats", "stop_all_clips",
-                                 "jump_to_cue", "jump_by_beats",
-                                 # Application mutation
-                                 "press_current_dialog_button",
-                                 # Application.View functions
-                                 "application_view_focus_view", "application_view_hide_view",
-                                 "application_view_is_view_visible", "application_view_scroll_view",
-                                 "application_view_show_view", "application_view_toggle_browse",
-                                 "application_view_zoom_view", "application_view_available_main_views"]:
-                # Use a thread-safe approach with a response queue
-                response_queue = queue.Queue()
-                
-                # Define a function to execute on the main thread
-                def main_thread_task():
-                    try:
-                        result = None
-                        if command_type == "create_midi_track":
-                            index = params.get("index", -1)
-                            result = self._create_midi_track(index)
-                        elif command_type == "create_audio_track":
-                            index = params.get("index", -1)
-                            result = self._create_audio_track(index)
-                        elif command_type == "set_track_name":
-                            track_index = params.get("track_index", 0)
-                            name = params.get("name", "")
-                            result = self._set_track_name(track_index, name)
-                        elif command_type == "create_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            length = params.get("length", 4.0)
-                            result = self._create_clip(track_index, clip_index, length)
-                        elif command_type == "add_notes_to_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            notes = params.get("notes", [])
-                            result = self._add_notes_to_clip(track_index, clip_index, notes)
-                        elif command_type == "set_clip_name":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            name = params.get("name", "")
-                            result = self._set_clip_name(track_index, clip_index, name)
-                        elif command_type == "set_tempo":
-                            tempo = params.get("tempo", 120.0)
-                            result = self._set_tempo(tempo)
-                        elif command_type == "fire_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            result = self._fire_clip(track_index, clip_index)
-                        elif command_type == "stop_clip":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            result = self._stop_clip(track_index, clip_index)
-                        elif command_type == "fire_scene":
-                            scene_index = params.get("scene_index", 0)
-                            result = self._fire_scene(scene_index)
-                        elif command_type == "create_scene":
-                            scene_index = params.get("scene_index", -1)
-                            result = self._create_scene(scene_index)
-                        elif command_type == "rename_scene":
-                            scene_index = params.get("scene_index", 0)
-                            name = params.get("name", "")
-                            result = self._rename_scene(scene_index, name)
-                        elif command_type == "create_locator":
-                            time = params.get("time", 0.0)
-                            result = self._create_locator(time)
-                        elif command_type == "set_song_position":
-                            time = params.get("time", 0.0)
-                            result = self._set_song_position(time)
-                        elif command_type == "set_current_song_time_beats":
-                            beats = params.get("beats", 0.0)
-                            result = self._set_current_song_time_beats(beats)
-                        elif command_type == "set_send_level":
-                            track_index = params.get("track_index", 0)
-                            send_index = params.get("send_index", 0)
-                            level = params.get("level", 0.0)
-                            result = self._set_send_level(track_index, send_index, level)
-                        elif command_type == "write_automation":
-                            params_to_pass = params.copy()
-                            result = self._write_automation(**params_to_pass)
-                        elif command_type == "show_message":
-                            message = params.get("message", "")
-                            result = self._show_message(message)
-                        elif command_type == "start_playback":
-                            result = self._start_playback()
-                        elif command_type == "stop_playback":
-                            result = self._stop_playback()
-                        elif command_type == "load_browser_item":
-                            track_index = params.get("track_index", 0)
-                            item_uri = params.get("item_uri", "")
-                            result = self._load_browser_item(track_index, item_uri)
-                        elif command_type == "set_record_mode":
-                            on = params.get("on", False)
-                            result = self._set_record_mode(on)
-                        elif command_type == "continue_playing":
-                            result = self._continue_playing()
-                        elif command_type == "jump_by":
-                            beats = params.get("beats", 0.0)
-                            result = self._jump_by(beats)
-                        elif command_type == "jump_by_beats":
-                            beats = params.get("beats", 0.0)
-                            result = self._jump_by(beats)
-                        elif command_type == "set_back_to_arranger":
-                            on = params.get("on", False)
-                            result = self._set_back_to_arranger(on)
-                        elif command_type == "set_start_time":
-                            beats = params.get("beats", 0.0)
-                            result = self._set_start_time(beats)
-                        elif command_type == "set_metronome":
-                            on = params.get("on", False)
-                            result = self._set_metronome(on)
-                        elif command_type == "set_clip_trigger_quantization":
-                            quant = params.get("quant", 4)
-                            result = self._set_clip_trigger_quantization(quant)
-                        elif command_type == "set_loop":
-                            on = params.get("on", False)
-                            result = self._set_loop(on)
-                        elif command_type == "set_loop_region":
-                            start = params.get("start", 0.0)
-                            length = params.get("length", 0.0)
-                            result = self._set_loop_region(start, length)
-                        elif command_type == "play_selection":
-                            result = self._play_selection()
-                        elif command_type == "jump_to_next_cue":
-                            result = self._jump_to_next_cue()
-                        elif command_type == "jump_to_prev_cue":
-                            result = self._jump_to_prev_cue()
-                        elif command_type == "jump_to_cue":
-                            index = params.get("index", 0)
-                            result = self._jump_to_cue(index)
-                        elif command_type == "toggle_cue_at_current":
-                            result = self._toggle_cue_at_current()
-                        elif command_type == "re_enable_automation":
-                            result = self._re_enable_automation()
-                        elif command_type == "set_arrangement_overdub":
-                            on = params.get("on", False)
-                            result = self._set_arrangement_overdub(on)
-                        elif command_type == "set_session_automation_record":
-                            on = params.get("on", False)
-                            result = self._set_session_automation_record(on)
-                        elif command_type == "trigger_session_record":
-                            record_length = params.get("record_length")
-                            result = self._trigger_session_record(record_length)
-                        elif command_type == "duplicate_track_clip_to_arrangement":
-                            track_index = params.get("track_index", 0)
-                            clip_index = params.get("clip_index", 0)
-                            start_beats = params.get("start_beats", 0.0)
-                            length_beats = params.get("length_beats", 0.0)
-                            loop = params.get("loop")
-                            result = self._duplicate_track_clip_to_arrangement(track_index, clip_index, start_beats, length_beats, loop)
-                        elif command_type == "clear_arrangement":
-                            track_indices = params.get("track_indices")
-                            result = self._clear_arrangement(track_indices)
-                        elif command_type == "rename_cue_point":
-                            cue_index = params.get("cue_index", 0)
-                            name = params.get("name", "")
-                            result = self._rename_cue_point(cue_index, name)
-                        elif command_type == "stop_all_clips":
-                            quantized = params.get("quantized", 1)
-                            result = self._stop_all_clips(quantized)
-                        elif command_type == "get_device_parameters":
-                            track_index = params.get("track_index", 0)
-                            device_index = params.get("device_index", 0)
-                            result = self._get_device_parameters(track_index, device_index)
-                        elif command_type == "set_device_parameter":
-                            track_index = params.get("track_index", 0)
-                            device_index = params.get("device_index", 0)
-                            value = params.get("value", 0)
-                            parameter_index = params.get("parameter_index")
-                            parameter_name = params.get("parameter_name")
-                            result = self._set_device_parameter(track_index, device_index, value, parameter_index, parameter_name)
-                        elif command_type == "delete_device":
-                            track_index = params.get("track_index", 0)
-                            device_index = params.get("device_index", 0)
-                            result = self._delete_device(track_index, device_index)
-                        elif command_type == "press_current_dialog_button":
-                            index = params.get("index", 0)
-                            result = self._press_current_dialog_button(index)
-                        # Application.View operations
-                        elif command_type == "application_view_available_main_views":
-                            result = self._application_view_available_main_views()
-                        elif command_type == "application_view_focus_view":
-                            view_name = params.get("view_name", "")
-                            result = self._application_view_focus_view(view_name)
-                        elif command_type == "application_view_hide_view":
-                            view_name = params.get("view_name", "")
-                            result = self._application_view_hide_view(view_name)
-                        elif command_type == "application_view_is_view_visible":
-                            view_name = params.get("view_name", "")
-                            result = self._application_view_is_view_visible(view_name)
-                        elif command_type == "application_view_scroll_view":
-                            direction = int(params.get("direction", 0))
-                            view_name = params.get("view_name", "")
-                            modifier_pressed = bool(params.get("modifier_pressed", False))
-                            result = self._application_view_scroll_view(direction, view_name, modifier_pressed)
-                        elif command_type == "application_view_show_view":
-                            view_name = params.get("view_name", "")
-                            result = self._application_view_show_view(view_name)
-                        elif command_type == "application_view_toggle_browse":
-                            result = self._application_view_toggle_browse()
-                        elif command_type == "application_view_zoom_view":
-                            direction = int(params.get("direction", 0))
-                            view_name = params.get("view_name", "")
-                            modifier_pressed = bool(params.get("modifier_pressed", False))
-                            result = self._application_view_zoom_view(direction, view_name, modifier_pressed)
-                        
-                        # Put the result in the queue
-                        response_queue.put({"status": "success", "result": result})
-                    except Exception as e:
-                        self.log_message("Error in main thread task: " + str(e))
-                        self.log_message(traceback.format_exc())
-                        response_queue.put({"status": "error", "message": str(e)})
-                
-                # Schedule the task to run on the main thread
-                try:
-                    self.schedule_message(0, main_thread_task)
-                except AssertionError:
-                    # If we're already on the main thread, execute directly
-                    main_thread_task()
-                
-                # Wait for the response with a timeout
+        request_id = command.get("id")
+
+        def send(response):
+            if request_id is not None:
+                response["id"] = request_id
+            reply(response)
+
+        spec = COMMANDS.get(command_type)
+        if spec is None:
+            self.log_message("Unknown command: " + str(command_type))
+            send({"status": "error", "message": "Unknown command: " + str(command_type)})
+            return None
+
+        if spec.thread == MAIN_THREAD:
+            busy = self._admit(client)
+            if busy is not None:
+                send(busy)
+                return None
+
+            deadline = command.get("deadline")
+            state = {"cancelled": False, "started": False, "task": False}
+            key = (channel, request_id) if channel is not None and request_id is not None else None
+            if key is not None:
+                self._inflight[key] = state
+
+            def finish(response):
+                self._release(client)
+                if key is not None:
+                    self._inflight.pop(key, None)
+                if spec.mutating:
+                    # Sent only after Live has run the command and the snapshot
+                    # reflects it, so clients can rely on this reply
+                    self._deferred_replies.append((self._snapshot_seq, send, response))
+                else:
+                    send(response)
+
+            def report(info):
+                if progress is not None:
+                    frame = {"progress": info}
+                    if request_id is not None:
+                        frame["id"] = request_id
+                    progress(frame)
+
+            # Define a function to execute on the main thread
+            def main_thread_task():
+                expired = deadline is not None and time.time() > float(deadline)
+                if expired or state["cancelled"]:
+                    # The caller has given up; running it now could repeat a retried change
+                    with self._queue_stats_lock:
+                        self._queue_stats["expired" if expired else "cancelled"] += 1
+                    finish({
+                        "status": "error",
+                        "message": "Deadline passed before it ran" if expired else "Cancelled before it ran",
+                        "cancelled": True
+                    })
+                    return
+                state["started"] = True
                 try:
-                    task_response = response_queue.get(timeout=10.0)
-                    if task_response.get("status") == "error":
-                        response["status"] = "error"
-                        response["message"] = task_response.get("message", "Unknown error")
-                    else:
-                        response["result"] = task_response.get("result", {})
-                except queue.Empty:
-                    response["status"] = "error"
-                    response["message"] = "Timeout waiting for operation to complete"
-            elif command_type == "get_browser_item":
-                uri = params.get("uri", None)
-                path = params.get("path", None)
-                response["result"] = self._get_browser_item(uri, path)
-            elif command_type == "get_browser_categories":
-                category_type = params.get("category_type", "all")
-                response["result"] = self._get_browser_categories(category_type)
-            elif command_type == "get_browser_items":
-                path = params.get("path", "")
-                item_type = params.get("item_type", "all")
-                response["result"] = self._get_browser_items(path, item_type)
-            # Add the new browser commands
-            elif command_type == "get_browser_tree":
-                category_type = params.get("category_type", "all")
-                max_depth = params.get("max_depth", 2)
-                response["result"] = self.get_browser_tree(category_type, max_depth)
-            elif command_type == "get_browser_items_at_path":
-                path = params.get("path", "")
-                response["result"] = self.get_browser_items_at_path(path)
-            elif command_type == "get_current_song_time_beats":
-                response["result"] = self._get_current_song_time_beats()
-            else:
-                response["status"] = "error"
-                response["message"] = "Unknown command: " + command_type
+                    result = self._execute_command(spec, params, True, channel)
+                    if isinstance(result, types.GeneratorType):
+                        self._start_task(command_type, result, finish, report, state)
+                        return
+                    response = {"status": "success", "result": result, "applied": True}
+                except Exception as e:
+                    self.log_message("Error in main thread task: " + str(e))
+                    self.log_message(traceback.format_exc())
+                    response = {"status": "error", "message": str(e)}
+                finish(response)
+
+            self._enqueue_main_thread(main_thread_task)
+            return state
+
+        try:
+            result = self._execute_command(spec, params, False, channel)
+            send({"status": "success", "result": result})
         except Exception as e:
             self.log_message("Error processing command: " + str(e))
             self.log_message(traceback.format_exc())
-            response["status"] = "error"
-            response["message"] = str(e)
-        
-        return response
-    
+            send({"status": "error", "message": str(e)})
+        return None
+
+    def _enqueue_main_thread(self, task):
+        """Queue a callable to run on Live's main thread during the next update_display ticks"""
+        self._main_thread_queue.put((time.time(), task))
+        depth = self._main_thread_queue.qsize()
+        with self._queue_stats_lock:
+            self._queue_stats["enqueued"] += 1
+            if depth > self._queue_stats["max_depth"]:
+                self._queue_stats["max_depth"] = depth
+
+    def update_display(self):
+        """Live's periodic main-thread tick: also drains the main-thread work queue"""
+        ControlSurface.update_display(self)
+        self._drain_main_thread_queue()
+
+    def _drain_main_thread_queue(self):
+        """Run queued tasks until the tick's time budget is used up.
+
+        At least one task runs per tick so the queue always makes progress;
+        whatever is left waits for the next tick instead of stalling Live's UI.
+        """
+        tick_start = time.time()
+        budget = self._main_thread_budget_ms / 1000.0
+        executed = 0
+        wait_ms = 0.0
+        max_wait_ms = 0.0
+        while True:
+            if executed and time.time() - tick_start >= budget:
+                break
+            try:
+                enqueued_at, task = self._main_thread_queue.get_nowait()
+            except queue.Empty:
+                break
+            waited = (time.time() - enqueued_at) * 1000.0
+            self._wait_average_ms += 0.2 * (waited - self._wait_average_ms)
+            wait_ms += waited
+            max_wait_ms = max(max_wait_ms, waited)
+            try:
+                task()
+            except Exception as e:
+                self.log_message("Error in main thread task: " + str(e))
+            executed += 1
+
+        # Long-running tasks get the rest of the tick, and at least one step
+        self._step_tasks(tick_start + budget)
+
+        changes = self._collect_events(tick_start + budget)
+        if changes:
+            # Events wait for the snapshot too, so a read sent after one never sees older state
+            self._deferred_replies.append((self._snapshot_seq, self._push_events, changes))
+
+        # Mutations and change events mark parts of the snapshot stale; they
+        # are re-read within the same budget
+        self._refresh_snapshot(tick_start + budget)
+        self._flush_deferred()
+
+        # Spend whatever is left of an idle tick on the browser index
+        if self._main_thread_queue.empty() and time.time() - tick_start < budget:
+            self._index_browser_step(tick_start + budget)
+
+        if executed:
+            with self._queue_stats_lock:
+                stats = self._queue_stats
+                stats["executed"] += executed
+                stats["total_wait_ms"] += wait_ms
+                stats["max_wait_ms"] = max(stats["max_wait_ms"], max_wait_ms)
+                stats["busy_ticks"] += 1
+                stats["last_tick_ms"] = (time.time() - tick_start) * 1000.0
+                if not self._main_thread_queue.empty():
+                    stats["budget_exhausted_ticks"] += 1
+
+    def _admit(self, client):
+        """Count a main-thread command against the limits; a "busy" response if it is over one, else None"""
+        with self._admission_lock:
+            pending = self._admitted.get(client, 0)
+            if self._admitted_total < MAX_PENDING_COMMANDS and pending < MAX_PENDING_PER_CLIENT:
+                self._admitted[client] = pending + 1
+                self._admitted_total += 1
+                return None
+            total = self._admitted_total
+        with self._queue_stats_lock:
+            self._queue_stats["rejected"] += 1
+        retry_after_ms = min(BUSY_RETRY_MAX_MS, max(BUSY_RETRY_MIN_MS, self._wait_average_ms))
+        if pending >= MAX_PENDING_PER_CLIENT:
+            reason = "{0} commands from this connection are pending".format(pending)
+        else:
+            reason = "{0} commands are pending".format(total)
+        return {
+            "status": "error",
+            "message": "Busy: {0}; retry after {1} ms".format(reason, int(retry_after_ms)),
+            "retry_after_ms": retry_after_ms
+        }
+
+    def _release(self, client):
+        """An admitted command has been answered"""
+        with self._admission_lock:
+            pending = self._admitted.get(client, 0) - 1
+            if pending > 0:
+                self._admitted[client] = pending
+            else:
+                self._admitted.pop(client, None)
+            self._admitted_total -= 1
+
+    def _start_task(self, command_type, generator, finish, report, state):
+        """Run a generator handler a step at a time on later ticks.
+
+        Each value the generator yields ends a step and is its progress so
+        far (a dict, or None); the value it returns is the command result.
+        A cancelled task is closed before its next step.
+        """
+        state["task"] = True
+        self._tasks.append({
+            "type": command_type,
+            "generator": generator,
+            "finish": finish,
+            "report": report,
+            "state": state,
+            "started_at": time.time(),
+            "reported_at": time.time(),
+            "steps": 0
+        })
+        with self._queue_stats_lock:
+            self._queue_stats["tasks_started"] += 1
+
+    def _step_tasks(self, deadline):
+        """Resume running tasks round-robin until deadline, each at least once"""
+        steps = 0
+        first_round = True
+        while self._tasks and (first_round or time.time() < deadline):
+            for task in list(self._tasks):
+                if not first_round and time.time() >= deadline:
+                    break
+                if task["state"]["cancelled"]:
+                    self._tasks.remove(task)
+                    task["generator"].close()
+                    with self._queue_stats_lock:
+                        self._queue_stats["cancelled"] += 1
+                    task["finish"]({
+                        "status": "error",
+                        "message": "Cancelled after {0} steps; changes made so far are kept".format(task["steps"]),
+                        "cancelled": True
+                    })
+                    continue
+                steps += 1
+                task["steps"] += 1
+                try:
+                    info = next(task["generator"])
+                except StopIteration as e:
+                    self._tasks.remove(task)
+                    task["finish"]({"status": "success", "result": getattr(e, "value", None), "applied": True})
+                    continue
+                except Exception as e:
+                    self._tasks.remove(task)
+                    self.log_message("Error in task " + task["type"] + ": " + str(e))
+                    self.log_message(traceback.format_exc())
+                    task["finish"]({"status": "error", "message": str(e)})
+                    continue
+                now = time.time()
+                if info is not None and now - task["reported_at"] >= TASK_PROGRESS_INTERVAL:
+                    task["reported_at"] = now
+                    progress = dict(info)
+                    progress["elapsed_ms"] = (now - task["started_at"]) * 1000.0
+                    task["report"](progress)
+            first_round = False
+        if steps:
+            with self._queue_stats_lock:
+                self._queue_stats["task_steps"] += steps
+
+    def _run_to_completion(self, result):
+        """The final result of a handler, running it through if it is a generator"""
+        if not isinstance(result, types.GeneratorType):
+            return result
+        while True:
+            try:
+                next(result)
+            except StopIteration as e:
+                return getattr(e, "value", None)
+
+    def _finish_after(self, generator, spec, kwargs):
+        """Wrap a mutating task so its change is counted once it has finished"""
+        try:
+            return (yield from generator)
+        finally:
+            self._bump_for_mutation(spec, kwargs)
+
+    def _get_main_thread_queue_stats(self):
+        """Counters for the main-thread work queue"""
+        with self._queue_stats_lock:
+            stats = dict(self._queue_stats)
+        stats["depth"] = self._main_thread_queue.qsize()
+        with self._admission_lock:
+            stats["pending"] = self._admitted_total
+            stats["pending_clients"] = len(self._admitted)
+        stats["wait_average_ms"] = self._wait_average_ms
+        stats["running_tasks"] = [{"type": task["type"], "steps": task["steps"],
+                                   "elapsed_ms": (time.time() - task["started_at"]) * 1000.0}
+                                  for task in list(self._tasks)]
+        stats["budget_ms"] = self._main_thread_budget_ms
+        stats["avg_wait_ms"] = stats["total_wait_ms"] / stats["executed"] if stats["executed"] else 0.0
+        return stats
+
+    def _set_main_thread_budget(self, budget_ms=MAIN_THREAD_BUDGET_MS):
+        """Change how many milliseconds of each tick may be spent on queued work"""
+        if budget_ms <= 0:
+            raise ValueError("budget_ms must be positive")
+        self._main_thread_budget_ms = budget_ms
+        return {"budget_ms": self._main_thread_budget_ms}
+
+    def _execute_command(self, spec, params, on_main_thread=False, channel=None):
+        """Call a registered command's handler with its schema-bound parameters.
+
+        On the main thread, snapshot reads use their direct Live Object Model
+        handler so they see changes made earlier in the same task.
+        """
+        handler = spec.main_handler if on_main_thread and spec.main_handler else spec.handler
+        kwargs = spec.bind(params)
+        if spec.channel:
+            kwargs["channel"] = channel
+        if not spec.mutating:
+            return getattr(self, handler)(**kwargs)
+        finished = True
+        try:
+            result = getattr(self, handler)(**kwargs)
+            if isinstance(result, types.GeneratorType):
+                finished = False
+                return self._finish_after(result, spec, kwargs)
+            return result
+        finally:
+            # Listeners miss some edits (e.g. clip notes); count the attempt as a change
+            if finished:
+                self._bump_for_mutation(spec, kwargs)
+
+    # Session snapshot
+
+    def _mark_snapshot(self, parts=None):
+        """Mark snapshot parts stale; None marks all of them.
+
+        "tracks" stands for the track list and every track in it. Until those
+        have been re-read nothing is published, so readers never see tracks
+        at shifted indices.
+        """
+        self._snapshot_seq += 1
+        for part in (SNAPSHOT_LISTS + ("tracks",)) if parts is None else parts:
+            if part == "tracks":
+                self._snapshot_structure_seq = self._snapshot_seq
+                self._mark_snapshot_part(part)
+                for track_index in range(len(self._song.tracks)):
+                    self._mark_snapshot_part(("track", track_index))
+            else:
+                self._mark_snapshot_part(part)
+
+    def _mark_snapshot_part(self, part):
+        # A part keeps its place and seq until it is re-read
+        if part not in self._snapshot_dirty:
+            self._snapshot_dirty[part] = self._snapshot_seq
+
+    def _refresh_snapshot(self, deadline):
+        """Re-read stale parts of the session snapshot; must run on Live's main thread.
+
+        Dirty parts are re-read oldest first until deadline, at least one per
+        tick; time left over goes to the periodic sweep. Parts are written to
+        a working copy, and a changed copy is published by copying its
+        top-level lists and swapping a single reference, so the I/O thread
+        always sees a complete snapshot without locking.
+        """
+        if self._snapshot_work is None:
+            self._snapshot_work = {"session": None, "tracks": [], "clips": [], "scenes": None,
+                                   "return_tracks": None, "locators": None}
+            self._mark_snapshot()
+        first = True
+        while self._snapshot_dirty and (first or time.time() < deadline):
+            # The track list first, so track parts see the current indices
+            part = "tracks" if "tracks" in self._snapshot_dirty else next(iter(self._snapshot_dirty))
+            del self._snapshot_dirty[part]
+            self._refresh_snapshot_part(part)
+            first = False
+        if not self._snapshot_sweep and not self._snapshot_dirty \
+                and time.time() - self._snapshot_swept_at >= SNAPSHOT_REFRESH_INTERVAL:
+            self._snapshot_swept_at = time.time()
+            self._snapshot_sweep.extend(SNAPSHOT_LISTS)
+            self._snapshot_sweep.extend(("track", index) for index in range(len(self._snapshot_work["tracks"])))
+        while self._snapshot_sweep and time.time() < deadline:
+            self._refresh_snapshot_part(self._snapshot_sweep.popleft())
+        if self._snapshot_changed and not self._snapshot_blocked(self._snapshot_structure_seq):
+            self._publish_snapshot()
+
+    def _refresh_snapshot_part(self, part):
+        """Re-read one part into the working copy, noting whether it changed"""
+        work = self._snapshot_work
+        try:
+            if part == "tracks":
+                count = len(self._song.tracks)
+                if count != len(work["tracks"]):
+                    del work["tracks"][count:]
+                    del work["clips"][count:]
+                    while len(work["tracks"]) < count:
+                        self._mark_snapshot_part(("track", len(work["tracks"])))
+                        work["tracks"].append(None)
+                        work["clips"].append({})
+                    self._snapshot_changed = True
+                return
+            if part in SNAPSHOT_LISTS:
+                value = {"session": self._get_session_info, "scenes": self._list_scenes,
+                         "return_tracks": self._list_return_tracks, "locators": self._list_locators}[part]()
+                if value != work[part]:
+                    work[part] = value
+                    self._snapshot_changed = True
+                return
+            track_index = part[1]
+            if track_index >= len(work["tracks"]):
+                # The track list shrank since this part was marked
+                return
+            track = self._get_track_info(track_index)
+            clips = dict((slot["index"], self._get_clip_info(track_index, slot["index"]))
+                         for slot in track["clip_slots"] if slot["has_clip"])
+            if work["tracks"][track_index] is not None:
+                self._bump_unreported(track, clips, work["tracks"][track_index], work["clips"][track_index])
+            if track != work["tracks"][track_index] or clips != work["clips"][track_index]:
+                work["tracks"][track_index] = track
+                work["clips"][track_index] = clips
+                self._snapshot_changed = True
+        except Exception as e:
+            self.log_message("Error refreshing session snapshot " + str(part) + ": " + str(e))
+
+    def _bump_unreported(self, track, clips, old_track, old_clips):
+        """Give a re-read track and its clips new versions if they changed
+        without a listener noticing, e.g. a clip that started playing while
+        nobody was subscribed to clip slots. The changes are pushed to
+        subscribers on the next tick, like those a listener reports."""
+        track_index = track["index"]
+        changed = False
+        for clip_index, clip in clips.items():
+            old = old_clips.get(clip_index)
+            if old is not None and clip["version"] == old["version"] and clip != old:
+                key = ("clip", track_index, clip_index)
+                self._bump_version(key)
+                clips[clip_index] = dict(clip, version=self._object_version(key))
+                self._pending_changes[("clip_slot", track_index, clip_index)] = True
+                changed = True
+        if track["version"] == old_track["version"] and (changed or track != old_track):
+            self._bump_version(("track", track_index))
+            track["version"] = self._object_version(("track", track_index))
+            self._pending_changes[("track", track_index)] = True
+
+    def _snapshot_blocked(self, seq):
+        """Whether a part marked by the change with this seq is still dirty"""
+        return bool(self._snapshot_dirty) and next(iter(self._snapshot_dirty.values())) <= seq
+
+    def _publish_snapshot(self):
+        work = self._snapshot_work
+        snapshot = dict(work, tracks=list(work["tracks"]), clips=list(work["clips"]))
+        snapshot["version"] = (self._snapshot["version"] + 1) if self._snapshot else 1
+        # Empty clip slots report this; it is at least their real version
+        snapshot["version_counter"] = self._version_counter
+        self._snapshot = snapshot
+        self._snapshot_changed = False
+        self._snapshot_ready.set()
+
+    def _flush_deferred(self):
+        """Send held replies and events once the published snapshot includes their changes"""
+        while self._deferred_replies and not self._snapshot_changed \
+                and not self._snapshot_blocked(self._deferred_replies[0][0]):
+            _, send, message = self._deferred_replies.pop(0)
+            send(message)
+
+    def _current_snapshot(self):
+        """The latest snapshot, waiting briefly for the first one after startup"""
+        if not self._snapshot_ready.wait(5.0):
+            raise RuntimeError("Session snapshot is not available yet")
+        return self._snapshot
+
+    def _versioned(self, snapshot, result):
+        result = dict(result)
+        result["snapshot_version"] = snapshot["version"]
+        return result
+
+    def _snapshot_session_info(self):
+        snapshot = self._current_snapshot()
+        return self._versioned(snapshot, snapshot["session"])
+
+    def _snapshot_track(self, snapshot, track_index):
+        tracks = snapshot["tracks"]
+        # A new track whose first read failed is None until the sweep reads it
+        if track_index < 0 or track_index >= len(tracks) or tracks[track_index] is None:
+            raise IndexError("Track index out of range")
+        return tracks[track_index]
+
+    def _snapshot_track_info(self, track_index, if_version=None, fields=None, offset=0, limit=None):
+        snapshot = self._current_snapshot()
+        track = self._snapshot_track(snapshot, track_index)
+        if if_version == track["version"]:
+            return self._not_modified(if_version)
+        if offset or limit is not None:
+            slots = track["clip_slots"]
+            track = dict(track, clip_slots=[slots[index] for index in _page(len(slots), offset, limit)])
+        return self._versioned(snapshot, _project(track, fields))
+
+    def _snapshot_clip_info(self, track_index, clip_index, if_version=None):
+        snapshot = self._current_snapshot()
+        if clip_index < 0 or clip_index >= len(self._snapshot_track(snapshot, track_index)["clip_slots"]):
+            raise IndexError("Clip index out of range")
+        clip = snapshot["clips"][track_index].get(clip_index)
+        if clip is None:
+            clip = {"has_clip": False, "version": snapshot["version_counter"]}
+        if if_version == clip["version"]:
+            return self._not_modified(if_version)
+        return self._versioned(snapshot, clip)
+
+    def _snapshot_scenes(self, fields=None, offset=0, limit=None):
+        snapshot = self._current_snapshot()
+        scenes = snapshot["scenes"]
+        if fields is not None or offset or limit is not None:
+            entries = scenes["scenes"]
+            scenes = dict(scenes, scenes=[_project(entries[index], fields)
+                                          for index in _page(len(entries), offset, limit)])
+        return self._versioned(snapshot, scenes)
+
+    def _snapshot_return_tracks(self):
+        snapshot = self._current_snapshot()
+        return self._versioned(snapshot, snapshot["return_tracks"])
+
+    def _snapshot_locators(self):
+        snapshot = self._current_snapshot()
+        return self._versioned(snapshot, snapshot["locators"])
+
+    # State version counters
+
+    def _bump_version(self, key):
+        """Give an object a new version from the script-wide monotonic counter"""
+        self._version_counter += 1
+        self._versions[key] = self._version_counter
+
+    def _bump_for_mutation(self, spec, params):
+        """Bump the versions of the objects a mutating command's parameters name
+        and mark the snapshot parts it may have changed"""
+        if "track_index" not in params:
+            self._bump_version(SONG_VERSION)
+            self._mark_snapshot(spec.refreshes)
+            return
+        track_index = params["track_index"]
+        self._mark_snapshot([("track", track_index)])
+        self._bump_version(("track", track_index))
+        if "clip_index" in params:
+            self._bump_version(("clip", track_index, params["clip_index"]))
+        if "device_index" in params:
+            self._bump_version(("device", track_index, params["device_index"]))
+
+    def _object_version(self, key):
+        """Current version of ("song",), ("track", t), ("clip", t, c) or ("device", t, d).
+
+        Adding or removing tracks and scenes shifts indices, so it bumps every version.
+        """
+        version = max(self._versions.get(key, 0), self._versions.get(STRUCTURE_VERSION, 0))
+        if key[0] == "device":
+            version = max(version, self._versions.get(("devices", key[1]), 0))
+        return version
+
+    def _not_modified(self, version):
+        return {"not_modified": True, "version": version}
+
+    # Change subscriptions
+
+    def _subscribe(self, events=None, channel=None):
+        """Push coalesced change events for the given kinds to this client"""
+        if channel is None:
+            raise ValueError("subscribe needs a framed connection with protocol version 2")
+        kinds = set(events or EVENT_KINDS)
+        unknown = kinds - set(EVENT_KINDS)
+        if unknown:
+            raise ValueError("Unknown event kinds: " + ", ".join(sorted(unknown)))
+        with self._subscribers_lock:
+            self._subscribers[channel] = kinds
+        return {"subscribed": sorted(kinds), "seq": self._event_seq}
+
+    def _cancel(self, request_id, channel=None):
+        """Cancel a main-thread command sent earlier on this connection.
+
+        A queued command is dropped; a running task stops before its next
+        step. Either way the command itself is answered as cancelled. Other
+        commands run in one go and cannot be stopped once started.
+        """
+        if channel is None:
+            raise ValueError("cancel needs a framed connection with protocol version 2")
+        state = self._inflight.get((channel, request_id))
+        if state is None:
+            return {"request_id": request_id, "cancelled": False, "state": "finished"}
+        if state["started"] and not state["task"]:
+            return {"request_id": request_id, "cancelled": False, "state": "running"}
+        state["cancelled"] = True
+        return {"request_id": request_id, "cancelled": True, "state": "running" if state["started"] else "queued"}
+
+    def _unsubscribe(self, channel=None):
+        """Stop pushing change events to this client"""
+        self._drop_subscriber(channel)
+        return {"subscribed": []}
+
+    def _drop_subscriber(self, channel):
+        """Forget a client"""
+        with self._subscribers_lock:
+            self._subscribers.pop(channel, None)
+
+    def _listen(self, group, subject, prop, key, rebind=None):
+        """Note key as changed when subject.prop changes; rebind names the
+        listeners that the change invalidates (see _rebind_listeners)"""
+        callback = lambda: self._note_change(key, rebind)
+        getattr(subject, "add_" + prop + "_listener")(callback)
+        group.append((subject, prop, callback))
+
+    def _unlisten(self, group):
+        for subject, prop, callback in group:
+            try:
+                if getattr(subject, prop + "_has_listener")(callback):
+                    getattr(subject, "remove_" + prop + "_listener")(callback)
+            except Exception:
+                # The object may already be gone (e.g. a deleted track)
+                pass
+        del group[:]
+
+    def _add_listeners(self):
+        """Register Live Object Model listeners; must run on the main thread.
+
+        Song, list, track, device list and has_clip listeners stay registered
+        while the script runs: besides feeding event subscriptions they keep
+        the version counters honest. Clip and parameter listeners only exist
+        while a client subscribes to their kind (see _sync_listened_kinds);
+        otherwise the snapshot refresh and get_device_parameters notice those
+        changes and bump versions then.
+        """
+        song = self._song
+        # Anything may have changed while nobody was listening
+        self._bump_version(STRUCTURE_VERSION)
+        for prop in ("tempo", "signature_numerator", "signature_denominator"):
+            self._listen(self._song_listeners, song, prop, ("tempo",))
+        for prop in ("is_playing", "tracks", "scenes", "return_tracks", "cue_points"):
+            self._listen(self._song_listeners, song, prop, (prop,))
+        for parameter in (song.master_track.mixer_device.volume, song.master_track.mixer_device.panning):
+            self._listen(self._song_listeners, parameter, "value", ("master",))
+        self._add_list_listeners()
+        for track_index in range(len(song.tracks)):
+            self._add_track_listeners(track_index)
+
+    def _add_list_listeners(self):
+        """Listen to scene, return track and cue point names"""
+        group = self._list_listeners
+        for scene_index, scene in enumerate(self._song.scenes):
+            self._listen(group, scene, "name", ("scene", scene_index))
+        for track in self._song.return_tracks:
+            self._listen(group, track, "name", ("return_tracks",))
+        for cue_point in self._song.cue_points:
+            self._listen(group, cue_point, "name", ("cue_points",))
+            self._listen(group, cue_point, "time", ("cue_points",))
+
+    def _add_track_listeners(self, track_index):
+        """Listen to one track's properties, sends, clip slots, clips, devices and device parameters"""
+        track = self._song.tracks[track_index]
+        group = self._track_listeners.setdefault(track_index, [])
+        key = ("track", track_index)
+        for prop in ("name", "mute", "solo", "arm"):
+            self._listen(group, track, prop, key)
+        self._listen(group, track.mixer_device.volume, "value", key)
+        self._listen(group, track.mixer_device.panning, "value", key)
+        # Sends come and go with return tracks
+        self._listen(group, track.mixer_device, "sends", key, ("sends", track_index))
+        self._add_send_listeners(track_index)
+        self._listen(group, track, "devices", ("devices", track_index), ("parameters", track_index))
+        for slot_index, slot in enumerate(track.clip_slots):
+            self._listen(group, slot, "has_clip", ("clip_slot", track_index, slot_index),
+                         ("clip", track_index, slot_index))
+        # Registered over the next ticks, within the budget
+        if "clip_slots" in self._listened_kinds:
+            self._rebind.update(("clip", track_index, slot_index) for slot_index in range(len(track.clip_slots)))
+        if "device_parameters" in self._listened_kinds:
+            self._rebind.add(("parameters", track_index))
+
+    def _add_send_listeners(self, track_index):
+        """Listen to the send levels of one track"""
+        group = self._send_listeners.setdefault(track_index, [])
+        for send in self._song.tracks[track_index].mixer_device.sends:
+            self._listen(group, send, "value", ("track", track_index))
+
+    def _add_clip_listeners(self, track_index, slot_index):
+        """Listen to one slot's playing status and the properties of its clip, if there is one"""
+        if "clip_slots" not in self._listened_kinds:
+            return
+        slot = self._song.tracks[track_index].clip_slots[slot_index]
+        group = self._clip_listeners.setdefault((track_index, slot_index), [])
+        key = ("clip_slot", track_index, slot_index)
+        self._listen(group, slot, "playing_status", key)
+        if slot.has_clip:
+            for prop in CLIP_LISTENED_PROPERTIES:
+                self._listen(group, slot.clip, prop, key)
+
+    def _add_parameter_listeners(self, track_index):
+        """Listen to the parameters of every device on one track"""
+        if "device_parameters" not in self._listened_kinds:
+            return
+        group = self._parameter_listeners.setdefault(track_index, [])
+        for device_index, device in enumerate(self._song.tracks[track_index].devices):
+            for parameter_index, parameter in enumerate(device.parameters):
+                self._listen(group, parameter, "value",
+                             ("device_parameter", track_index, device_index, parameter_index))
+
+    def _remove_track_listeners(self):
+        for groups in (self._track_listeners, self._clip_listeners, self._send_listeners, self._parameter_listeners):
+            for group in groups.values():
+                self._unlisten(group)
+            groups.clear()
+
+    def _sync_listened_kinds(self):
+        """Register or remove clip and parameter listeners as subscriptions to their kinds come and go"""
+        with self._subscribers_lock:
+            wanted = set()
+            for kinds in self._subscribers.values():
+                wanted.update(kinds)
+        wanted.intersection_update(SUBSCRIBED_LISTENER_KINDS)
+        changed = wanted ^ self._listened_kinds
+        if not changed:
+            return
+        self._listened_kinds = wanted
+        for track_index, track in enumerate(self._song.tracks):
+            if "clip_slots" in changed:
+                self._rebind.update(("clip", track_index, slot_index) for slot_index in range(len(track.clip_slots)))
+            if "device_parameters" in changed:
+                self._rebind.add(("parameters", track_index))
+
+    def _rebind_listeners(self, deadline):
+        """Re-register listeners whose targets were added, removed or moved.
+
+        A new or deleted clip only affects its slot's clip listeners, a
+        changed send list only its track's send listeners and a changed
+        device list only its track's parameter listeners. Adding,
+        removing or moving tracks or scenes shifts every index, so then all
+        track listeners are registered again. Clip, send and parameter
+        listeners are re-registered until deadline, at least one group per tick.
+        """
+        if not self._song_listeners:
+            return
+        if "lists" in self._rebind:
+            self._rebind.discard("lists")
+            self._unlisten(self._list_listeners)
+            self._add_list_listeners()
+        if "tracks" in self._rebind:
+            self._rebind = set()
+            self._remove_track_listeners()
+            for track_index in range(len(self._song.tracks)):
+                self._add_track_listeners(track_index)
+        first = True
+        while self._rebind and (first or time.time() < deadline):
+            item = self._rebind.pop()
+            first = False
+            try:
+                if item[0] == "clip":
+                    self._unlisten(self._clip_listeners.pop(item[1:], []))
+                    self._add_clip_listeners(item[1], item[2])
+                elif item[0] == "sends":
+                    self._unlisten(self._send_listeners.pop(item[1], []))
+                    self._add_send_listeners(item[1])
+                else:
+                    self._unlisten(self._parameter_listeners.pop(item[1], []))
+                    self._add_parameter_listeners(item[1])
+            except IndexError:
+                # The track or slot went away; the list change rebinds everything
+                pass
+
+    def _remove_listeners(self):
+        self._remove_track_listeners()
+        self._unlisten(self._list_listeners)
+        self._unlisten(self._song_listeners)
+        self._listened_kinds = set()
+        self._pending_changes = {}
+        self._rebind = set()
+
+    def _note_change(self, key, rebind=None):
+        """Listener callback: remember what changed; values are read when flushing"""
+        self._pending_changes[key] = True
+        for version_key in CHANGE_VERSION_KEYS.get(key[0], lambda key: [SONG_VERSION])(key):
+            self._bump_version(version_key)
+        # Listeners are not changed from inside a notification; rebind when flushing
+        kind = key[0]
+        if kind in ("tracks", "scenes"):
+            self._rebind.update(("tracks", "lists"))
+        elif kind in ("return_tracks", "cue_points"):
+            self._rebind.add("lists")
+        if rebind is not None:
+            self._rebind.add(rebind)
+
+    def _describe_change(self, key):
+        """Turn a change key into (event kind, change entry) with current values"""
+        kind = key[0]
+        song = self._song
+        if kind == "tempo":
+            return "tempo", {"kind": "tempo", "value": song.tempo,
+                             "signature_numerator": song.signature_numerator,
+                             "signature_denominator": song.signature_denominator}
+        if kind == "is_playing":
+            return "is_playing", {"kind": "is_playing", "value": song.is_playing}
+        if kind == "tracks":
+            return "tracks", {"kind": "tracks", "track_count": len(song.tracks)}
+        if kind == "track":
+            track = song.tracks[key[1]]
+            return "tracks", {"kind": "track", "track_index": key[1], "name": track.name,
+                              "mute": track.mute, "solo": track.solo, "arm": track.arm,
+                              "volume": track.mixer_device.volume.value,
+                              "panning": track.mixer_device.panning.value,
+                              "sends": [send.value for send in track.mixer_device.sends]}
+        if kind == "master":
+            mixer = song.master_track.mixer_device
+            return "tracks", {"kind": "master", "volume": mixer.volume.value, "panning": mixer.panning.value}
+        if kind == "scenes":
+            return "scenes", {"kind": "scenes", "scene_count": len(song.scenes)}
+        if kind == "scene":
+            return "scenes", {"kind": "scene", "scene_index": key[1], "name": song.scenes[key[1]].name}
+        if kind == "return_tracks":
+            return "return_tracks", {"kind": "return_tracks", "return_track_count": len(song.return_tracks)}
+        if kind == "cue_points":
+            return "locators", {"kind": "locators", "locator_count": len(song.cue_points)}
+        if kind == "clip_slot":
+            slot = song.tracks[key[1]].clip_slots[key[2]]
+            return "clip_slots", {"kind": "clip_slot", "track_index": key[1], "clip_index": key[2],
+                                  "has_clip": slot.has_clip, "playing_status": slot.playing_status}
+        if kind == "devices":
+            return "device_parameters", {"kind": "devices", "track_index": key[1],
+                                         "device_count": len(song.tracks[key[1]].devices)}
+        parameter = song.tracks[key[1]].devices[key[2]].parameters[key[3]]
+        return "device_parameters", {"kind": "device_parameter", "track_index": key[1],
+                                     "device_index": key[2], "parameter_index": key[3],
+                                     "value": parameter.value}
+
+    def _collect_events(self, deadline):
+        """Describe the changes noted since the last tick; must run on the main thread"""
+        if not self._song_listeners:
+            self._add_listeners()
+        self._sync_listened_kinds()
+        self._rebind_listeners(deadline)
+        if not self._pending_changes:
+            return []
+        keys, self._pending_changes = list(self._pending_changes), {}
+        parts = []
+        for key in keys:
+            parts.extend(CHANGE_SNAPSHOT_PARTS[key[0]](key))
+        if parts:
+            self._mark_snapshot(parts)
+        changes = []
+        for key in keys:
+            try:
+                changes.append(self._describe_change(key))
+            except (IndexError, AttributeError):
+                # The object went away before the flush; a list change covers it
+                pass
+        return changes
+
+    def _push_events(self, changes):
+        """Send collected changes to each subscriber, filtered by its event kinds"""
+        with self._subscribers_lock:
+            if not changes or not self._subscribers:
+                return
+        self._event_seq += 1
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers.items())
+        for channel, kinds in subscribers:
+            selected = [change for kind, change in changes if kind in kinds]
+            if selected:
+                channel.put({"event": "changes", "seq": self._event_seq, "changes": selected})
+
+    def _run_batch(self, commands, stop_on_error=True):
+        """Run an ordered list of sub-commands inside a single main-thread task.
+
+        Each item reports its own status and elapsed time. With stop_on_error the
+        first failure marks the remaining items as skipped; otherwise every item runs.
+        """
+        results = []
+        failed = 0
+        stopped = False
+        batch_start = time.time()
+        for index, sub_command in enumerate(commands):
+            command_type = sub_command.get("type", "")
+            item = {"index": index, "type": command_type}
+            if stopped:
+                item["status"] = "skipped"
+                results.append(item)
+                continue
+
+            item_start = time.time()
+            try:
+                if command_type == "batch":
+                    raise ValueError("Nested batch commands are not supported")
+                spec = COMMANDS.get(command_type)
+                if spec is None:
+                    raise ValueError("Unknown command: " + command_type)
+                # A batch is one main-thread task; long-running commands run through
+                item["result"] = self._run_to_completion(
+                    self._execute_command(spec, sub_command.get("params", {}), True))
+                item["status"] = "success"
+            except Exception as e:
+                self.log_message("Error in batch item " + str(index) + " (" + command_type + "): " + str(e))
+                item["status"] = "error"
+                item["message"] = str(e)
+                failed += 1
+                stopped = bool(stop_on_error)
+            item["elapsed_ms"] = (time.time() - item_start) * 1000.0
+            results.append(item)
+
+        return {
+            "results": results,
+            "count": len(results),
+            "failed": failed,
+            "skipped": len([r for r in results if r["status"] == "skipped"]),
+            "stopped": stopped,
+            "elapsed_ms": (time.time() - batch_start) * 1000.0
+        }
+
     # Command implementations
+
+    def _hello(self, protocol_version=0):
+        """Negotiate the wire protocol and describe what this script supports.
+
+        The reply carries the highest version both sides support, the supported
+        command names and the time this script started.
+        """
+        return {
+            "protocol_version": min(protocol_version, PROTOCOL_VERSION),
+            "commands": sorted(COMMANDS),
+            "server_start_time": self._start_time
+        }
+
+    def _get_command_registry(self):
+        """Describe every command: thread, mutating flag, timeout and parameters"""
+        return {
+            "commands": dict((name, spec.describe()) for name, spec in COMMANDS.items())
+        }
+
+    def _ping(self):
+        """Cheap liveness check that never touches Live's main thread"""
+        return {"server_start_time": self._start_time, "time": time.time()}
     
     def _get_session_info(self):
         """Get information about the current session"""
@@ -554,6 +1852,53 @@ class AbletonMCP(ControlSurface):
             self.log_message("Error getting session info: " + str(e))
             raise
 
+    def _get_session_snapshot(self, depth=1):
+        """Walk the whole set once and return it in one structure.
+
+        depth 0: session, track mixer state, scenes, return tracks and locators
+        depth 1: also the clips in each track and the device list of each track
+        depth 2: also the parameters of every device
+        """
+        try:
+            song = self._song
+            tracks = []
+            for track_index in range(len(song.tracks)):
+                # Clip slots and devices are only read when they are wanted
+                info = self._get_track_info(track_index, fields=None if depth >= 1 else SESSION_TRACK_FIELDS)
+                if depth >= 1:
+                    # Only occupied slots are listed to keep large sets compact
+                    info["clips"] = [dict(slot["clip"], index=slot["index"])
+                                     for slot in info.pop("clip_slots") if slot["has_clip"]]
+                    if depth >= 2:
+                        devices = song.tracks[track_index].devices
+                        for device_info in info["devices"]:
+                            device_info["parameters"] = self._describe_parameters(devices[device_info["index"]])
+                tracks.append(info)
+
+            return_tracks = []
+            for index, track in enumerate(song.return_tracks):
+                return_tracks.append({
+                    "index": index,
+                    "name": track.name,
+                    "mute": track.mute,
+                    "solo": track.solo,
+                    "volume": track.mixer_device.volume.value,
+                    "panning": track.mixer_device.panning.value
+                })
+
+            return {
+                "depth": depth,
+                "session": self._get_session_info(),
+                "is_playing": song.is_playing,
+                "tracks": tracks,
+                "scenes": self._list_scenes()["scenes"],
+                "return_tracks": return_tracks,
+                "locators": self._list_locators()["locators"]
+            }
+        except Exception as e:
+            self.log_message("Error getting session snapshot: " + str(e))
+            raise
+
     def _get_application_info(self):
         """Return basic information about the Live Application (LOM Application)."""
         try:
@@ -835,17 +2180,29 @@ class AbletonMCP(ControlSurface):
             self.log_message("Error zooming view: " + str(e))
             raise
     
-    def _get_track_info(self, track_index):
-        """Get information about a track"""
+    def _get_track_info(self, track_index, if_version=None, fields=None, offset=0, limit=None):
+        """Get information about a track.
+
+        fields limits the reply to the named keys; offset/limit select a page
+        of clip slots. Clip slots and devices are only read when requested.
+        """
         try:
             if track_index < 0 or track_index >= len(self._song.tracks):
                 raise IndexError("Track index out of range")
+
+            version = self._object_version(("track", track_index))
+            if if_version == version:
+                return self._not_modified(version)
             
             track = self._song.tracks[track_index]
             
             # Get clip slots
             clip_slots = []
-            for slot_index, slot in enumerate(track.clip_slots):
+            slot_range = _page(len(track.clip_slots), offset, limit)
+            if fields is not None and "clip_slots" not in fields:
+                slot_range = ()
+            for slot_index in slot_range:
+                slot = track.clip_slots[slot_index]
                 clip_info = None
                 if slot.has_clip:
                     clip = slot.clip
@@ -864,7 +2221,7 @@ class AbletonMCP(ControlSurface):
             
             # Get devices
             devices = []
-            for device_index, device in enumerate(track.devices):
+            for device_index, device in enumerate(track.devices if fields is None or "devices" in fields else ()):
                 devices.append({
                     "index": device_index,
                     "name": device.name,
@@ -882,26 +2239,32 @@ class AbletonMCP(ControlSurface):
                 "arm": track.arm,
                 "volume": track.mixer_device.volume.value,
                 "panning": track.mixer_device.panning.value,
+                "sends": [send.value for send in track.mixer_device.sends],
                 "clip_slots": clip_slots,
-                "devices": devices
+                "clip_slot_count": len(track.clip_slots),
+                "devices": devices,
+                "version": version
             }
-            return result
+            return _project(result, fields)
         except Exception as e:
             self.log_message("Error getting track info: " + str(e))
             raise
     
-    def _list_scenes(self):
-        """Get a list of all scenes in the session"""
+    def _list_scenes(self, fields=None, offset=0, limit=None):
+        """Get a list of all scenes in the session, or a page of it.
+
+        fields limits each scene entry to the named keys.
+        """
         try:
             scenes = []
-            for index, scene in enumerate(self._song.scenes):
-                scenes.append({
+            for index in _page(len(self._song.scenes), offset, limit):
+                scenes.append(_project({
                     "index": index,
-                    "name": scene.name
-                })
+                    "name": self._song.scenes[index].name
+                }, fields))
             return {
                 "scenes": scenes,
-                "scene_count": len(scenes)
+                "scene_count": len(self._song.scenes)
             }
         except Exception as e:
             self.log_message("Error listing scenes: " + str(e))
@@ -1273,7 +2636,7 @@ class AbletonMCP(ControlSurface):
             
             # Try to find by URI first if provided
             if uri:
-                item = self._find_browser_item_by_uri(app.browser, uri)
+                item = self._find_browser_item(app.browser, uri)
                 if item:
                     result["found"] = True
                     result["item"] = {
@@ -1355,7 +2718,7 @@ class AbletonMCP(ControlSurface):
             app = self.application()
             
             # Find the browser item by URI
-            item = self._find_browser_item_by_uri(app.browser, item_uri)
+            item = self._find_browser_item(app.browser, item_uri)
             
             if not item:
                 raise ValueError("Browser item with URI '{0}' not found".format(item_uri))
@@ -1378,6 +2741,163 @@ class AbletonMCP(ControlSurface):
             self.log_message(traceback.format_exc())
             raise
     
+    def _find_browser_item(self, browser, uri):
+        """Find a browser item by URI through the index, walking the browser on a miss"""
+        for index in (self._browser_index, self._browser_index_next):
+            item = index.get(uri) if index else None
+            if item is None:
+                continue
+            try:
+                if item.uri == uri:
+                    self._browser_index_stats["hits"] += 1
+                    return item
+            except Exception:
+                pass
+            # The library changed under the index; rebuild it on the next idle tick
+            index.pop(uri, None)
+            self._browser_index_stats["stale"] += 1
+            self._browser_index_built_at = 0.0
+
+        self._browser_index_stats["misses"] += 1
+        item = self._find_browser_item_by_uri(browser, uri)
+        if item is not None:
+            self._browser_index[uri] = item
+        return item
+
+    def _index_browser_step(self, deadline):
+        """Add browser items to the URI index until deadline; must run on the main thread"""
+        if self._browser_index_pending is None:
+            if time.time() - self._browser_index_built_at < BROWSER_INDEX_REFRESH_INTERVAL:
+                return
+            try:
+                browser = self.application().browser
+                roots = [getattr(browser, name) for name in BROWSER_INDEX_ROOTS if hasattr(browser, name)]
+            except Exception as e:
+                self.log_message("Error starting browser index: " + str(e))
+                self._browser_index_built_at = time.time()
+                return
+            self._browser_index_next = {}
+            self._browser_index_pending = [(root, 1) for root in reversed(roots)]
+
+        pending = self._browser_index_pending
+        index = self._browser_index_next
+        while pending and time.time() < deadline:
+            item, depth = pending.pop()
+            try:
+                uri = getattr(item, "uri", None)
+                if uri:
+                    index.setdefault(uri, item)
+                if depth < BROWSER_INDEX_MAX_DEPTH:
+                    children = getattr(item, "children", None)
+                    if children:
+                        # Reversed so items are indexed in browser order
+                        pending.extend((child, depth + 1) for child in reversed(list(children)))
+            except Exception as e:
+                self.log_message("Error indexing browser item: " + str(e))
+
+        if not pending:
+            # Swap in the finished index; items missing from it are gone from the library
+            self._browser_index = index
+            self._browser_index_next = None
+            self._browser_index_pending = None
+            self._browser_index_built_at = time.time()
+            self._browser_index_stats["builds"] += 1
+            self._browser_path_cache.clear()
+
+    def _refresh_browser_index(self):
+        """Start a fresh crawl of the browser on the next idle tick"""
+        self._browser_index_next = None
+        self._browser_index_pending = None
+        self._browser_index_built_at = 0.0
+        self._browser_path_cache.clear()
+        return {"refreshing": True, "size": len(self._browser_index)}
+
+    def _get_browser_index_stats(self):
+        """Size and hit/miss counters of the browser URI index"""
+        stats = dict(self._browser_index_stats)
+        building = self._browser_index_next
+        pending = self._browser_index_pending
+        stats["size"] = len(self._browser_index)
+        stats["building"] = pending is not None
+        stats["indexed_in_build"] = len(building) if building is not None else 0
+        stats["pending"] = len(pending) if pending is not None else 0
+        stats["built_at"] = self._browser_index_built_at
+        stats["path_cache_size"] = len(self._browser_path_cache)
+        return stats
+
+    def _browser_category(self, browser, name):
+        """The browser category whose attribute name matches name case-insensitively, or None"""
+        if name in BROWSER_INDEX_ROOTS and hasattr(browser, name):
+            return getattr(browser, name)
+        for attr in dir(browser):
+            if not attr.startswith('_') and attr.lower() == name:
+                try:
+                    return getattr(browser, attr)
+                except Exception as e:
+                    self.log_message("Error accessing browser attribute {0}: {1}".format(attr, str(e)))
+        return None
+
+    def _cached_browser_path(self, key, part):
+        """A cached item for a path if it still looks like the one that was cached"""
+        item = self._browser_path_cache.pop(key, None)
+        if item is None:
+            return None
+        try:
+            # Category roots are named differently from their attribute
+            if "/" in key and item.name.lower() != part:
+                return None
+        except Exception:
+            # The item was removed from the library
+            return None
+        self._browser_path_cache[key] = item
+        return item
+
+    def _cache_browser_path(self, key, item):
+        cache = self._browser_path_cache
+        cache.pop(key, None)
+        cache[key] = item
+        while len(cache) > BROWSER_PATH_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _resolve_browser_path(self, browser, parts):
+        """Walk lowercase path parts down from a browser category.
+
+        Starts from the longest prefix in the path cache, so sibling folders
+        share the walk to their parent. Returns the deepest item reached and
+        the number of parts it covers; 0 means the category was not found.
+        """
+        depth = len(parts)
+        item = None
+        while depth > 0:
+            item = self._cached_browser_path("/".join(parts[:depth]), parts[depth - 1])
+            if item is not None:
+                break
+            depth -= 1
+        if depth == len(parts):
+            self._browser_index_stats["path_hits"] += 1
+            return item, depth
+        self._browser_index_stats["path_misses"] += 1
+
+        if item is None:
+            item = self._browser_category(browser, parts[0])
+            if item is None:
+                return None, 0
+            depth = 1
+            self._cache_browser_path(parts[0], item)
+        while depth < len(parts):
+            part = parts[depth]
+            found = None
+            for child in getattr(item, 'children', None) or ():
+                if hasattr(child, 'name') and child.name.lower() == part:
+                    found = child
+                    break
+            if found is None:
+                break
+            item = found
+            depth += 1
+            self._cache_browser_path("/".join(parts[:depth]), item)
+        return item, depth
+
     def _find_browser_item_by_uri(self, browser_or_item, uri, max_depth=10, current_depth=0):
         """Find a browser item by its URI"""
         try:
@@ -1442,8 +2962,12 @@ class AbletonMCP(ControlSurface):
             self.log_message("Error deleting device: " + str(e))
             raise
 
-    def _get_device_parameters(self, track_index, device_index):
-        """Get a list of parameters for a device"""
+    def _get_device_parameters(self, track_index, device_index, if_version=None, fields=None, offset=0, limit=None):
+        """Get a list of parameters for a device.
+
+        offset/limit select a page of the device's parameters (counting
+        disabled ones) and fields limits each parameter entry to the named keys.
+        """
         try:
             if track_index < 0 or track_index >= len(self._song.tracks):
                 raise IndexError("Track index out of range")
@@ -1454,32 +2978,49 @@ class AbletonMCP(ControlSurface):
                 raise IndexError("Device index out of range")
 
             device = track.devices[device_index]
+            key = ("device", track_index, device_index)
+            # Without parameter listeners a changed value is only noticed here
+            values = tuple(parameter.value for parameter in device.parameters)
+            if self._parameter_values.get(key, values) != values:
+                self._bump_version(key)
+            self._parameter_values[key] = values
 
-            parameters = []
-            for param_index, param in enumerate(device.parameters):
-                if param.is_enabled:
-                    param_info = {
-                        "index": param_index,
-                        "name": param.name,
-                        "value": param.value,
-                        "min": param.min,
-                        "max": param.max,
-                        "is_quantized": param.is_quantized,
-                    }
-                    if param.is_quantized:
-                        param_info["value_items"] = param.value_items
-                    parameters.append(param_info)
+            version = self._object_version(key)
+            if if_version == version:
+                return self._not_modified(version)
 
             return {
                 "track_index": track_index,
                 "device_index": device_index,
                 "device_name": device.name,
-                "parameters": parameters
+                "parameters": self._describe_parameters(device, fields, offset, limit),
+                "parameter_count": len(device.parameters),
+                "version": version
             }
         except Exception as e:
             self.log_message("Error getting device parameters: " + str(e))
             raise
 
+    def _describe_parameters(self, device, fields=None, offset=0, limit=None):
+        """The enabled parameters of a device, optionally paged and projected"""
+        parameters = []
+        device_parameters = device.parameters
+        for param_index in _page(len(device_parameters), offset, limit):
+            param = device_parameters[param_index]
+            if param.is_enabled:
+                param_info = {
+                    "index": param_index,
+                    "name": param.name,
+                    "value": param.value,
+                    "min": param.min,
+                    "max": param.max,
+                    "is_quantized": param.is_quantized,
+                }
+                if param.is_quantized and (fields is None or "value_items" in fields):
+                    param_info["value_items"] = param.value_items
+                parameters.append(_project(param_info, fields))
+        return parameters
+
     def _get_device_details(self, track_index, device_index):
         """Get detailed information about a specific device."""
         try:
@@ -1529,7 +3070,7 @@ class AbletonMCP(ControlSurface):
             self.log_message("Error finding device by name: " + str(e))
             raise
 
-    def _get_clip_info(self, track_index, clip_index):
+    def _get_clip_info(self, track_index, clip_index, if_version=None):
         """Get detailed information about a specific clip."""
         try:
             if track_index < 0 or track_index >= len(self._song.tracks):
@@ -1540,8 +3081,12 @@ class AbletonMCP(ControlSurface):
                 raise IndexError("Clip index out of range")
             clip_slot = track.clip_slots[clip_index]
 
+            version = self._object_version(("clip", track_index, clip_index))
+            if if_version == version:
+                return self._not_modified(version)
+
             if not clip_slot.has_clip:
-                return { "has_clip": False }
+                return { "has_clip": False, "version": version }
 
             clip = clip_slot.clip
 
@@ -1557,6 +3102,7 @@ class AbletonMCP(ControlSurface):
                 "signature_numerator": clip.signature_numerator,
                 "signature_denominator": clip.signature_denominator,
                 "is_playing": clip.is_playing,
+                "version": version,
             }
             return clip_details
         except Exception as e:
@@ -1878,7 +3424,10 @@ class AbletonMCP(ControlSurface):
             raise
 
     def _clear_arrangement(self, track_indices=None):
-        """Delete all arrangement clips on specified tracks or all tracks if None."""
+        """Delete all arrangement clips on specified tracks or all tracks if None.
+
+        Runs as a task: yields after every deleted clip.
+        """
         try:
             deleted_counts = []
             tracks_to_clear = []
@@ -1890,7 +3439,7 @@ class AbletonMCP(ControlSurface):
                         raise IndexError("Track index out of range: {0}".format(idx))
                     tracks_to_clear.append(self._song.tracks[idx])
 
-            for t in tracks_to_clear:
+            for position, t in enumerate(tracks_to_clear):
                 # Copy list to avoid mutation during iteration
                 clips = list(getattr(t, 'arrangement_clips', []))
                 count = 0
@@ -1902,6 +3451,8 @@ class AbletonMCP(ControlSurface):
                     except Exception as e:
                         # Best effort; continue
                         self.log_message("Error deleting arrangement clip: " + str(e))
+                    yield {"completed": position, "total": len(tracks_to_clear),
+                           "deleted": sum(deleted_counts) + count}
                 deleted_counts.append(count)
 
             return { "tracks_cleared": len(tracks_to_clear), "deleted_counts": deleted_counts }
@@ -1914,6 +3465,8 @@ class AbletonMCP(ControlSurface):
 
         This uses the documented API on Track rather than Clip. After duplication,
         length/loop is set if provided.
+
+        Runs as a task: yields after every extra segment it duplicates.
         """
         try:
             if track_index < 0 or track_index >= len(self._song.tracks):
@@ -2041,6 +3594,10 @@ class AbletonMCP(ControlSurface):
                             pass
                         created_count += 1
                         remaining -= seg_len
+                        yield {"completed": created_count, "remaining_beats": remaining}
+                    else:
+                        # Nothing was placed; retrying would never finish
+                        raise RuntimeError("Track.duplicate_clip_to_arrangement returned no clip")
 
                 post_state = _state_dict(new_arrangement_clip)
                 _log_obj("duplicate_to_arrangement post", post_state)
@@ -2186,6 +3743,9 @@ class AbletonMCP(ControlSurface):
     def get_browser_tree(self, category_type="all", max_depth=2):
         """
         Get a simplified tree of browser categories, with recursion.
+
+        Runs as a task: yields after every item, so deep trees are built over
+        several ticks. crawl_browser returns the same items in pages.
         
         Args:
             category_type: Type of categories to get ('all', 'instruments', 'sounds', etc.)
@@ -2207,11 +3767,8 @@ class AbletonMCP(ControlSurface):
                 "available_categories": browser_attrs
             }
 
-            def process_item_recursive(item, current_depth=0):
-                if not item or current_depth >= max_depth:
-                    return None
-                
-                item_info = {
+            def describe_item(item):
+                return {
                     "name": item.name if hasattr(item, 'name') else "Unknown",
                     "is_folder": hasattr(item, 'children') and bool(item.children),
                     "is_device": hasattr(item, 'is_device') and item.is_device,
@@ -2219,28 +3776,33 @@ class AbletonMCP(ControlSurface):
                     "uri": item.uri if hasattr(item, 'uri') else None,
                     "children": []
                 }
-                
-                if item_info["is_folder"] and current_depth < max_depth - 1:
-                    for child in item.children:
-                        child_info = process_item_recursive(child, current_depth + 1)
-                        if child_info:
-                            item_info["children"].append(child_info)
-                
-                return item_info
             
             categories_to_process = []
             if category_type == "all":
-                categories_to_process = ['instruments', 'sounds', 'drums', 'audio_effects', 'midi_effects', 'plugins']
+                categories_to_process = list(BROWSER_CATEGORIES)
             else:
                 categories_to_process = [category_type]
             
+            processed = 0
             for category_name in categories_to_process:
                 if hasattr(app.browser, category_name):
                     try:
                         category_root = getattr(app.browser, category_name)
-                        category_tree = process_item_recursive(category_root)
-                        if category_tree:
-                            result["categories"].append(category_tree)
+                        if not category_root or max_depth < 1:
+                            continue
+                        category_tree = describe_item(category_root)
+                        result["categories"].append(category_tree)
+                        # Depth-first, keeping each folder's children in browser order
+                        pending = [(category_root, category_tree, 0)]
+                        while pending:
+                            item, item_info, depth = pending.pop()
+                            if item_info["is_folder"] and depth < max_depth - 1:
+                                children = [(child, describe_item(child)) for child in item.children if child]
+                                item_info["children"] = [child_info for _, child_info in children]
+                                pending.extend((child, child_info, depth + 1)
+                                               for child, child_info in reversed(children))
+                            processed += 1
+                            yield {"completed": processed, "category": category_name}
                     except Exception as e:
                         self.log_message("Error processing category " + category_name + ": " + str(e))
 
@@ -2252,7 +3814,107 @@ class AbletonMCP(ControlSurface):
             self.log_message(traceback.format_exc())
             raise
     
-    def get_browser_items_at_path(self, path):
+    def _crawl_browser(self, category_type="all", max_depth=BROWSER_INDEX_MAX_DEPTH,
+                       page_size=BROWSER_CRAWL_PAGE_SIZE, cursor=None):
+        """
+        Walk the browser depth-first, one page of flat nodes per call.
+
+        Each page stops after page_size nodes or BROWSER_CRAWL_PAGE_MS of main
+        thread time, so a deep crawl never blocks Live for long. Pass the
+        returned cursor to get the next page; it is None once the crawl is
+        done. Asking for the same cursor again replays the page, so a client
+        can retry a page it did not receive.
+
+        Nodes carry their path (usable with get_browser_items_at_path) and
+        depth, starting at 0 for the category roots.
+        """
+        try:
+            now = time.time()
+            crawls = self._browser_crawls
+            for crawl_id in [key for key, crawl in crawls.items() if now - crawl["touched"] > BROWSER_CRAWL_TTL]:
+                del crawls[crawl_id]
+
+            if cursor:
+                crawl_id, _, page = cursor.rpartition(":")
+                crawl = crawls.get(crawl_id)
+                if crawl is None or not page.isdigit():
+                    raise ValueError("Unknown or expired crawl cursor: {0}".format(cursor))
+                page = int(page)
+                if page == crawl["page"]:
+                    crawl["touched"] = now
+                    return crawl["last"]
+                if page != crawl["page"] + 1:
+                    raise ValueError("Crawl cursor {0} is out of order; expected page {1}".format(
+                        cursor, crawl["page"] + 1))
+            else:
+                app = self.application()
+                if not app or not hasattr(app, 'browser') or app.browser is None:
+                    raise RuntimeError("Browser is not available in the Live application")
+                names = list(BROWSER_CATEGORIES) if category_type == "all" else [category_type]
+                names = [name for name in names if hasattr(app.browser, name)]
+                self._browser_crawl_counter += 1
+                crawl_id = str(self._browser_crawl_counter)
+                crawl = {
+                    "pending": [(getattr(app.browser, name), 0, name, name) for name in reversed(names)],
+                    "max_depth": max(1, max_depth),
+                    "categories": names,
+                    "page": 0,
+                    "last": None,
+                    "touched": now,
+                }
+                crawls[crawl_id] = crawl
+                while len(crawls) > BROWSER_CRAWL_MAX:
+                    crawls.popitem(last=False)
+
+            pending = crawl["pending"]
+            max_depth = crawl["max_depth"]
+            nodes = []
+            deadline = now + BROWSER_CRAWL_PAGE_MS / 1000.0
+            while pending and len(nodes) < max(1, page_size) and (not nodes or time.time() < deadline):
+                item, depth, path, category = pending.pop()
+                try:
+                    children = list(item.children) if hasattr(item, 'children') else []
+                    node = {
+                        "name": item.name if hasattr(item, 'name') else "Unknown",
+                        "path": path,
+                        "category": category,
+                        "depth": depth,
+                        "uri": item.uri if hasattr(item, 'uri') else None,
+                        "is_folder": bool(children),
+                        "is_device": hasattr(item, 'is_device') and item.is_device,
+                        "is_loadable": hasattr(item, 'is_loadable') and item.is_loadable
+                    }
+                    if children and depth < max_depth - 1:
+                        # Reversed so nodes come out in browser order
+                        pending.extend((child, depth + 1, path + "/" + child.name, category)
+                                       for child in reversed(children))
+                    elif children:
+                        node["has_more"] = True
+                    nodes.append(node)
+                except Exception as e:
+                    self.log_message("Error crawling browser item at {0}: {1}".format(path, str(e)))
+
+            crawl["page"] += 1
+            crawl["touched"] = time.time()
+            result = {
+                "nodes": nodes,
+                "page": crawl["page"],
+                "cursor": "{0}:{1}".format(crawl_id, crawl["page"] + 1) if pending else None,
+                "done": not pending
+            }
+            if crawl["page"] == 1:
+                result["categories"] = crawl["categories"]
+                if not crawl["categories"]:
+                    app = self.application()
+                    result["available_categories"] = [attr for attr in dir(app.browser) if not attr.startswith('_')]
+            crawl["last"] = result
+            return result
+        except Exception as e:
+            self.log_message("Error crawling browser: " + str(e))
+            self.log_message(traceback.format_exc())
+            raise
+
+    def get_browser_items_at_path(self, path, fields=None, offset=0, limit=None):
         """
         Get browser items at a specific path.
         
@@ -2260,6 +3922,8 @@ class AbletonMCP(ControlSurface):
             path: Path in the format "category/folder/subfolder"
                  where category is one of: instruments, sounds, drums, audio_effects, midi_effects
                  or any other available browser category
+            fields: Keys to keep in each item (None keeps all)
+            offset, limit: Page of the children to return
                  
         Returns:
             Dictionary with items at the specified path
@@ -2274,90 +3938,48 @@ class AbletonMCP(ControlSurface):
             if not hasattr(app, 'browser') or app.browser is None:
                 raise RuntimeError("Browser is not available in the Live application")
             
-            # Log available browser attributes to help diagnose issues
-            browser_attrs = [attr for attr in dir(app.browser) if not attr.startswith('_')]
-            self.log_message("Available browser attributes: {0}".format(browser_attrs))
-                
             # Parse the path
-            path_parts = path.split("/")
+            path_parts = [part for part in path.split("/") if part]
             if not path_parts:
                 raise ValueError("Invalid path")
-            
-            # Determine the root category
-            root_category = path_parts[0].lower()
-            current_item = None
-            
-            # Check standard categories first
-            if root_category == "instruments" and hasattr(app.browser, 'instruments'):
-                current_item = app.browser.instruments
-            elif root_category == "sounds" and hasattr(app.browser, 'sounds'):
-                current_item = app.browser.sounds
-            elif root_category == "drums" and hasattr(app.browser, 'drums'):
-                current_item = app.browser.drums
-            elif root_category == "audio_effects" and hasattr(app.browser, 'audio_effects'):
-                current_item = app.browser.audio_effects
-            elif root_category == "midi_effects" and hasattr(app.browser, 'midi_effects'):
-                current_item = app.browser.midi_effects
-            else:
-                # Try to find the category in other browser attributes
-                found = False
-                for attr in browser_attrs:
-                    if attr.lower() == root_category:
-                        try:
-                            current_item = getattr(app.browser, attr)
-                            found = True
-                            break
-                        except Exception as e:
-                            self.log_message("Error accessing browser attribute {0}: {1}".format(attr, str(e)))
-                
-                if not found:
-                    # If we still haven't found the category, return available categories
-                    return {
-                        "path": path,
-                        "error": "Unknown or unavailable category: {0}".format(root_category),
-                        "available_categories": browser_attrs,
-                        "items": []
-                    }
-            
-            # Navigate through the path
-            for i in range(1, len(path_parts)):
-                part = path_parts[i]
-                if not part:  # Skip empty parts
-                    continue
-                
+
+            current_item, depth = self._resolve_browser_path(app.browser, [part.lower() for part in path_parts])
+            if depth == 0:
+                # Return available categories to help find the right one
+                return {
+                    "path": path,
+                    "error": "Unknown or unavailable category: {0}".format(path_parts[0].lower()),
+                    "available_categories": [attr for attr in dir(app.browser) if not attr.startswith('_')],
+                    "items": []
+                }
+            if depth < len(path_parts):
                 if not hasattr(current_item, 'children'):
                     return {
                         "path": path,
-                        "error": "Item at '{0}' has no children".format('/'.join(path_parts[:i])),
+                        "error": "Item at '{0}' has no children".format('/'.join(path_parts[:depth])),
                         "items": []
                     }
-                
-                found = False
-                for child in current_item.children:
-                    if hasattr(child, 'name') and child.name.lower() == part.lower():
-                        current_item = child
-                        found = True
-                        break
-                
-                if not found:
-                    return {
-                        "path": path,
-                        "error": "Path part '{0}' not found".format(part),
-                        "items": []
-                    }
-            
+                return {
+                    "path": path,
+                    "error": "Path part '{0}' not found".format(path_parts[depth]),
+                    "items": []
+                }
+
             # Get items at the current path
             items = []
-            if hasattr(current_item, 'children'):
-                for child in current_item.children:
-                    item_info = {
-                        "name": child.name if hasattr(child, 'name') else "Unknown",
-                        "is_folder": hasattr(child, 'children') and bool(child.children),
-                        "is_device": hasattr(child, 'is_device') and child.is_device,
-                        "is_loadable": hasattr(child, 'is_loadable') and child.is_loadable,
-                        "uri": child.uri if hasattr(child, 'uri') else None
-                    }
-                    items.append(item_info)
+            children = list(current_item.children) if hasattr(current_item, 'children') else []
+            for index in _page(len(children), offset, limit):
+                child = children[index]
+                item_info = {
+                    "name": child.name if hasattr(child, 'name') else "Unknown",
+                    "is_device": hasattr(child, 'is_device') and child.is_device,
+                    "is_loadable": hasattr(child, 'is_loadable') and child.is_loadable,
+                    "uri": child.uri if hasattr(child, 'uri') else None
+                }
+                # Listing a folder's children is the expensive part; skip it unless asked for
+                if fields is None or "is_folder" in fields:
+                    item_info["is_folder"] = hasattr(child, 'children') and bool(child.children)
+                items.append(_project(item_info, fields, keep=()))
             
             result = {
                 "path": path,
@@ -2366,7 +3988,8 @@ class AbletonMCP(ControlSurface):
                 "is_folder": hasattr(current_item, 'children') and bool(current_item.children),
                 "is_device": hasattr(current_item, 'is_device') and current_item.is_device,
                 "is_loadable": hasattr(current_item, 'is_loadable') and current_item.is_loadable,
-                "items": items
+                "items": items,
+                "item_count": len(children)
             }
             
             self.log_message("Retrieved {0} items at path: {1}".format(len(items), path))
@@ -3,4 +3,4 @@
 __version__ = "0.1.0"
 
 # Expose key classes and functions for easier imports
-from .server import AbletonConnection, get_ableton_connection
\ No newline at end of file
+from .server import AbletonBusyError, AbletonConnection, AbletonConnectionPool, AsyncAbletonConnection, get_ableton_connection, get_async_ableton_connection
\ No newline at end of file
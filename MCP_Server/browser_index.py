@@ -0,0 +1,250 @@
+"""Full-text search over Ableton's browser without asking Live.
+
+A ``BrowserIndex`` holds one record per browser item (name, path, URI, category
+and flags) and an inverted index from name and path tokens to records. Query
+tokens match index tokens exactly, by prefix, or approximately: a trigram
+index over the token vocabulary picks candidates that are then compared with
+difflib, so "oprator" still finds Operator.
+
+Indexes are saved as gzipped JSON under ``ABLETON_MCP_CACHE_DIR`` (default
+``~/.cache/ableton-mcp``), one file per Live version and library fingerprint,
+so a restart of the server does not need another crawl of the browser.
+"""
+import bisect
+import difflib
+import gzip
+import hashlib
+import heapq
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+INDEX_FORMAT = 1
+CACHE_DIR = os.environ.get("ABLETON_MCP_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ableton-mcp"))
+
+# Score of a query token hitting a name token vs. a path token
+NAME_WEIGHT = 3.0
+PATH_WEIGHT = 1.0
+# How much an index token counts when it only starts with, or resembles, the query token
+PREFIX_MATCH = 0.8
+FUZZY_MATCH = 0.6
+FUZZY_MIN_SIMILARITY = 0.7
+FUZZY_CANDIDATES = 200
+MAX_EXPANSIONS = 20
+
+logger = logging.getLogger("AbletonMCPServer")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+def _trigrams(token: str) -> set:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fingerprint(tree: Dict[str, Any]) -> str:
+    """Short hash of a shallow browser tree; changes when the library's top levels change"""
+    def shape(item):
+        return [item.get("name"), item.get("uri"), [shape(child) for child in item.get("children", [])]]
+    data = json.dumps([shape(category) for category in tree.get("categories", [])], sort_keys=True)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+class BrowserIndex:
+    """Inverted index of browser items; see the module docstring"""
+
+    def __init__(self, live_version: str = "", library_fingerprint: str = ""):
+        self.live_version = live_version
+        self.library_fingerprint = library_fingerprint
+        self.built_at = 0.0
+        # Records are lists: [name, path, uri, category, is_loadable, is_device, is_folder]
+        self.items: List[List[Any]] = []
+        self._name_postings: Dict[str, List[int]] = defaultdict(list)
+        self._path_postings: Dict[str, List[int]] = defaultdict(list)
+        self._vocabulary: List[str] = []
+        self._trigram_tokens: Dict[str, List[str]] = {}
+        # Token-normalized item names, filled in as items show up in results
+        self._normalized_names: Dict[int, str] = {}
+
+    @property
+    def key(self) -> str:
+        data = f"{self.live_version}|{self.library_fingerprint}"
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+    def add(self, name: str, path: str, uri: Optional[str], category: str,
+            is_loadable: bool = False, is_device: bool = False, is_folder: bool = False):
+        """Index one browser item; call finish() once all items are added"""
+        item_id = len(self.items)
+        self.items.append([name, path, uri, category, bool(is_loadable), bool(is_device), bool(is_folder)])
+        name_tokens = set(tokenize(name))
+        for token in name_tokens:
+            self._name_postings[token].append(item_id)
+        # The path up to the item, including its category
+        for token in set(tokenize(path.rsplit("/", 1)[0])) - name_tokens:
+            self._path_postings[token].append(item_id)
+
+    def finish(self):
+        """Build the token vocabulary used for prefix and fuzzy matching"""
+        self._vocabulary = sorted(set(self._name_postings) | set(self._path_postings))
+        trigram_tokens = defaultdict(list)
+        for token in self._vocabulary:
+            for trigram in _trigrams(token):
+                trigram_tokens[trigram].append(token)
+        self._trigram_tokens = dict(trigram_tokens)
+        self.built_at = self.built_at or time.time()
+
+    def _expand(self, query_token: str) -> List[tuple]:
+        """Index tokens matching a query token, with a match strength in (0, 1]"""
+        matches = []
+        if query_token in self._name_postings or query_token in self._path_postings:
+            matches.append((query_token, 1.0))
+        start = bisect.bisect_left(self._vocabulary, query_token)
+        for token in self._vocabulary[start:start + MAX_EXPANSIONS + 1]:
+            if not token.startswith(query_token):
+                break
+            if token != query_token:
+                matches.append((token, PREFIX_MATCH))
+        if matches or len(query_token) < 3:
+            return matches
+
+        shared = defaultdict(int)
+        for trigram in _trigrams(query_token):
+            for token in self._trigram_tokens.get(trigram, ()):
+                shared[token] += 1
+        matcher = difflib.SequenceMatcher(b=query_token)
+        similar = []
+        for count, token in heapq.nlargest(FUZZY_CANDIDATES, ((count, token) for token, count in shared.items())):
+            matcher.set_seq1(token)
+            similarity = matcher.ratio()
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                similar.append((similarity, token))
+        for similarity, token in heapq.nlargest(MAX_EXPANSIONS, similar):
+            matches.append((token, FUZZY_MATCH * similarity))
+        return matches
+
+    def search(self, query: str, limit: int = 10, category: Optional[str] = None,
+               loadable_only: bool = False) -> List[Dict[str, Any]]:
+        """Top matches for query, best first.
+
+        Items matching more query tokens always rank first; ties are broken
+        by match strength, with a bonus for whole-name matches.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+        for query_token in query_tokens:
+            best = {}
+            for token, strength in self._expand(query_token):
+                for item_id in self._name_postings.get(token, ()):
+                    best[item_id] = max(best.get(item_id, 0.0), strength * NAME_WEIGHT)
+                for item_id in self._path_postings.get(token, ()):
+                    best[item_id] = max(best.get(item_id, 0.0), strength * PATH_WEIGHT)
+            for item_id, score in best.items():
+                scores[item_id] += score
+                matched[item_id] += 1
+
+        normalized = " ".join(query_tokens)
+        # Items matching fewer query tokens can never outrank those matching
+        # the most, so only look at them when there are not enough of those
+        by_matched = defaultdict(list)
+        for item_id, count in matched.items():
+            by_matched[count].append(item_id)
+        ranked = []
+        for count in sorted(by_matched, reverse=True):
+            if len(ranked) >= limit:
+                break
+            for item_id in by_matched[count]:
+                name, path, uri, item_category, is_loadable, is_device, is_folder = self.items[item_id]
+                if category and item_category != category:
+                    continue
+                if loadable_only and not is_loadable:
+                    continue
+                name_tokens = self._normalized_names.get(item_id)
+                if name_tokens is None:
+                    name_tokens = self._normalized_names[item_id] = " ".join(tokenize(name))
+                score = scores[item_id]
+                if name_tokens == normalized:
+                    score += 5.0
+                elif name_tokens.startswith(normalized):
+                    score += 2.0
+                if is_loadable:
+                    score += 0.5
+                ranked.append((count, score, -len(name), -item_id))
+
+        results = []
+        for item_matched, score, _, negative_id in heapq.nlargest(limit, ranked):
+            name, path, uri, item_category, is_loadable, is_device, is_folder = self.items[-negative_id]
+            results.append({
+                "name": name,
+                "path": path,
+                "uri": uri,
+                "category": item_category,
+                "is_loadable": is_loadable,
+                "is_device": is_device,
+                "is_folder": is_folder,
+                "score": round(score, 3),
+                "matched_terms": item_matched
+            })
+        return results
+
+    def save(self, directory: str = CACHE_DIR) -> str:
+        """Write the index to disk and return the file path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"browser-index-{self.key}.json.gz")
+        data = {
+            "format": INDEX_FORMAT,
+            "live_version": self.live_version,
+            "library_fingerprint": self.library_fingerprint,
+            "built_at": self.built_at,
+            "items": self.items,
+            "name_postings": self._name_postings,
+            "path_postings": self._path_postings,
+        }
+        temp_path = path + ".tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, live_version: str, library_fingerprint: str,
+             directory: str = CACHE_DIR) -> Optional["BrowserIndex"]:
+        """The saved index for this Live version and library, or None.
+
+        An unreadable file, e.g. one truncated by a crash, is deleted so the
+        caller crawls the browser again.
+        """
+        index = cls(live_version, library_fingerprint)
+        path = os.path.join(directory, f"browser-index-{index.key}.json.gz")
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, EOFError, ValueError, zlib.error) as e:
+            logger.warning(f"Discarding unreadable browser index {path}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        if data.get("format") != INDEX_FORMAT or data.get("library_fingerprint") != library_fingerprint \
+                or data.get("live_version") != live_version:
+            return None
+        index.built_at = data.get("built_at", 0.0)
+        index.items = data["items"]
+        index._name_postings = defaultdict(list, data["name_postings"])
+        index._path_postings = defaultdict(list, data["path_postings"])
+        index.finish()
+        return index
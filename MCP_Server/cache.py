@@ -0,0 +1,258 @@
+"""Local mirror of read-only Remote Script replies, kept fresh by change events.
+
+The cache answers repeated inspection commands (session, track, clip and device
+parameter info, scenes, return tracks, locators, and the application version
+and control surface list) without a round trip to Live. Every entry is tagged
+with the parts of the set it was read from; a tag is invalidated when the Remote
+Script pushes a change event touching it (see the ``subscribe`` command) or when
+this server sends a mutating command that touches it.
+
+The cache is only trusted while an event subscription covering every kind in
+``CACHE_EVENT_KINDS`` is live. It is disabled and emptied when the connection
+drops, because events may have been missed in the meantime.
+
+Replies that carry a ``version`` (see the Remote Script's version counters)
+are kept aside when invalidated. The next read of the same object then sends
+``if_version``, and a "not modified" reply brings the old result back without
+re-transferring it.
+
+Cached results are shared between callers and must not be modified.
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Tag = Tuple[Any, ...]
+
+# Tags for whole lists; per-object tags are tuples such as ("track", 3)
+STATIC = ("static",)  # application version, control surfaces: cleared only on reconnect
+SONG = ("song",)
+TRACKS = ("tracks",)
+SCENES = ("scenes",)
+RETURN_TRACKS = ("return_tracks",)
+LOCATORS = ("locators",)
+ALL = ("all",)  # every tag except STATIC
+
+# Event kinds the Remote Script must push for cached entries to stay correct
+CACHE_EVENT_KINDS = ("tempo", "tracks", "scenes", "clip_slots", "device_parameters", "return_tracks", "locators")
+
+
+def _track(params: Dict[str, Any]) -> int:
+    return int(params.get("track_index", 0))
+
+
+def _clip(params: Dict[str, Any]) -> Tag:
+    return ("clip", _track(params), int(params.get("clip_index", 0)))
+
+
+def _device(params: Dict[str, Any]) -> Tag:
+    return ("device", _track(params), int(params.get("device_index", 0)))
+
+
+# Cacheable read commands -> tags of the state their reply depends on
+CACHED_COMMANDS: Dict[str, Callable[[Dict[str, Any]], List[Tag]]] = {
+    "get_application_version": lambda p: [STATIC],
+    "list_control_surfaces": lambda p: [STATIC],
+    "get_session_info": lambda p: [SONG],
+    "get_track_info": lambda p: [TRACKS, ("track", _track(p))],
+    "get_clip_info": lambda p: [TRACKS, _clip(p)],
+    "get_device_parameters": lambda p: [TRACKS, ("devices", _track(p)), _device(p)],
+    "list_scenes": lambda p: [SCENES],
+    "list_return_tracks": lambda p: [RETURN_TRACKS],
+    "list_locators": lambda p: [LOCATORS],
+}
+
+# Mutating commands -> tags they invalidate. Mutating commands missing here
+# invalidate everything except STATIC.
+MUTATION_TAGS: Dict[str, Callable[[Dict[str, Any]], List[Tag]]] = {
+    "set_tempo": lambda p: [SONG],
+    "create_midi_track": lambda p: [TRACKS, SONG],
+    "create_audio_track": lambda p: [TRACKS, SONG],
+    "set_track_name": lambda p: [("track", _track(p))],
+    "set_send_level": lambda p: [("track", _track(p))],
+    "create_clip": lambda p: [("track", _track(p)), _clip(p)],
+    "add_notes_to_clip": lambda p: [("track", _track(p)), _clip(p)],
+    "set_clip_name": lambda p: [("track", _track(p)), _clip(p)],
+    "fire_clip": lambda p: [("track", _track(p)), _clip(p)],
+    "stop_clip": lambda p: [("track", _track(p)), _clip(p)],
+    "fire_scene": lambda p: [TRACKS],
+    "stop_all_clips": lambda p: [TRACKS],
+    "trigger_session_record": lambda p: [TRACKS],
+    "clear_arrangement": lambda p: [TRACKS],
+    "duplicate_track_clip_to_arrangement": lambda p: [("track", _track(p))],
+    "create_scene": lambda p: [SCENES, TRACKS, SONG],
+    "rename_scene": lambda p: [SCENES],
+    "set_device_parameter": lambda p: [_device(p)],
+    "delete_device": lambda p: [("track", _track(p)), ("devices", _track(p))],
+    "load_browser_item": lambda p: [("track", _track(p)), ("devices", _track(p))],
+    "write_automation": lambda p: [_clip(p), _device(p)],
+    "create_locator": lambda p: [LOCATORS],
+    "toggle_cue_at_current": lambda p: [LOCATORS],
+    "rename_cue_point": lambda p: [LOCATORS],
+    "batch": lambda p: [tag for command in p.get("commands", [])
+                        for tag in mutation_tags(command.get("type", ""), command.get("params", {}))],
+}
+
+# Mutating commands that change nothing the cache mirrors
+for _command in ("start_playback", "stop_playback", "continue_playing", "play_selection", "set_record_mode",
+                 "set_metronome", "set_loop", "set_loop_region", "set_clip_trigger_quantization",
+                 "set_arrangement_overdub", "set_session_automation_record", "re_enable_automation",
+                 "set_song_position", "set_current_song_time_beats", "set_start_time", "set_back_to_arranger",
+                 "jump_by", "jump_by_beats", "jump_to_next_cue", "jump_to_prev_cue", "jump_to_cue",
+                 "show_message", "press_current_dialog_button", "application_view_focus_view",
+                 "application_view_hide_view", "application_view_show_view", "application_view_toggle_browse",
+                 "application_view_scroll_view", "application_view_zoom_view"):
+    MUTATION_TAGS[_command] = lambda p: []
+
+
+def mutation_tags(command_type: str, params: Dict[str, Any]) -> List[Tag]:
+    """Tags invalidated by a mutating command"""
+    tags = MUTATION_TAGS.get(command_type)
+    return tags(params or {}) if tags else [ALL]
+
+
+def event_tags(change: Dict[str, Any]) -> List[Tag]:
+    """Tags invalidated by one entry of a pushed ``changes`` event"""
+    kind = change.get("kind")
+    track = change.get("track_index")
+    if kind == "tempo" or kind == "master":
+        return [SONG]
+    if kind == "is_playing":
+        return []
+    if kind == "tracks":
+        return [TRACKS, SONG]
+    if kind == "track":
+        return [("track", track)]
+    if kind == "scenes":
+        return [SCENES, TRACKS]
+    if kind == "scene":
+        return [SCENES]
+    if kind == "return_tracks":
+        return [RETURN_TRACKS, SONG]
+    if kind == "locators":
+        return [LOCATORS]
+    if kind == "clip_slot":
+        return [("track", track), ("clip", track, change.get("clip_index"))]
+    if kind == "devices":
+        return [("track", track), ("devices", track)]
+    if kind == "device_parameter":
+        return [("device", track, change.get("device_index"))]
+    return [ALL]
+
+
+class SessionCache:
+    """Tag-invalidated cache of read-only command replies; see the module docstring.
+
+    Not thread-safe: it is used from the asyncio event loop only.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._entries: Dict[Tuple[str, str], Tuple[Any, List[Tag]]] = {}
+        self._by_tag: Dict[Tag, set] = {}
+        # Invalidated versioned replies, kept for conditional re-reads
+        self._stale: Dict[Tuple[str, str], Any] = {}
+        # Invalidation clock: a read may only be stored if none of its tags
+        # were invalidated after it was sent
+        self._now = 0
+        self._invalidated_at: Dict[Tag, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "stale_stores": 0,
+                       "invalidations": 0, "events": 0, "resets": 0, "revalidations": 0, "not_modified": 0}
+
+    @staticmethod
+    def _key(command_type: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        return command_type, json.dumps(params or {}, sort_keys=True)
+
+    def cacheable(self, command_type: str) -> bool:
+        return self.enabled and command_type in CACHED_COMMANDS
+
+    def get(self, command_type: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Return the cached reply, or None on a miss"""
+        entry = self._entries.get(self._key(command_type, params))
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return entry[0]
+
+    def stale(self, command_type: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """An invalidated reply carrying a ``version`` to revalidate with ``if_version``, or None"""
+        result = self._stale.get(self._key(command_type, params))
+        if result is not None:
+            self._stats["revalidations"] += 1
+        return result
+
+    def begin(self) -> int:
+        """Mark the start of a read; pass the token to store()"""
+        return self._now
+
+    def store(self, command_type: str, params: Optional[Dict[str, Any]], result: Any, token: int,
+              not_modified: bool = False):
+        """Cache a reply unless its state was invalidated while the read was in flight.
+
+        not_modified marks a stale reply that Live confirmed is still current.
+        """
+        if not_modified:
+            self._stats["not_modified"] += 1
+        if not self.cacheable(command_type):
+            return
+        tags = CACHED_COMMANDS[command_type](params or {})
+        guards = tags if STATIC in tags else tags + [ALL]
+        newest = max(self._invalidated_at.get(tag, 0) for tag in guards)
+        if newest > token:
+            self._stats["stale_stores"] += 1
+            return
+        key = self._key(command_type, params)
+        self._stale.pop(key, None)
+        self._entries[key] = (result, tags)
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+        self._stats["stores"] += 1
+
+    def invalidate(self, tags: Iterable[Tag]):
+        for tag in tags:
+            self._now += 1
+            self._invalidated_at[tag] = self._now
+            if tag == ALL:
+                keys = [key for key, (_, entry_tags) in self._entries.items() if STATIC not in entry_tags]
+            else:
+                keys = list(self._by_tag.pop(tag, ()))
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is None:
+                    continue
+                self._stats["invalidations"] += 1
+                for entry_tag in entry[1]:
+                    self._by_tag.get(entry_tag, set()).discard(key)
+                if isinstance(entry[0], dict) and "version" in entry[0]:
+                    self._stale[key] = entry[0]
+
+    def apply_mutation(self, command_type: str, params: Optional[Dict[str, Any]]):
+        self.invalidate(mutation_tags(command_type, params or {}))
+
+    def apply_event(self, frame: Dict[str, Any]):
+        """Invalidate everything a pushed ``changes`` frame touches"""
+        self._stats["events"] += 1
+        for change in frame.get("changes", []):
+            self.invalidate(event_tags(change))
+
+    def enable(self):
+        self.enabled = True
+
+    def reset(self):
+        """Drop every entry and stop caching until the next subscription"""
+        self.enabled = False
+        self._now += 1
+        self._invalidated_at = {ALL: self._now, STATIC: self._now}
+        self._entries.clear()
+        self._by_tag.clear()
+        # Versions are only comparable within one Remote Script instance
+        self._stale.clear()
+        self._stats["resets"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = len(self._entries)
+        stats["enabled"] = self.enabled
+        return stats
@@ -7,7 +7,7 @@ import shlex
 import sys
 from typing import Any, Dict, List, Optional
 
-from .server import AbletonConnection
+from .server import AbletonConnectionPool
 
 
 DEFAULT_HOST = os.environ.get("ABLETON_MCP_HOST", "localhost")
@@ -93,7 +93,9 @@ class AbletonDebugger(cmd.Cmd):
         known_commands: List[str],
     ) -> None:
         super().__init__()
-        self.connection = AbletonConnection(host=host, port=port)
+        # Reconnects on demand, and its heartbeat drops a dead socket while
+        # the prompt sits idle
+        self.connection = AbletonConnectionPool(host=host, port=port)
         self.stubs = stubs
         self.known_commands = known_commands
 
@@ -122,10 +124,6 @@ class AbletonDebugger(cmd.Cmd):
                 print(json.dumps(stubbed, indent=2))
                 return
 
-            if not self.connection.connect():
-                print("Error: failed to connect to Ableton server")
-                return
-
             result = self.connection.send_command(command_type, params)
             print(json.dumps(result, indent=2))
         except json.JSONDecodeError as e:
@@ -133,6 +131,9 @@ class AbletonDebugger(cmd.Cmd):
         except Exception as e:
             print(f"Error: {e}")
 
+    def postloop(self) -> None:
+        self.connection.close()
+
     def complete_send(
         self,
         text: str,
@@ -241,23 +242,25 @@ def run_once(
         print(json.dumps(stubbed, indent=2))
         return 0
 
-    conn = AbletonConnection(host=host, port=port)
-    if not conn.connect():
-        print("Error: failed to connect to Ableton server")
-        return 2
     try:
         params_obj: Dict[str, Any] = {}
         if params:
             params_obj = json.loads(params)
-        result = conn.send_command(command_type, params_obj)
-        print(json.dumps(result, indent=2))
-        return 0
     except json.JSONDecodeError as e:
         print(f"Invalid JSON: {e}")
         return 3
+
+    pool = AbletonConnectionPool(host=host, port=port, heartbeat_interval=0)
+    try:
+        with pool.connection() as conn:
+            result = conn.send_command(command_type, params_obj)
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        pool.close()
+    print(json.dumps(result, indent=2))
+    return 0
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -0,0 +1,136 @@
+"""Wire framing for the socket protocol spoken with the AbletonMCP Remote Script.
+
+A connection starts in the legacy mode (bare JSON objects written back to back).
+The client may send a ``hello`` command carrying the highest protocol version it
+understands; if the Remote Script answers with a ``protocol_version`` >= 1 both
+sides switch to length-prefixed frames for the rest of the connection:
+
+    +-------+---------+-------------+------------------+
+    | magic | version | body length | UTF-8 JSON body  |
+    | 4 B   | 1 B     | 4 B (BE)    | body length B    |
+    +-------+---------+-------------+------------------+
+
+From protocol version 2 every framed command carries an integer ``id`` that the
+Remote Script echoes in its response. Responses may then arrive in any order, so
+a client can keep several requests in flight on one connection.
+
+From protocol version 3 the Remote Script streams large responses instead of
+encoding them in one piece: the header's body length is ``STREAMED_LENGTH`` and
+the body follows as chunks, each a 4-byte big-endian length and that many
+bytes, ended by an empty chunk. The reader joins the chunks and decodes the
+body once, like any other frame.
+
+The constants below must be kept in sync with the copies at the top of
+``AbletonMCP_Remote_Script/__init__.py``, which is installed into Live on its own.
+"""
+import asyncio
+import json
+import socket
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+FRAME_MAGIC = b"AMCP"
+PROTOCOL_VERSION = 3
+REQUEST_ID_VERSION = 2  # First version where responses echo the request ``id``
+STREAMED_FRAME_VERSION = 3  # First version where large responses may be streamed
+FRAME_HEADER = struct.Struct("!4sBI")
+CHUNK_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+STREAMED_LENGTH = 0xFFFFFFFF  # Body length of a streamed frame
+
+
+class ProtocolError(Exception):
+    """Raised when the peer sends bytes that are not a valid frame."""
+
+
+def encode_frame(message: Dict[str, Any], version: int = PROTOCOL_VERSION) -> bytes:
+    """Serialize a message into a single frame (header + JSON body)."""
+    body = json.dumps(message).encode("utf-8")
+    if len(body) > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame body too large ({len(body)} bytes)")
+    return FRAME_HEADER.pack(FRAME_MAGIC, version, len(body)) + body
+
+
+def decode_header(header: bytes) -> Tuple[int, int]:
+    """Validate a frame header and return ``(version, body_length)``.
+
+    The length is ``STREAMED_LENGTH`` for a streamed frame.
+    """
+    magic, version, length = FRAME_HEADER.unpack(header)
+    if magic != FRAME_MAGIC:
+        raise ProtocolError(f"Bad frame magic: {magic!r}")
+    if length > MAX_FRAME_SIZE and length != STREAMED_LENGTH:
+        raise ProtocolError(f"Frame body too large ({length} bytes)")
+    return version, length
+
+
+def recv_exactly(sock: socket.socket, view: memoryview) -> None:
+    """Fill ``view`` completely from ``sock``, raising if the peer closes early."""
+    received = 0
+    total = len(view)
+    while received < total:
+        count = sock.recv_into(view[received:], total - received)
+        if count == 0:
+            raise ConnectionError("Connection closed in the middle of a frame")
+        received += count
+
+
+def grow_buffer(buffer: bytearray, size: int) -> None:
+    """Enlarge ``buffer`` in place to hold at least ``size`` bytes, at least doubling it."""
+    if len(buffer) < size:
+        buffer.extend(bytes(max(size, 2 * len(buffer)) - len(buffer)))
+
+
+def _check_streamed_size(length: int) -> None:
+    if length > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Streamed frame body too large ({length} bytes)")
+
+
+def read_frame(sock: socket.socket, buffer: Optional[bytearray] = None) -> Tuple[int, Dict[str, Any]]:
+    """Read one frame from ``sock`` and return ``(version, message)``.
+
+    The body is read into a buffer sized from the header length, or chunk by
+    chunk for a streamed frame, and decoded exactly once. Pass a ``buffer`` to
+    reuse it for every frame of a connection; it is grown with
+    :func:`grow_buffer` when a frame does not fit.
+    """
+    header = bytearray(FRAME_HEADER.size)
+    recv_exactly(sock, memoryview(header))
+    version, length = decode_header(bytes(header))
+    if buffer is None:
+        buffer = bytearray()
+    if length == STREAMED_LENGTH:
+        length = 0
+        chunk_header = bytearray(CHUNK_HEADER.size)
+        while True:
+            recv_exactly(sock, memoryview(chunk_header))
+            (size,) = CHUNK_HEADER.unpack(chunk_header)
+            if not size:
+                break
+            _check_streamed_size(length + size)
+            grow_buffer(buffer, length + size)
+            with memoryview(buffer)[length:length + size] as chunk:
+                recv_exactly(sock, chunk)
+            length += size
+    else:
+        grow_buffer(buffer, length)
+        with memoryview(buffer)[:length] as body:
+            recv_exactly(sock, body)
+    with memoryview(buffer)[:length] as body:
+        return version, json.loads(str(body, "utf-8"))
+
+
+async def read_frame_async(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, Any]]:
+    """Asyncio counterpart of :func:`read_frame` for a ``StreamReader``."""
+    version, length = decode_header(await reader.readexactly(FRAME_HEADER.size))
+    if length != STREAMED_LENGTH:
+        body = await reader.readexactly(length)
+        return version, json.loads(body.decode("utf-8"))
+    body = bytearray()
+    while True:
+        (size,) = CHUNK_HEADER.unpack(await reader.readexactly(CHUNK_HEADER.size))
+        if not size:
+            break
+        _check_streamed_size(len(body) + size)
+        body += await reader.readexactly(size)
+    return version, json.loads(body.decode("utf-8"))
@@ -2,22 +2,188 @@
 from mcp.server.fastmcp import FastMCP, Context
 import socket
 import json
+import asyncio
 import logging
-from dataclasses import dataclass
-from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, Any, List, Union
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Any, Iterator, List, Optional, Set, Tuple, Union
 from .m4l_utils import set_parameter_default_value
+from .browser_index import BrowserIndex, fingerprint
+from .cache import CACHE_EVENT_KINDS, SessionCache
+from .protocol import PROTOCOL_VERSION, REQUEST_ID_VERSION, encode_frame, grow_buffer, read_frame, read_frame_async
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("AbletonMCPServer")
 
+# Commands that change Live's state; they get a longer timeout. Connections
+# use the registry fetched from the Remote Script ("get_command_registry") and
+# fall back to this list only for Remote Scripts that predate it.
+MODIFYING_COMMANDS = frozenset([
+    "create_midi_track", "create_audio_track", "set_track_name",
+    "create_clip", "add_notes_to_clip", "set_clip_name",
+    "set_tempo", "fire_clip", "stop_clip", "set_device_parameter",
+    "start_playback", "stop_playback", "load_browser_item",
+    "fire_scene", "create_scene", "rename_scene", "write_automation",
+    "delete_device", "show_message", "press_current_dialog_button",
+    # Arrangement/transport additions
+    "set_record_mode", "continue_playing", "jump_by", "set_back_to_arranger",
+    "set_start_time", "set_metronome", "set_clip_trigger_quantization",
+    "set_loop", "set_loop_region", "play_selection", "jump_to_next_cue",
+    "jump_to_prev_cue", "toggle_cue_at_current", "re_enable_automation",
+    "set_arrangement_overdub", "set_session_automation_record",
+    "trigger_session_record", "create_locator", "set_song_position", "set_send_level",
+    # New arrangement layout helpers
+    "duplicate_track_clip_to_arrangement", "clear_arrangement",
+    "rename_cue_point", "set_current_song_time_beats", "stop_all_clips",
+    "jump_to_cue", "jump_by_beats",
+    # Application.View actions
+    "application_view_focus_view", "application_view_hide_view",
+    "application_view_scroll_view", "application_view_show_view",
+    "application_view_toggle_browse", "application_view_zoom_view",
+    # Several commands in one main-thread task
+    "batch"
+])
+
+# Setters whose result reports the value Live ended up with, as
+# command -> (requested param, result key). Used by send_command(verify=True).
+READBACK_FIELDS = {
+    "set_tempo": ("tempo", "tempo"),
+    "set_track_name": ("name", "name"),
+    "set_clip_name": ("name", "name"),
+    "rename_scene": ("name", "new_name"),
+    "set_send_level": ("level", "new_level"),
+    "set_device_parameter": ("value", "new_value"),
+    "set_current_song_time_beats": ("beats", "time"),
+    "set_metronome": ("on", "metronome"),
+    "set_loop": ("on", "loop"),
+}
+
+def command_timeout(registry: Dict[str, Dict[str, Any]], command_type: str) -> float:
+    """Seconds to wait for a reply, from the Remote Script's registry when available"""
+    spec = registry.get(command_type)
+    if spec and spec.get("timeout"):
+        return float(spec["timeout"])
+    return 15.0 if command_type in MODIFYING_COMMANDS else 10.0
+
+def is_mutating(registry: Dict[str, Dict[str, Any]], command_type: str) -> bool:
+    """Whether a command changes the Live set, from the registry when available"""
+    spec = registry.get(command_type)
+    if spec is not None:
+        return bool(spec.get("mutating"))
+    return command_type in MODIFYING_COMMANDS
+
+def is_connection_error(frame: Dict[str, Any]) -> bool:
+    """Whether a frame reports an error with the connection rather than with one request"""
+    return bool(frame.get("connection_error"))
+
+def is_progress(frame: Dict[str, Any]) -> bool:
+    """Whether a frame reports progress of a long-running command rather than its result"""
+    return "progress" in frame and "status" not in frame
+
+def paging_params(fields: List[str] = None, offset: int = 0, limit: int = None) -> Dict[str, Any]:
+    """Projection/pagination params for read commands, omitting defaults so cache keys stay stable"""
+    params = {}
+    if fields is not None:
+        params["fields"] = list(fields)
+    if offset:
+        params["offset"] = offset
+    if limit is not None:
+        params["limit"] = limit
+    return params
+
+def verify_readback(command_type: str, params: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Raise if the value reported back by Live differs from the requested one"""
+    if command_type not in READBACK_FIELDS:
+        return
+    param_key, result_key = READBACK_FIELDS[command_type]
+    if param_key not in params or not isinstance(result, dict) or result_key not in result:
+        return
+    requested, reported = params[param_key], result[result_key]
+    if isinstance(requested, (int, float)) and not isinstance(requested, bool) \
+            and isinstance(reported, (int, float)):
+        matches = abs(float(requested) - float(reported)) <= 1e-6 * max(1.0, abs(float(requested)))
+    else:
+        matches = requested == reported
+    if not matches:
+        raise Exception(f"{command_type} was not applied as requested: "
+                        f"asked for {param_key}={requested!r}, Live reports {reported!r}")
+
+class AbletonBusyError(Exception):
+    """The Remote Script refused a command because too many are pending; nothing was run"""
+
+    def __init__(self, message: str, retry_after_ms: float):
+        super().__init__(message)
+        self.retry_after_ms = retry_after_ms
+
+def raise_for_error(response: Dict[str, Any]) -> None:
+    """Raise the error reported in a response, if any"""
+    if response.get("status") != "error":
+        return
+    message = response.get("message", "Unknown error from Ableton")
+    if "retry_after_ms" in response:
+        logger.warning(f"Ableton is busy: {message}")
+        raise AbletonBusyError(message, float(response["retry_after_ms"]))
+    logger.error(f"Ableton error: {message}")
+    raise Exception(message)
+
+# Busy replies are retried this many times, waiting the Remote Script's
+# retry_after_ms hint doubled per attempt (capped), with random jitter so
+# clients refused together do not come back together
+BUSY_RETRIES = 4
+BUSY_BACKOFF_MAX = 2.0  # seconds
+
+def busy_backoff(retry_after_ms: float, attempt: int) -> float:
+    """Seconds to wait before retrying a command refused as busy"""
+    delay = min(BUSY_BACKOFF_MAX, retry_after_ms / 1000.0 * 2 ** attempt)
+    return delay * random.uniform(0.5, 1.5)
+
+# Reconnects: the hello handshake is the only validation, retries back off briefly
+CONNECT_ATTEMPTS = 3
+RECONNECT_BACKOFF = 0.05  # seconds before the second attempt, doubled after that
+
+# Idle connections are pinged this often (seconds); 0 disables the heartbeat
+HEARTBEAT_INTERVAL = 5.0
+PING_TIMEOUT = 2.0
+
+# Initial size of a connection's receive buffer (bytes). Larger replies grow
+# it by doubling; after a reply it is trimmed back if it grew past RECV_BUFFER_KEEP.
+RECV_BUFFER_SIZE = 64 * 1024
+RECV_BUFFER_KEEP = 16 * 1024 * 1024
+
+def ends_with_brace(buffer: bytearray, length: int) -> bool:
+    """Whether the first length bytes end in "}" (ignoring whitespace), as every complete legacy reply does"""
+    while length and buffer[length - 1] in b" \t\r\n":
+        length -= 1
+    return bool(length) and buffer[length - 1] == ord("}")
+
 @dataclass
 class AbletonConnection:
     host: str
     port: int
     sock: socket.socket = None
+    framing: bool = True  # Try to negotiate length-prefixed framing on connect
+    protocol_version: int = 0  # Negotiated protocol version, 0 = legacy bare JSON
+    server_info: Dict[str, Any] = field(default_factory=dict)  # hello reply: commands, server_start_time
+    registry: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # get_command_registry reply
+    recv_buffer_size: int = RECV_BUFFER_SIZE  # Initial receive buffer size in bytes
+    # Request-ID routing for pipelined connections (protocol version >= 2)
+    _pending: Dict[int, Future] = field(default_factory=dict, init=False, repr=False)
+    _pending_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _send_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _request_ids: itertools.count = field(default_factory=lambda: itertools.count(1), init=False, repr=False)
+    # Callbacks for pushed change events (see subscribe)
+    _event_listeners: List[Callable[[Dict[str, Any]], None]] = field(default_factory=list, init=False, repr=False)
+    # Request id -> time of its last progress frame; timeouts count from there
+    _activity: Dict[int, float] = field(default_factory=dict, init=False, repr=False)
+    # Replies are received into this buffer, reused across replies (see receive_full_response)
+    _recv_buffer: bytearray = field(default_factory=bytearray, init=False, repr=False)
     
     def connect(self) -> bool:
         """Connect to the Ableton Remote Script socket server"""
@@ -28,12 +194,63 @@ class AbletonConnection:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.connect((self.host, self.port))
             logger.info(f"Connected to Ableton at {self.host}:{self.port}")
-            return True
         except Exception as e:
             logger.error(f"Failed to connect to Ableton: {str(e)}")
             self.sock = None
             return False
+
+        self.protocol_version = 0
+        self.server_info = {}
+        if self.framing:
+            try:
+                self._negotiate_protocol()
+            except Exception as e:
+                logger.error(f"Protocol negotiation with Ableton failed: {str(e)}")
+                self.disconnect()
+                return False
+
+        if self.protocol_version >= REQUEST_ID_VERSION:
+            # Responses are routed to waiting callers by request ID from a background reader
+            self.sock.settimeout(None)
+            reader = threading.Thread(target=self._read_responses, args=(self.sock,), daemon=True)
+            reader.start()
+
+        self.registry = {}
+        if self.supports("get_command_registry"):
+            try:
+                self.registry = self.send_command("get_command_registry").get("commands", {})
+            except Exception as e:
+                logger.warning(f"Could not fetch the command registry: {str(e)}")
+                if not self.sock:
+                    return False
+        return True
+
+    def _negotiate_protocol(self):
+        """Offer framed messages via a legacy ``hello``; older Remote Scripts reject it and stay legacy"""
+        hello = {"type": "hello", "params": {"protocol_version": PROTOCOL_VERSION}}
+        self.sock.sendall(json.dumps(hello).encode('utf-8'))
+        self.sock.settimeout(10.0)
+        response = self.receive_full_response(self.sock)
+        if response.get("status") == "success":
+            self.server_info = response.get("result", {})
+            self.protocol_version = int(self.server_info.get("protocol_version", 0))
+        if self.protocol_version:
+            logger.info(f"Using framed protocol version {self.protocol_version}")
+        else:
+            logger.info("Remote Script does not support framing, using legacy JSON messages")
     
+    def supports(self, command_type: str) -> bool:
+        """Whether the Remote Script listed command_type in its hello reply"""
+        return command_type in self.server_info.get("commands", ())
+
+    def ping(self, timeout: float = 2.0) -> Dict[str, Any]:
+        """Round-trip a tiny ping that never waits on Live's main thread"""
+        if self.protocol_version < REQUEST_ID_VERSION:
+            return self.send_command("ping")
+        command = {"type": "ping", "params": {}}
+        future = self._submit(command)
+        return self._wait_for(future, command["id"], timeout).get("result", {})
+
     def disconnect(self):
         """Disconnect from the Ableton Remote Script"""
         if self.sock:
@@ -43,119 +260,293 @@ class AbletonConnection:
                 logger.error(f"Error disconnecting from Ableton: {str(e)}")
             finally:
                 self.sock = None
+        self._fail_pending(ConnectionError("Disconnected from Ableton"))
+
+    def _fail_pending(self, error: Exception):
+        """Fail every request still waiting for a response"""
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _read_responses(self, sock: socket.socket):
+        """Reader thread: route each framed response to the future registered for its ID"""
+        try:
+            while True:
+                _, response = read_frame(sock, self._recv_buffer)
+                self._trim_recv_buffer()
+                if "event" in response:
+                    self._dispatch_event(response)
+                    continue
+                if is_progress(response):
+                    # A long-running command is still working; restart its timeout
+                    if response.get("id") in self._activity:
+                        self._activity[response["id"]] = time.monotonic()
+                    continue
+                if is_connection_error(response):
+                    # Not tied to a request id, so every waiting request fails
+                    logger.error(f"Ableton rejected a request: {response.get('message')}")
+                    self._fail_pending(Exception(response.get("message", "Unknown error from Ableton")))
+                    continue
+                with self._pending_lock:
+                    future = self._pending.pop(response.get("id"), None)
+                if future is None:
+                    # The caller already gave up on this request (e.g. it timed out)
+                    logger.warning(f"Dropping response for unknown request id {response.get('id')}")
+                    continue
+                future.set_result(response)
+        except Exception as e:
+            if self.sock is sock:
+                logger.error(f"Lost connection to Ableton: {str(e)}")
+                self.disconnect()
+            self._fail_pending(ConnectionError(f"Connection to Ableton lost: {str(e)}"))
 
-    def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
-        chunks = []
-        sock.settimeout(15.0)  # Increased timeout for operations that might take longer
-        
+    def add_event_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call callback(frame) from the reader thread for every pushed event frame"""
+        self._event_listeners.append(callback)
+
+    def _dispatch_event(self, frame: Dict[str, Any]):
+        for callback in list(self._event_listeners):
+            try:
+                callback(frame)
+            except Exception as e:
+                logger.error(f"Error in Ableton event listener: {str(e)}")
+
+    def subscribe(self, events: List[str] = None) -> Dict[str, Any]:
+        """Ask the Remote Script to push change events; all kinds by default"""
+        if self.protocol_version < REQUEST_ID_VERSION:
+            raise ConnectionError("Remote Script cannot push events on this connection")
+        return self.send_command("subscribe", {"events": events} if events else {})
+
+    def submit(self, command_type: str, params: Dict[str, Any] = None) -> Future:
+        """Send a command without waiting for it; the future resolves to the raw response.
+
+        Requires a pipelined connection (protocol version >= 2). Many submitted
+        commands can be in flight at once and may complete in any order.
+        """
+        if not self.sock and not self.connect():
+            raise ConnectionError("Not connected to Ableton")
+        if self.protocol_version < REQUEST_ID_VERSION:
+            raise ConnectionError("Remote Script does not support request IDs")
+        return self._submit({"type": command_type, "params": params or {}})
+
+    def _submit(self, command: Dict[str, Any]) -> Future:
+        sock = self.sock
+        if sock is None:
+            raise ConnectionError("Not connected to Ableton")
+        request_id = next(self._request_ids)
+        command["id"] = request_id
+        future = Future()
+        with self._pending_lock:
+            self._pending[request_id] = future
+        try:
+            data = encode_frame(command, self.protocol_version)
+            with self._send_lock:
+                sock.sendall(data)
+        except Exception:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            raise
+        return future
+
+    def _send_pipelined(self, command: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one command on a pipelined connection and wait for its matching response"""
+        logger.info(f"Sending command: {command['type']} with params: {command['params']}")
+        try:
+            future = self._submit(command)
+        except Exception as e:
+            logger.error(f"Socket connection error: {str(e)}")
+            self.disconnect()
+            raise Exception(f"Connection to Ableton lost: {str(e)}")
+
+        response = self._wait_for(future, command["id"], timeout)
+        return response.get("result", {})
+
+    def _wait_for(self, future: Future, request_id: int, timeout: float) -> Dict[str, Any]:
+        """Wait for a submitted command's response, raising on errors reported by Ableton.
+
+        The timeout applies to inactivity: progress frames from a long-running
+        command restart it.
+        """
+        self._activity[request_id] = time.monotonic()
         try:
             while True:
+                idle = time.monotonic() - self._activity[request_id]
                 try:
-                    chunk = sock.recv(buffer_size)
-                    if not chunk:
-                        if not chunks:
-                            raise Exception("Connection closed before receiving any data")
-                        break
-                    
-                    chunks.append(chunk)
-                    
-                    # Check if we've received a complete JSON object
-                    try:
-                        data = b''.join(chunks)
-                        json.loads(data.decode('utf-8'))
-                        logger.info(f"Received complete response ({len(data)} bytes)")
-                        return data
-                    except json.JSONDecodeError:
-                        # Incomplete JSON, continue receiving
-                        continue
-                except socket.timeout:
-                    logger.warning("Socket timeout during chunked receive")
+                    response = future.result(timeout=max(0.0, timeout - idle))
                     break
-                except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-                    logger.error(f"Socket connection error during receive: {str(e)}")
-                    raise
+                except FutureTimeoutError:
+                    if time.monotonic() - self._activity[request_id] < timeout:
+                        continue
+                    with self._pending_lock:
+                        self._pending.pop(request_id, None)
+                    logger.error("Timeout while waiting for response from Ableton")
+                    self._cancel_remote(request_id)
+                    raise Exception("Timeout waiting for Ableton response")
+                except ConnectionError as e:
+                    raise Exception(str(e))
+        finally:
+            self._activity.pop(request_id, None)
+
+        logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
+        raise_for_error(response)
+        return response
+
+    def _cancel_remote(self, request_id: int):
+        """Ask the Remote Script to drop a command nobody is waiting for any more"""
+        if not self.supports("cancel"):
+            return
+        try:
+            # Fire and forget; the reader resolves the unused future
+            self._submit({"type": "cancel", "params": {"request_id": request_id}})
         except Exception as e:
-            logger.error(f"Error during receive: {str(e)}")
-            raise
-            
-        # If we get here, we either timed out or broke out of the loop
-        if chunks:
-            data = b''.join(chunks)
-            logger.info(f"Returning data after receive completion ({len(data)} bytes)")
+            logger.warning(f"Could not cancel request {request_id}: {str(e)}")
+
+    def send_commands(self, commands: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Send several independent commands and return their results in request order.
+
+        On a pipelined connection all commands are written before any response is
+        awaited, so N read-only queries cost about one round trip instead of N.
+        The Remote Script may finish them in any order, so this is meant for
+        commands that do not depend on each other. Raises on the first failure.
+        """
+        if not self.sock and not self.connect():
+            raise ConnectionError("Not connected to Ableton")
+        if self.protocol_version < REQUEST_ID_VERSION:
+            return [self.send_command(command_type, params) for command_type, params in commands]
+
+        submitted = []
+        try:
+            for command_type, params in commands:
+                timeout = command_timeout(self.registry, command_type)
+                command = {"type": command_type, "params": params or {}, "deadline": time.time() + timeout}
+                submitted.append((self._submit(command), command["id"], timeout))
+        except Exception as e:
+            logger.error(f"Socket connection error: {str(e)}")
+            self.disconnect()
+            raise Exception(f"Connection to Ableton lost: {str(e)}")
+
+        return [
+            self._wait_for(future, request_id, timeout).get("result", {})
+            for future, request_id, timeout in submitted
+        ]
+
+    def send_batch(self, commands: List[Tuple[str, Dict[str, Any]]], stop_on_error: bool = True) -> Dict[str, Any]:
+        """Run an ordered list of commands in a single main-thread task in Live.
+
+        Unlike send_commands, the commands run strictly in order and cost one
+        scheduling hop in total. The result has one entry per command under
+        "results" with its status, result or error message, and elapsed_ms.
+        With stop_on_error, the commands after the first failure are skipped.
+        """
+        batch = [{"type": command_type, "params": params or {}} for command_type, params in commands]
+        return self.send_command("batch", {"commands": batch, "stop_on_error": stop_on_error})
+
+    def receive_full_response(self, sock, buffer_size: int = None) -> Dict[str, Any]:
+        """Receive one complete legacy (bare JSON) response and return it parsed.
+
+        Data is read with recv_into straight into the connection's reusable
+        receive buffer, which doubles when full, instead of collecting and
+        re-joining chunks. A reply is complete once the data ends in a closing
+        brace and parses; only then is it decoded, once. The socket timeout set
+        by the caller applies to every read.
+        """
+        buffer = self._recv_buffer
+        grow_buffer(buffer, buffer_size or self.recv_buffer_size)
+        received = 0
+        try:
+            while True:
+                if received == len(buffer):
+                    grow_buffer(buffer, received + 1)
+                with memoryview(buffer)[received:] as view:
+                    count = sock.recv_into(view)
+                if not count:
+                    if not received:
+                        raise ConnectionError("Connection closed before receiving any data")
+                    raise ConnectionError("Connection closed before receiving a complete response")
+                received += count
+                if not ends_with_brace(buffer, received):
+                    continue
+                with memoryview(buffer)[:received] as view:
+                    try:
+                        response = json.loads(str(view, "utf-8"))
+                    except ValueError:
+                        # A closing brace inside the reply, keep reading
+                        continue
+                logger.info(f"Received complete response ({received} bytes)")
+                return response
+        finally:
+            self._trim_recv_buffer()
+
+    def _trim_recv_buffer(self):
+        """Give back memory after an unusually large reply"""
+        if len(self._recv_buffer) > RECV_BUFFER_KEEP:
+            del self._recv_buffer[self.recv_buffer_size:]
+
+    def send_command(self, command_type: str, params: Dict[str, Any] = None, verify: bool = False) -> Dict[str, Any]:
+        """Send a command to Ableton and return the response.
+
+        Modifying commands are answered by the Remote Script only after Live has
+        applied them, so no settling delay is needed. With verify=True, setters
+        listed in READBACK_FIELDS also have the value Live reports compared with
+        the requested one, and a mismatch (e.g. a clamped tempo) raises.
+
+        A command refused as busy is retried after the Remote Script's hint
+        with jittered backoff (see busy_backoff); AbletonBusyError is raised
+        once BUSY_RETRIES retries were refused too.
+        """
+        for attempt in itertools.count():
             try:
-                json.loads(data.decode('utf-8'))
-                return data
-            except json.JSONDecodeError:
-                raise Exception("Incomplete JSON response received")
-        else:
-            raise Exception("No data received")
+                result = self._send_command(command_type, params)
+                break
+            except AbletonBusyError as e:
+                if attempt >= BUSY_RETRIES:
+                    raise
+                time.sleep(busy_backoff(e.retry_after_ms, attempt))
+        if verify:
+            verify_readback(command_type, params or {}, result)
+        return result
 
-    def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send a command to Ableton and return the response"""
+    def _send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send one command and wait for its response"""
         if not self.sock and not self.connect():
             raise ConnectionError("Not connected to Ableton")
         
+        # State-modifying commands get a longer timeout
+        timeout = command_timeout(self.registry, command_type)
+
+        # Live drops the command instead of running it late if it is still queued by then
         command = {
             "type": command_type,
-            "params": params or {}
+            "params": params or {},
+            "deadline": time.time() + timeout
         }
-        
-        # Check if this is a state-modifying command
-        is_modifying_command = command_type in [
-            "create_midi_track", "create_audio_track", "set_track_name",
-            "create_clip", "add_notes_to_clip", "set_clip_name",
-            "set_tempo", "fire_clip", "stop_clip", "set_device_parameter",
-            "start_playback", "stop_playback", "load_instrument_or_effect",
-            # Arrangement/transport additions
-            "set_record_mode", "continue_playing", "jump_by", "set_back_to_arranger",
-            "set_start_time", "set_metronome", "set_clip_trigger_quantization",
-            "set_loop", "set_loop_region", "play_selection", "jump_to_next_cue",
-            "jump_to_prev_cue", "toggle_cue_at_current", "re_enable_automation",
-            "set_arrangement_overdub", "set_session_automation_record",
-            "trigger_session_record", "create_locator", "set_song_position", "set_send_level",
-            # New arrangement layout helpers
-            "duplicate_track_clip_to_arrangement", "clear_arrangement",
-            "rename_cue_point", "set_current_song_time_beats", "stop_all_clips",
-            "jump_to_cue", "jump_by_beats",
-            # Application.View actions
-            "application_view_focus_view", "application_view_hide_view",
-            "application_view_scroll_view", "application_view_show_view",
-            "application_view_toggle_browse", "application_view_zoom_view"
-        ]
+
+        if self.protocol_version >= REQUEST_ID_VERSION:
+            return self._send_pipelined(command, timeout)
         
         try:
             logger.info(f"Sending command: {command_type} with params: {params}")
             
             # Send the command
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
+            if self.protocol_version:
+                self.sock.sendall(encode_frame(command, self.protocol_version))
+            else:
+                self.sock.sendall(json.dumps(command).encode('utf-8'))
             logger.info(f"Command sent, waiting for response...")
             
-            # For state-modifying commands, add a small delay to give Ableton time to process
-            if is_modifying_command:
-                import time
-                time.sleep(0.1)  # 100ms delay
-            
-            # Set timeout based on command type
-            timeout = 15.0 if is_modifying_command else 10.0
             self.sock.settimeout(timeout)
             
             # Receive the response
-            response_data = self.receive_full_response(self.sock)
-            logger.info(f"Received {len(response_data)} bytes of data")
-            
-            # Parse the response
-            response = json.loads(response_data.decode('utf-8'))
+            if self.protocol_version:
+                _, response = read_frame(self.sock, self._recv_buffer)
+                self._trim_recv_buffer()
+            else:
+                response = self.receive_full_response(self.sock)
             logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
-            
-            if response.get("status") == "error":
-                logger.error(f"Ableton error: {response.get('message')}")
-                raise Exception(response.get("message", "Unknown error from Ableton"))
-            
-            # For state-modifying commands, add another small delay after receiving response
-            if is_modifying_command:
-                import time
-                time.sleep(0.1)  # 100ms delay
+            raise_for_error(response)
             
             return response.get("result", {})
         except socket.timeout:
@@ -166,17 +557,513 @@ class AbletonConnection:
             logger.error(f"Socket connection error: {str(e)}")
             self.sock = None
             raise Exception(f"Connection to Ableton lost: {str(e)}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response from Ableton: {str(e)}")
-            if 'response_data' in locals() and response_data:
-                logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
-            self.sock = None
-            raise Exception(f"Invalid response from Ableton: {str(e)}")
+        except AbletonBusyError:
+            # Refused before running; the connection is fine
+            raise
         except Exception as e:
             logger.error(f"Error communicating with Ableton: {str(e)}")
             self.sock = None
             raise Exception(f"Communication error with Ableton: {str(e)}")
 
+class AbletonConnectionPool:
+    """Thread-safe holder of one connection to the Remote Script.
+
+    The connection is opened on first use and opened again after it dies. It
+    is shared by concurrent callers when it negotiated request IDs; an older
+    one is handed to one caller at a time, so callers can never interleave
+    bytes on the socket. While the connection is idle a heartbeat pings it
+    and drops it if it is dead or a restarted Remote Script answers.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 9877, heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        self.host = host
+        self.port = port
+        self.heartbeat_interval = heartbeat_interval
+        self._heartbeat = None
+        self._connection: Optional[AbletonConnection] = None
+        self._in_use = 0
+        self._opening = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def connected(self) -> bool:
+        connection = self._connection
+        return connection is not None and connection.sock is not None
+
+    def _open_connection(self) -> AbletonConnection:
+        """Open a new connection, retrying a few times with a short backoff.
+
+        The hello handshake in connect() already proves the Remote Script is
+        answering, so no extra validation command is sent.
+        """
+        for attempt in range(1, CONNECT_ATTEMPTS + 1):
+            connection = AbletonConnection(host=self.host, port=self.port)
+            logger.info(f"Connecting to Ableton (attempt {attempt}/{CONNECT_ATTEMPTS})...")
+            if connection.connect():
+                self._start_heartbeat()
+                return connection
+            if attempt < CONNECT_ATTEMPTS:
+                time.sleep(RECONNECT_BACKOFF * 2 ** (attempt - 1))
+
+        logger.error("Failed to connect to Ableton after multiple attempts")
+        raise Exception("Could not connect to Ableton. Make sure the Remote Script is running.")
+
+    def _start_heartbeat(self):
+        with self._condition:
+            if self._heartbeat is None and self.heartbeat_interval:
+                self._heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+                self._heartbeat.start()
+
+    def _heartbeat_loop(self):
+        """Ping the idle connection so a dead one is dropped before a caller picks it"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed, self.heartbeat_interval)
+                if self._closed:
+                    return
+                connection = self._connection
+                if not self.connected or self._in_use or not connection.supports("ping"):
+                    continue
+                # Reserve the connection so no caller shares the socket with the ping
+                self._in_use += 1
+            try:
+                result = connection.ping(PING_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"Heartbeat to Ableton failed: {str(e)}")
+                connection.disconnect()
+            else:
+                if result.get("server_start_time") != connection.server_info.get("server_start_time"):
+                    # A different Remote Script instance answered; the next caller reconnects
+                    logger.warning("Ableton Remote Script restarted, dropping the connection")
+                    connection.disconnect()
+            self._release(connection)
+
+    def _acquire(self, timeout: float) -> AbletonConnection:
+        """Reserve the connection, opening it if there is none"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ConnectionError("Connection pool is closed")
+                connection = self._connection
+                if connection is not None and connection.sock is None and not self._in_use:
+                    # Died since it was last used
+                    self._connection = connection = None
+                if connection is None and not self._opening:
+                    self._opening = True
+                    break
+                if self.connected and (not self._in_use or connection.protocol_version >= REQUEST_ID_VERSION):
+                    self._in_use += 1
+                    return connection
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Exception("Timed out waiting for the connection to Ableton")
+                self._condition.wait(remaining)
+
+        # Connect outside the lock so the heartbeat and close() are not held up
+        try:
+            connection = self._open_connection()
+        except Exception:
+            with self._condition:
+                self._opening = False
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self._opening = False
+            self._connection = connection
+            self._in_use += 1
+            self._condition.notify_all()
+        return connection
+
+    def _release(self, connection: AbletonConnection):
+        with self._condition:
+            self._in_use -= 1
+            if connection.sock is None and not self._in_use and self._connection is connection:
+                logger.warning("Dropping dead connection to Ableton")
+                self._connection = None
+            self._condition.notify_all()
+            closing = self._closed and not self._in_use
+        if closing:
+            connection.disconnect()
+
+    @contextmanager
+    def connection(self, timeout: float = 30.0) -> Iterator[AbletonConnection]:
+        """Use the connection for the duration of a ``with`` block"""
+        connection = self._acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self._release(connection)
+
+    def send_command(self, command_type: str, params: Dict[str, Any] = None, verify: bool = False) -> Dict[str, Any]:
+        """Run one command on the shared connection"""
+        with self.connection() as connection:
+            return connection.send_command(command_type, params, verify)
+
+    def close(self):
+        """Disconnect; a connection in use closes when it is returned"""
+        with self._condition:
+            self._closed = True
+            connection = self._connection if not self._in_use else None
+            self._condition.notify_all()
+        if connection is not None:
+            connection.disconnect()
+
+
+@dataclass
+class AsyncAbletonConnection:
+    """asyncio client for the Remote Script, used by the MCP tools.
+
+    Reads and writes never block the event loop. On a pipelined connection
+    (protocol version >= 2) each request gets an asyncio future keyed by its
+    ``id`` and a background task routes responses to them, so a slow command
+    does not hold up unrelated ones. A request that times out is cancelled and
+    its late response is dropped. Older Remote Scripts are served one request
+    at a time.
+    """
+    host: str
+    port: int
+    framing: bool = True  # Try to negotiate length-prefixed framing on connect
+    protocol_version: int = 0  # Negotiated protocol version, 0 = legacy bare JSON
+    server_info: Dict[str, Any] = field(default_factory=dict)  # hello reply: commands, server_start_time
+    registry: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # get_command_registry reply
+    heartbeat_interval: float = HEARTBEAT_INTERVAL
+    cache: Optional[SessionCache] = None  # Answers repeated reads locally while subscribed to events
+    _reader: asyncio.StreamReader = field(default=None, init=False, repr=False)
+    _writer: asyncio.StreamWriter = field(default=None, init=False, repr=False)
+    _reader_task: asyncio.Task = field(default=None, init=False, repr=False)
+    _heartbeat_task: asyncio.Task = field(default=None, init=False, repr=False)
+    _pending: Dict[int, asyncio.Future] = field(default_factory=dict, init=False, repr=False)
+    _request_ids: itertools.count = field(default_factory=lambda: itertools.count(1), init=False, repr=False)
+    _send_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+    _exchange_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+    _event_listeners: List[Callable[[Dict[str, Any]], None]] = field(default_factory=list, init=False, repr=False)
+    _subscribed_events: Optional[List[str]] = field(default=None, init=False, repr=False)
+    # Long-running commands: loop time of their last progress frame, and progress callbacks
+    _activity: Dict[int, float] = field(default_factory=dict, init=False, repr=False)
+    _progress_callbacks: Dict[int, Callable[[Dict[str, Any]], None]] = field(default_factory=dict, init=False, repr=False)
+    # Fire-and-forget cancels; the loop only keeps weak references to tasks
+    _background_tasks: Set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        """Connect to the Remote Script and negotiate the wire protocol"""
+        if self.connected:
+            return True
+
+        try:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            logger.info(f"Connected to Ableton at {self.host}:{self.port} (asyncio)")
+        except Exception as e:
+            logger.error(f"Failed to connect to Ableton: {str(e)}")
+            self._reader = self._writer = None
+            return False
+
+        self.protocol_version = 0
+        self.server_info = {}
+        if self.framing:
+            try:
+                hello = {"type": "hello", "params": {"protocol_version": PROTOCOL_VERSION}}
+                response = await asyncio.wait_for(self._legacy_exchange(hello), 10.0)
+                if response.get("status") == "success":
+                    self.server_info = response.get("result", {})
+                    self.protocol_version = int(self.server_info.get("protocol_version", 0))
+            except Exception as e:
+                logger.error(f"Protocol negotiation with Ableton failed: {str(e)}")
+                await self.disconnect()
+                return False
+
+        if self.protocol_version >= REQUEST_ID_VERSION:
+            loop = asyncio.get_running_loop()
+            self._reader_task = loop.create_task(self._read_responses(self._reader))
+            if self.heartbeat_interval and "ping" in self.server_info.get("commands", ()):
+                self._heartbeat_task = loop.create_task(self._heartbeat())
+
+        self.registry = {}
+        if "get_command_registry" in self.server_info.get("commands", ()):
+            try:
+                self.registry = (await self.send_command("get_command_registry")).get("commands", {})
+            except Exception as e:
+                logger.warning(f"Could not fetch the command registry: {str(e)}")
+                if not self.connected:
+                    return False
+
+        wants_events = self.cache is not None or self._subscribed_events is not None
+        if wants_events and self.protocol_version >= REQUEST_ID_VERSION \
+                and "subscribe" in self.server_info.get("commands", ()):
+            # Subscriptions belong to the socket; renew them after a reconnect
+            try:
+                await self._subscribe(self._subscribed_events)
+            except Exception as e:
+                logger.warning(f"Could not subscribe to Ableton events: {str(e)}")
+        return True
+
+    def add_event_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Call callback(frame) on the event loop for every pushed event frame"""
+        self._event_listeners.append(callback)
+
+    async def subscribe(self, events: List[str] = None) -> Dict[str, Any]:
+        """Ask the Remote Script to push change events; all kinds by default.
+
+        The subscription is renewed automatically whenever the connection is
+        re-established.
+        """
+        if not self.connected and not await self.connect():
+            raise ConnectionError("Not connected to Ableton")
+        if self.protocol_version < REQUEST_ID_VERSION:
+            raise ConnectionError("Remote Script cannot push events on this connection")
+        return await self._subscribe(events)
+
+    async def _subscribe(self, events: Optional[List[str]]) -> Dict[str, Any]:
+        # The cache needs every kind of event to stay correct
+        wanted = None if self.cache is not None else events
+        result = await self.send_command("subscribe", {"events": wanted} if wanted else {})
+        subscribed = result.get("subscribed", [])
+        self._subscribed_events = subscribed
+        if self.cache is not None and set(CACHE_EVENT_KINDS) <= set(subscribed):
+            self.cache.enable()
+        return result
+
+    async def ping(self, timeout: float = PING_TIMEOUT) -> Dict[str, Any]:
+        """Round-trip a tiny ping that never waits on Live's main thread"""
+        response = await self._exchange({"type": "ping", "params": {}}, timeout)
+        return response.get("result", {})
+
+    async def _heartbeat(self):
+        """Ping periodically and drop the connection as soon as Live stops answering"""
+        while self.connected:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                result = await self.ping()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Heartbeat to Ableton failed: {str(e)}")
+                self._heartbeat_task = None
+                await self.disconnect()
+                return
+            if result.get("server_start_time") != self.server_info.get("server_start_time"):
+                # A different Remote Script instance answered; start from a fresh handshake
+                logger.warning("Ableton Remote Script restarted, reconnecting")
+                self._heartbeat_task = None
+                await self.disconnect()
+                return
+
+    async def disconnect(self):
+        """Close the connection and fail every request still waiting for a response"""
+        writer, self._writer, self._reader = self._writer, None, None
+        if self.cache is not None:
+            # Changes made while disconnected were never reported
+            self.cache.reset()
+        for task in (self._reader_task, self._heartbeat_task):
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._reader_task = self._heartbeat_task = None
+        if writer is not None:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception as e:
+                logger.error(f"Error disconnecting from Ableton: {str(e)}")
+        self._fail_pending(ConnectionError("Disconnected from Ableton"))
+
+    def _fail_pending(self, error: Exception):
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _read_responses(self, reader: asyncio.StreamReader):
+        """Reader task: route each framed response to the future registered for its ID"""
+        try:
+            while True:
+                _, response = await read_frame_async(reader)
+                if "event" in response:
+                    if self.cache is not None:
+                        self.cache.apply_event(response)
+                    for callback in list(self._event_listeners):
+                        try:
+                            callback(response)
+                        except Exception as e:
+                            logger.error(f"Error in Ableton event listener: {str(e)}")
+                    continue
+                if is_progress(response):
+                    self._note_progress(response)
+                    continue
+                if is_connection_error(response):
+                    # Not tied to a request id, so every waiting request fails
+                    logger.error(f"Ableton rejected a request: {response.get('message')}")
+                    self._fail_pending(Exception(response.get("message", "Unknown error from Ableton")))
+                    continue
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    # The caller already gave up on this request (e.g. it timed out)
+                    logger.warning(f"Dropping response for unknown request id {response.get('id')}")
+                    continue
+                future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self._reader is reader:
+                logger.error(f"Lost connection to Ableton: {str(e)}")
+                self._reader_task = None
+                await self.disconnect()
+            self._fail_pending(ConnectionError(f"Connection to Ableton lost: {str(e)}"))
+
+    def _note_progress(self, frame: Dict[str, Any]):
+        """Restart the timeout of the command a progress frame belongs to and pass the progress on"""
+        request_id = frame.get("id")
+        if request_id not in self._activity:
+            return
+        self._activity[request_id] = asyncio.get_running_loop().time()
+        callback = self._progress_callbacks.get(request_id)
+        if callback is not None:
+            try:
+                callback(frame["progress"])
+            except Exception as e:
+                logger.error(f"Error in progress callback: {str(e)}")
+
+    async def _cancel_remote(self, request_id: int):
+        """Ask the Remote Script to drop a command nobody is waiting for any more"""
+        if "cancel" not in self.server_info.get("commands", ()) or not self.connected:
+            return
+        try:
+            await self._exchange({"type": "cancel", "params": {"request_id": request_id}}, PING_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Could not cancel request {request_id}: {str(e)}")
+
+    async def _legacy_exchange(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Write one bare JSON command and read until the reply parses as JSON (tried only when it ends in a brace)"""
+        self._writer.write(json.dumps(command).encode('utf-8'))
+        await self._writer.drain()
+        buffer = bytearray()
+        while True:
+            chunk = await self._reader.read(RECV_BUFFER_SIZE)
+            if not chunk:
+                raise ConnectionError("Connection closed before receiving a complete response")
+            buffer += chunk
+            if not ends_with_brace(buffer, len(buffer)):
+                continue
+            try:
+                return json.loads(buffer.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+
+    async def _exchange(self, command: Dict[str, Any], timeout: float,
+                        on_progress: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+        """Send a command and wait for its response.
+
+        On a pipelined connection the timeout applies to inactivity: progress
+        frames from a long-running command restart it and go to on_progress.
+        """
+        if self.protocol_version >= REQUEST_ID_VERSION:
+            loop = asyncio.get_running_loop()
+            request_id = next(self._request_ids)
+            command["id"] = request_id
+            future = loop.create_future()
+            self._pending[request_id] = future
+            self._activity[request_id] = loop.time()
+            if on_progress is not None:
+                self._progress_callbacks[request_id] = on_progress
+            try:
+                async with self._send_lock:
+                    self._writer.write(encode_frame(command, self.protocol_version))
+                    await self._writer.drain()
+                while True:
+                    idle = loop.time() - self._activity[request_id]
+                    try:
+                        return await asyncio.wait_for(asyncio.shield(future), timeout - idle)
+                    except asyncio.TimeoutError:
+                        if loop.time() - self._activity[request_id] < timeout:
+                            continue
+                        # The late response is dropped by the reader
+                        future.cancel()
+                        if command["type"] not in ("cancel", "ping"):
+                            task = asyncio.ensure_future(self._cancel_remote(request_id))
+                            self._background_tasks.add(task)
+                            task.add_done_callback(self._background_tasks.discard)
+                        raise
+            finally:
+                self._pending.pop(request_id, None)
+                self._activity.pop(request_id, None)
+                self._progress_callbacks.pop(request_id, None)
+
+        # Without request IDs only one request may be outstanding at a time
+        async with self._exchange_lock:
+            if self.protocol_version:
+                self._writer.write(encode_frame(command, self.protocol_version))
+                await self._writer.drain()
+                return (await asyncio.wait_for(read_frame_async(self._reader), timeout))[1]
+            return await asyncio.wait_for(self._legacy_exchange(command), timeout)
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None, verify: bool = False,
+                           on_progress: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+        """Send a command to Ableton and return the result; see AbletonConnection.send_command.
+
+        on_progress(progress) is called for each progress report of a
+        long-running command (e.g. clear_arrangement).
+        """
+        if not self.connected and not await self.connect():
+            raise ConnectionError("Not connected to Ableton")
+
+        cache = self.cache
+        cacheable = cache is not None and cache.cacheable(command_type) and not verify \
+            and "if_version" not in (params or {})
+        request_params = params or {}
+        stale = None
+        if cacheable:
+            cached = cache.get(command_type, params)
+            if cached is not None:
+                return cached
+            token = cache.begin()
+            stale = cache.stale(command_type, params)
+            if stale is not None:
+                # Ask Live to skip the payload if the object has not changed since
+                request_params = dict(request_params, if_version=stale["version"])
+
+        command = {"type": command_type, "params": request_params}
+        timeout = command_timeout(self.registry, command_type)
+        logger.info(f"Sending command: {command_type} with params: {params}")
+        for attempt in itertools.count():
+            try:
+                # Live drops the command instead of running it late if it is still queued by then
+                response = await self._exchange(dict(command, deadline=time.time() + timeout), timeout, on_progress)
+            except asyncio.TimeoutError:
+                logger.error("Timeout while waiting for response from Ableton")
+                if self.protocol_version < REQUEST_ID_VERSION:
+                    # The unanswered reply would be read as the next command's response
+                    await self.disconnect()
+                raise Exception("Timeout waiting for Ableton response")
+            except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+                logger.error(f"Socket connection error: {str(e)}")
+                await self.disconnect()
+                raise Exception(f"Connection to Ableton lost: {str(e)}")
+            if "retry_after_ms" not in response or attempt >= BUSY_RETRIES:
+                break
+            # Refused as busy before running; wait as hinted, with jitter
+            await asyncio.sleep(busy_backoff(float(response["retry_after_ms"]), attempt))
+
+        logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
+        if cache is not None and is_mutating(self.registry, command_type):
+            # Invalidate even on error; the command may have partly applied
+            cache.apply_mutation(command_type, params)
+        raise_for_error(response)
+
+        result = response.get("result", {})
+        if cacheable:
+            not_modified = stale is not None and result.get("not_modified")
+            if not_modified:
+                result = stale
+            cache.store(command_type, params, result, token, not_modified=bool(not_modified))
+        if verify:
+            verify_readback(command_type, params or {}, result)
+        return result
+
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     """Manage server startup and shutdown lifecycle"""
@@ -184,7 +1071,7 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         logger.info("AbletonMCP server starting up")
         
         try:
-            ableton = get_ableton_connection()
+            ableton = await get_async_ableton_connection()
             logger.info("Successfully connected to Ableton on startup")
         except Exception as e:
             logger.warning(f"Could not connect to Ableton on startup: {str(e)}")
@@ -192,11 +1079,14 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         
         yield {}
     finally:
-        global _ableton_connection
-        if _ableton_connection:
+        global _connection_pool, _async_ableton_connection
+        if _async_ableton_connection:
+            await _async_ableton_connection.disconnect()
+            _async_ableton_connection = None
+        if _connection_pool:
             logger.info("Disconnecting from Ableton on shutdown")
-            _ableton_connection.disconnect()
-            _ableton_connection = None
+            _connection_pool.close()
+            _connection_pool = None
         logger.info("AbletonMCP server shut down")
 
 # Create the MCP server with lifespan support
@@ -206,146 +1096,174 @@ mcp = FastMCP(
     lifespan=server_lifespan
 )
 
-# Global connection for resources
-_ableton_connection = None
-
-def get_ableton_connection():
-    """Get or create a persistent Ableton connection"""
-    global _ableton_connection
-    
-    if _ableton_connection is not None:
-        try:
-            # Test the connection with a simple ping
-            # We'll try to send an empty message, which should fail if the connection is dead
-            # but won't affect Ableton if it's alive
-            _ableton_connection.sock.settimeout(1.0)
-            _ableton_connection.sock.sendall(b'')
-            return _ableton_connection
-        except Exception as e:
-            logger.warning(f"Existing connection is no longer valid: {str(e)}")
-            try:
-                _ableton_connection.disconnect()
-            except:
-                pass
-            _ableton_connection = None
-    
-    # Connection doesn't exist or is invalid, create a new one
-    if _ableton_connection is None:
-        # Try to connect up to 3 times with a short delay between attempts
-        max_attempts = 3
-        for attempt in range(1, max_attempts + 1):
-            try:
-                logger.info(f"Connecting to Ableton (attempt {attempt}/{max_attempts})...")
-                _ableton_connection = AbletonConnection(host="localhost", port=9877)
-                if _ableton_connection.connect():
-                    logger.info("Created new persistent connection to Ableton")
-                    
-                    # Validate connection with a simple command
-                    try:
-                        # Get session info as a test
-                        _ableton_connection.send_command("get_session_info")
-                        logger.info("Connection validated successfully")
-                        return _ableton_connection
-                    except Exception as e:
-                        logger.error(f"Connection validation failed: {str(e)}")
-                        _ableton_connection.disconnect()
-                        _ableton_connection = None
-                        # Continue to next attempt
-                else:
-                    _ableton_connection = None
-            except Exception as e:
-                logger.error(f"Connection attempt {attempt} failed: {str(e)}")
-                if _ableton_connection:
-                    _ableton_connection.disconnect()
-                    _ableton_connection = None
-            
-            # Wait before trying again, but only if we have more attempts left
-            if attempt < max_attempts:
-                import time
-                time.sleep(1.0)
-        
-        # If we get here, all connection attempts failed
-        if _ableton_connection is None:
-            logger.error("Failed to connect to Ableton after multiple attempts")
-            raise Exception("Could not connect to Ableton. Make sure the Remote Script is running.")
-    
-    return _ableton_connection
+# Shared synchronous connection, for scripts outside the MCP tools
+_connection_pool = None
+_connection_pool_lock = threading.Lock()
+
+# Connection used by the (async) tools; it lives on FastMCP's event loop
+_async_ableton_connection = None
+_async_connection_lock = asyncio.Lock()
+# Progress notifications being sent; the loop only keeps weak references to tasks
+_progress_tasks: Set[asyncio.Task] = set()
+# Shared across reconnects so its statistics cover the whole server lifetime
+_session_cache = SessionCache()
+# Browser search index, loaded from disk or crawled on first use
+_browser_search_index: Optional[BrowserIndex] = None
+_browser_search_lock = asyncio.Lock()
+BROWSER_CRAWL_DEPTH = 10
+BROWSER_CRAWL_PAGE_SIZE = 500
+BROWSER_CRAWL_RETRIES = 3  # attempts per crawl_browser page
+
+def get_ableton_connection() -> AbletonConnectionPool:
+    """Get the shared, thread-safe synchronous connection to Ableton.
+
+    The MCP tools use get_async_ableton_connection(); this is for synchronous
+    scripts. Use ``with get_ableton_connection().connection() as conn`` for
+    the full AbletonConnection API.
+    """
+    global _connection_pool
+
+    with _connection_pool_lock:
+        if _connection_pool is None:
+            _connection_pool = AbletonConnectionPool(host="localhost", port=9877)
+        return _connection_pool
+
+
+async def get_async_ableton_connection() -> AsyncAbletonConnection:
+    """Get or create the persistent asyncio connection used by the tools"""
+    global _async_ableton_connection
+
+    if _async_ableton_connection is not None and _async_ableton_connection.connected:
+        return _async_ableton_connection
+
+    # Concurrent tool calls wait for a single connection attempt instead of each opening one
+    async with _async_connection_lock:
+        if _async_ableton_connection is not None and _async_ableton_connection.connected:
+            return _async_ableton_connection
+        _async_ableton_connection = None
+
+        # The hello handshake in connect() is the validation; retries back off briefly
+        for attempt in range(1, CONNECT_ATTEMPTS + 1):
+            logger.info(f"Connecting to Ableton (attempt {attempt}/{CONNECT_ATTEMPTS})...")
+            connection = AsyncAbletonConnection(host="localhost", port=9877, cache=_session_cache)
+            if await connection.connect():
+                _async_ableton_connection = connection
+                return connection
+            if attempt < CONNECT_ATTEMPTS:
+                await asyncio.sleep(RECONNECT_BACKOFF * 2 ** (attempt - 1))
+
+    logger.error("Failed to connect to Ableton after multiple attempts")
+    raise Exception("Could not connect to Ableton. Make sure the Remote Script is running.")
+
+
+def progress_reporter(ctx: Optional[Context]) -> Optional[Callable[[Dict[str, Any]], None]]:
+    """Forward progress of a long-running Live command to the MCP client as progress notifications"""
+    if ctx is None:
+        return None
+
+    def report(progress: Dict[str, Any]):
+        task = asyncio.ensure_future(ctx.report_progress(progress.get("completed", 0), progress.get("total")))
+        _progress_tasks.add(task)
+        task.add_done_callback(_progress_tasks.discard)
+    return report
 
 
 # Core Tool endpoints
 
 @mcp.tool()
-def get_session_info(ctx: Context) -> str:
+async def get_session_info(ctx: Context) -> str:
     """Get detailed information about the current Ableton session"""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_session_info")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_session_info")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting session info from Ableton: {str(e)}")
         return f"Error getting session info: {str(e)}"
 
 @mcp.tool()
-def get_application_info(ctx: Context) -> str:
+async def get_session_snapshot(ctx: Context, depth: int = 1) -> str:
+    """
+    Get the whole Live set in one call: tracks with mixer values, clips and devices, scenes, return tracks and locators.
+    
+    Parameters:
+    - depth: 0 for track mixer state only, 1 to add clips and device lists (default), 2 to also include every device parameter
+    """
+    try:
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_session_snapshot", {"depth": depth})
+        # No indentation: for large sets it would more than double the payload
+        return json.dumps(result)
+    except Exception as e:
+        logger.error(f"Error getting session snapshot from Ableton: {str(e)}")
+        return f"Error getting session snapshot: {str(e)}"
+
+@mcp.tool()
+def get_session_cache_stats(ctx: Context) -> str:
+    """Get hit/miss statistics of the server's local cache of Live session state"""
+    return json.dumps(_session_cache.stats(), indent=2)
+
+@mcp.tool()
+async def get_application_info(ctx: Context) -> str:
     """Get information about the Live Application (LOM Application)."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_application_info")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_application_info")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting application info: {str(e)}")
         return f"Error getting application info: {str(e)}"
 
 @mcp.tool()
-def get_application_view_state(ctx: Context) -> str:
+async def get_application_view_state(ctx: Context) -> str:
     """Get Application.View properties: browse_mode and focused_document_view."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_application_view_state")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_application_view_state")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting application view state: {str(e)}")
         return f"Error getting application view state: {str(e)}"
 
 @mcp.tool()
-def get_application_process_usage(ctx: Context) -> str:
+async def get_application_process_usage(ctx: Context) -> str:
     """Get average and peak process usage from the Live Application."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_application_process_usage")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_application_process_usage")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting application process usage: {str(e)}")
         return f"Error getting application process usage: {str(e)}"
 
 @mcp.tool()
-def get_application_version(ctx: Context) -> str:
+async def get_application_version(ctx: Context) -> str:
     """Get version details from the Live Application (major/minor/bugfix/version_string)."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_application_version")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_application_version")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting application version: {str(e)}")
         return f"Error getting application version: {str(e)}"
 
 @mcp.tool()
-def get_application_document(ctx: Context) -> str:
+async def get_application_document(ctx: Context) -> str:
     """Get a brief summary of the current Live Set via Application.get_document()."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_application_document")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_application_document")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting application document: {str(e)}")
         return f"Error getting application document: {str(e)}"
 
 @mcp.tool()
-def list_control_surfaces(ctx: Context) -> str:
+async def list_control_surfaces(ctx: Context) -> str:
     """List control surfaces configured in Live's preferences."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("list_control_surfaces")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("list_control_surfaces")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error listing control surfaces: {str(e)}")
@@ -354,133 +1272,144 @@ def list_control_surfaces(ctx: Context) -> str:
 # Application.View tools
 
 @mcp.tool()
-def application_view_available_main_views(ctx: Context) -> str:
+async def application_view_available_main_views(ctx: Context) -> str:
     """Return list of available main view names ('Browser', 'Arranger', 'Session', etc.)."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("application_view_available_main_views")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("application_view_available_main_views")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting available main views: {str(e)}")
         return f"Error getting available main views: {str(e)}"
 
 @mcp.tool()
-def application_view_focus_view(ctx: Context, view_name: str = "") -> str:
+async def application_view_focus_view(ctx: Context, view_name: str = "") -> str:
     """Shows named view and focuses on it. Empty string refers to the main window view."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("application_view_focus_view", {"view_name": view_name})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("application_view_focus_view", {"view_name": view_name})
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error focusing view: {str(e)}")
         return f"Error focusing view: {str(e)}"
 
 @mcp.tool()
-def application_view_hide_view(ctx: Context, view_name: str = "") -> str:
+async def application_view_hide_view(ctx: Context, view_name: str = "") -> str:
     """Hides the named view. Empty string refers to the main window view."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("application_view_hide_view", {"view_name": view_name})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("application_view_hide_view", {"view_name": view_name})
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error hiding view: {str(e)}")
         return f"Error hiding view: {str(e)}"
 
 @mcp.tool()
-def application_view_is_view_visible(ctx: Context, view_name: str) -> str:
+async def application_view_is_view_visible(ctx: Context, view_name: str) -> str:
     """Returns whether the specified view is currently visible."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("application_view_is_view_visible", {"view_name": view_name})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("application_view_is_view_visible", {"view_name": view_name})
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error checking view visibility: {str(e)}")
         return f"Error checking view visibility: {str(e)}"
 
 @mcp.tool()
-def application_view_scroll_view(ctx: Context, direction: int, view_name: str = "", modifier_pressed: bool = False) -> str:
+async def application_view_scroll_view(ctx: Context, direction: int, view_name: str = "", modifier_pressed: bool = False) -> str:
     """Scroll the specified view. direction: 0=up,1=down,2=left,3=right; modifier affects Arranger behaviour."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("application_view_scroll_view", {"direction": direction, "view_name": view_name, "modifier_pressed": modifier_pressed})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("application_view_scroll_view", {"direction": direction, "view_name": view_name, "modifier_pressed": modifier_pressed})
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error scrolling view: {str(e)}")
         return f"Error scrolling view: {str(e)}"
 
 @mcp.tool()
-def application_view_show_view(ctx: Context, view_name: str = "") -> str:
+async def application_view_show_view(ctx: Context, view_name: str = "") -> str:
     """Shows the named view."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("application_view_show_view", {"view_name": view_name})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("application_view_show_view", {"view_name": view_name})
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error showing view: {str(e)}")
         return f"Error showing view: {str(e)}"
 
 @mcp.tool()
-def application_view_toggle_browse(ctx: Context) -> str:
+async def application_view_toggle_browse(ctx: Context) -> str:
     """Displays device chain and browser and toggles Hot-Swap Mode for selected device."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("application_view_toggle_browse")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("application_view_toggle_browse")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error toggling browse: {str(e)}")
         return f"Error toggling browse: {str(e)}"
 
 @mcp.tool()
-def application_view_zoom_view(ctx: Context, direction: int, view_name: str = "", modifier_pressed: bool = False) -> str:
+async def application_view_zoom_view(ctx: Context, direction: int, view_name: str = "", modifier_pressed: bool = False) -> str:
     """Zoom the specified view. Only Arrangement and Session can be zoomed."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("application_view_zoom_view", {"direction": direction, "view_name": view_name, "modifier_pressed": modifier_pressed})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("application_view_zoom_view", {"direction": direction, "view_name": view_name, "modifier_pressed": modifier_pressed})
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error zooming view: {str(e)}")
         return f"Error zooming view: {str(e)}"
 
 @mcp.tool()
-def press_current_dialog_button(ctx: Context, index: int) -> str:
+async def press_current_dialog_button(ctx: Context, index: int) -> str:
     """Press the button with the given index in the current Live dialog box."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("press_current_dialog_button", {"index": index})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("press_current_dialog_button", {"index": index})
         return f"Pressed dialog button {result.get('index', index)}"
     except Exception as e:
         logger.error(f"Error pressing current dialog button: {str(e)}")
         return f"Error pressing current dialog button: {str(e)}"
 
 @mcp.tool()
-def get_track_info(ctx: Context, track_index: int) -> str:
+async def get_track_info(ctx: Context, track_index: int, fields: List[str] = None,
+                         offset: int = 0, limit: int = None) -> str:
     """
     Get detailed information about a specific track in Ableton.
     
     Parameters:
     - track_index: The index of the track to get information about
+    - fields: Optional keys to return, e.g. ["name", "devices"]; clip slots and devices are skipped unless listed
+    - offset, limit: Optional page of clip slots to return
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_track_info", {"track_index": track_index})
+        ableton = await get_async_ableton_connection()
+        params = {"track_index": track_index}
+        params.update(paging_params(fields, offset, limit))
+        result = await ableton.send_command("get_track_info", params)
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting track info from Ableton: {str(e)}")
         return f"Error getting track info: {str(e)}"
 
 @mcp.tool()
-def list_scenes(ctx: Context) -> str:
-    """Get a list of all scenes in the Ableton session."""
+async def list_scenes(ctx: Context, fields: List[str] = None, offset: int = 0, limit: int = None) -> str:
+    """
+    Get a list of all scenes in the Ableton session.
+
+    Parameters:
+    - fields: Optional keys to keep in each scene entry
+    - offset, limit: Optional page of scenes to return; scene_count is always the total
+    """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("list_scenes")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("list_scenes", paging_params(fields, offset, limit))
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error listing scenes: {str(e)}")
         return f"Error listing scenes: {str(e)}"
 
 @mcp.tool()
-def fire_scene(ctx: Context, scene_index: int) -> str:
+async def fire_scene(ctx: Context, scene_index: int) -> str:
     """
     Fire a scene in the Ableton session.
 
@@ -488,15 +1417,15 @@ def fire_scene(ctx: Context, scene_index: int) -> str:
     - scene_index: The index of the scene to fire.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("fire_scene", {"scene_index": scene_index})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("fire_scene", {"scene_index": scene_index})
         return f"Fired scene {scene_index}."
     except Exception as e:
         logger.error(f"Error firing scene: {str(e)}")
         return f"Error firing scene: {str(e)}"
 
 @mcp.tool()
-def create_scene(ctx: Context, scene_index: int = -1) -> str:
+async def create_scene(ctx: Context, scene_index: int = -1) -> str:
     """
     Create a new scene in the Ableton session.
 
@@ -504,8 +1433,8 @@ def create_scene(ctx: Context, scene_index: int = -1) -> str:
     - scene_index: The index to create the scene at (-1 = end of list).
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("create_scene", {"scene_index": scene_index})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("create_scene", {"scene_index": scene_index})
         new_index = result.get('scene_index', scene_index)
         return f"Created new scene at index {new_index}."
     except Exception as e:
@@ -513,7 +1442,7 @@ def create_scene(ctx: Context, scene_index: int = -1) -> str:
         return f"Error creating scene: {str(e)}"
 
 @mcp.tool()
-def rename_scene(ctx: Context, scene_index: int, name: str) -> str:
+async def rename_scene(ctx: Context, scene_index: int, name: str) -> str:
     """
     Rename a scene in the Ableton session.
 
@@ -522,8 +1451,8 @@ def rename_scene(ctx: Context, scene_index: int, name: str) -> str:
     - name: The new name for the scene.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("rename_scene", {"scene_index": scene_index, "name": name})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("rename_scene", {"scene_index": scene_index, "name": name})
         new_name = result.get('new_name', name)
         return f"Renamed scene {scene_index} to '{new_name}'."
     except Exception as e:
@@ -531,29 +1460,29 @@ def rename_scene(ctx: Context, scene_index: int, name: str) -> str:
         return f"Error renaming scene: {str(e)}"
 
 @mcp.tool()
-def list_locators(ctx: Context) -> str:
+async def list_locators(ctx: Context) -> str:
     """Get a list of all locators (cue points) in the Ableton session."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("list_locators")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("list_locators")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error listing locators: {str(e)}")
         return f"Error listing locators: {str(e)}"
 
 @mcp.tool()
-def list_return_tracks(ctx: Context) -> str:
+async def list_return_tracks(ctx: Context) -> str:
     """Get a list of all return tracks in the Ableton session."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("list_return_tracks")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("list_return_tracks")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error listing return tracks: {str(e)}")
         return f"Error listing return tracks: {str(e)}"
 
 @mcp.tool()
-def set_send_level(ctx: Context, track_index: int, send_index: int, level: float) -> str:
+async def set_send_level(ctx: Context, track_index: int, send_index: int, level: float) -> str:
     """
     Set the send level for a track.
 
@@ -563,8 +1492,8 @@ def set_send_level(ctx: Context, track_index: int, send_index: int, level: float
     - level: The new send level (0.0 to 1.0).
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_send_level", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_send_level", {
             "track_index": track_index,
             "send_index": send_index,
             "level": level
@@ -575,7 +1504,7 @@ def set_send_level(ctx: Context, track_index: int, send_index: int, level: float
         return f"Error setting send level: {str(e)}"
 
 @mcp.tool()
-def create_locator(ctx: Context, time: float) -> str:
+async def create_locator(ctx: Context, time: float) -> str:
     """
     Create a new locator (cue point) at a specific time in the arrangement.
 
@@ -583,15 +1512,15 @@ def create_locator(ctx: Context, time: float) -> str:
     - time: The time in beats where the locator should be created.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("create_locator", {"time": time})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("create_locator", {"time": time})
         return f"Created new locator at beat {result.get('time')}."
     except Exception as e:
         logger.error(f"Error creating locator: {str(e)}")
         return f"Error creating locator: {str(e)}"
 
 @mcp.tool()
-def set_song_position(ctx: Context, time: float) -> str:
+async def set_song_position(ctx: Context, time: float) -> str:
     """
     Set the song's current playback time in the arrangement.
 
@@ -599,21 +1528,21 @@ def set_song_position(ctx: Context, time: float) -> str:
     - time: The time in beats to set the playhead to.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_song_position", {"time": time})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_song_position", {"time": time})
         return f"Song position set to beat {result.get('time')}."
     except Exception as e:
         logger.error(f"Error setting song position: {str(e)}")
         return f"Error setting song position: {str(e)}"
 
 @mcp.tool()
-def set_current_song_time_beats(ctx: Context, beats: float) -> str:
+async def set_current_song_time_beats(ctx: Context, beats: float) -> str:
     """
     Write Song.current_song_time exactly in beats.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_current_song_time_beats", {"beats": beats})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_current_song_time_beats", {"beats": beats})
         return f"Current song time set to beat {result.get('time')}"
     except Exception as e:
         logger.error(f"Error setting current song time: {str(e)}")
@@ -622,226 +1551,226 @@ def set_current_song_time_beats(ctx: Context, beats: float) -> str:
 # Arrangement and transport tools
 
 @mcp.tool()
-def set_record_mode(ctx: Context, on: bool) -> str:
+async def set_record_mode(ctx: Context, on: bool) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_record_mode", {"on": on})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_record_mode", {"on": on})
         return f"Record mode set to {result.get('record_mode')}"
     except Exception as e:
         logger.error(f"Error setting record mode: {str(e)}")
         return f"Error setting record mode: {str(e)}"
 
 @mcp.tool()
-def continue_playing(ctx: Context) -> str:
+async def continue_playing(ctx: Context) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("continue_playing")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("continue_playing")
         return "Continuing playback"
     except Exception as e:
         logger.error(f"Error continuing playback: {str(e)}")
         return f"Error continuing playback: {str(e)}"
 
 @mcp.tool()
-def jump_by(ctx: Context, beats: float) -> str:
+async def jump_by(ctx: Context, beats: float) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("jump_by", {"beats": beats})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("jump_by", {"beats": beats})
         return f"Jumped by {beats} beats"
     except Exception as e:
         logger.error(f"Error jumping by: {str(e)}")
         return f"Error jumping by: {str(e)}"
 
 @mcp.tool()
-def set_back_to_arranger(ctx: Context, on: bool) -> str:
+async def set_back_to_arranger(ctx: Context, on: bool) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_back_to_arranger", {"on": on})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_back_to_arranger", {"on": on})
         return f"Back to Arranger set to {result.get('back_to_arranger')}"
     except Exception as e:
         logger.error(f"Error setting Back to Arranger: {str(e)}")
         return f"Error setting Back to Arranger: {str(e)}"
 
 @mcp.tool()
-def set_start_time(ctx: Context, beats: float) -> str:
+async def set_start_time(ctx: Context, beats: float) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_start_time", {"beats": beats})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_start_time", {"beats": beats})
         return f"Start time set to {result.get('start_time')}"
     except Exception as e:
         logger.error(f"Error setting start time: {str(e)}")
         return f"Error setting start time: {str(e)}"
 
 @mcp.tool()
-def set_metronome(ctx: Context, on: bool) -> str:
+async def set_metronome(ctx: Context, on: bool) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_metronome", {"on": on})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_metronome", {"on": on})
         return f"Metronome set to {result.get('metronome')}"
     except Exception as e:
         logger.error(f"Error setting metronome: {str(e)}")
         return f"Error setting metronome: {str(e)}"
 
 @mcp.tool()
-def set_clip_trigger_quantization(ctx: Context, quant: int) -> str:
+async def set_clip_trigger_quantization(ctx: Context, quant: int) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_clip_trigger_quantization", {"quant": quant})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_clip_trigger_quantization", {"quant": quant})
         return f"Clip trigger quantization set to {result.get('clip_trigger_quantization')}"
     except Exception as e:
         logger.error(f"Error setting clip trigger quantization: {str(e)}")
         return f"Error setting clip trigger quantization: {str(e)}"
 
 @mcp.tool()
-def set_loop(ctx: Context, on: bool) -> str:
+async def set_loop(ctx: Context, on: bool) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_loop", {"on": on})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_loop", {"on": on})
         return f"Loop set to {result.get('loop')}"
     except Exception as e:
         logger.error(f"Error setting loop: {str(e)}")
         return f"Error setting loop: {str(e)}"
 
 @mcp.tool()
-def set_loop_region(ctx: Context, start: float, length: float) -> str:
+async def set_loop_region(ctx: Context, start: float, length: float) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_loop_region", {"start": start, "length": length})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_loop_region", {"start": start, "length": length})
         return f"Loop region set to start {result.get('loop_start')} length {result.get('loop_length')}"
     except Exception as e:
         logger.error(f"Error setting loop region: {str(e)}")
         return f"Error setting loop region: {str(e)}"
 
 @mcp.tool()
-def play_selection(ctx: Context) -> str:
+async def play_selection(ctx: Context) -> str:
     try:
-        ableton = get_ableton_connection()
-        ableton.send_command("play_selection")
+        ableton = await get_async_ableton_connection()
+        await ableton.send_command("play_selection")
         return "Playing selection"
     except Exception as e:
         logger.error(f"Error playing selection: {str(e)}")
         return f"Error playing selection: {str(e)}"
 
 @mcp.tool()
-def stop_all_clips(ctx: Context, quantized: int = 1) -> str:
+async def stop_all_clips(ctx: Context, quantized: int = 1) -> str:
     """
     Stop all Session clips. quantized=0 stops immediately.
     """
     try:
-        ableton = get_ableton_connection()
-        ableton.send_command("stop_all_clips", {"quantized": quantized})
+        ableton = await get_async_ableton_connection()
+        await ableton.send_command("stop_all_clips", {"quantized": quantized})
         return "Stopped all clips"
     except Exception as e:
         logger.error(f"Error stopping all clips: {str(e)}")
         return f"Error stopping all clips: {str(e)}"
 
 @mcp.tool()
-def jump_to_next_cue(ctx: Context) -> str:
+async def jump_to_next_cue(ctx: Context) -> str:
     try:
-        ableton = get_ableton_connection()
-        ableton.send_command("jump_to_next_cue")
+        ableton = await get_async_ableton_connection()
+        await ableton.send_command("jump_to_next_cue")
         return "Jumped to next cue"
     except Exception as e:
         logger.error(f"Error jumping to next cue: {str(e)}")
         return f"Error jumping to next cue: {str(e)}"
 
 @mcp.tool()
-def jump_to_prev_cue(ctx: Context) -> str:
+async def jump_to_prev_cue(ctx: Context) -> str:
     try:
-        ableton = get_ableton_connection()
-        ableton.send_command("jump_to_prev_cue")
+        ableton = await get_async_ableton_connection()
+        await ableton.send_command("jump_to_prev_cue")
         return "Jumped to previous cue"
     except Exception as e:
         logger.error(f"Error jumping to previous cue: {str(e)}")
         return f"Error jumping to previous cue: {str(e)}"
 
 @mcp.tool()
-def jump_to_cue(ctx: Context, index: int) -> str:
+async def jump_to_cue(ctx: Context, index: int) -> str:
     try:
-        ableton = get_ableton_connection()
-        ableton.send_command("jump_to_cue", {"index": index})
+        ableton = await get_async_ableton_connection()
+        await ableton.send_command("jump_to_cue", {"index": index})
         return f"Jumped to cue {index}"
     except Exception as e:
         logger.error(f"Error jumping to cue: {str(e)}")
         return f"Error jumping to cue: {str(e)}"
 
 @mcp.tool()
-def toggle_cue_at_current(ctx: Context) -> str:
+async def toggle_cue_at_current(ctx: Context) -> str:
     try:
-        ableton = get_ableton_connection()
-        ableton.send_command("toggle_cue_at_current")
+        ableton = await get_async_ableton_connection()
+        await ableton.send_command("toggle_cue_at_current")
         return "Toggled cue at current position"
     except Exception as e:
         logger.error(f"Error toggling cue: {str(e)}")
         return f"Error toggling cue: {str(e)}"
 
 @mcp.tool()
-def re_enable_automation(ctx: Context) -> str:
+async def re_enable_automation(ctx: Context) -> str:
     try:
-        ableton = get_ableton_connection()
-        ableton.send_command("re_enable_automation")
+        ableton = await get_async_ableton_connection()
+        await ableton.send_command("re_enable_automation")
         return "Re-enabled automation"
     except Exception as e:
         logger.error(f"Error re-enabling automation: {str(e)}")
         return f"Error re-enabling automation: {str(e)}"
 
 @mcp.tool()
-def get_current_song_time_beats(ctx: Context) -> str:
+async def get_current_song_time_beats(ctx: Context) -> str:
     """
     Read back current song time in beats and formatted bars.beats.sixteenths.ticks.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_current_song_time_beats")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_current_song_time_beats")
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting current song time: {str(e)}")
         return f"Error getting current song time: {str(e)}"
 
 @mcp.tool()
-def set_arrangement_overdub(ctx: Context, on: bool) -> str:
+async def set_arrangement_overdub(ctx: Context, on: bool) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_arrangement_overdub", {"on": on})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_arrangement_overdub", {"on": on})
         return f"Arrangement overdub set to {result.get('arrangement_overdub')}"
     except Exception as e:
         logger.error(f"Error setting arrangement overdub: {str(e)}")
         return f"Error setting arrangement overdub: {str(e)}"
 
 @mcp.tool()
-def set_session_automation_record(ctx: Context, on: bool) -> str:
+async def set_session_automation_record(ctx: Context, on: bool) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_session_automation_record", {"on": on})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_session_automation_record", {"on": on})
         return f"Session automation record set to {result.get('session_automation_record')}"
     except Exception as e:
         logger.error(f"Error setting session automation record: {str(e)}")
         return f"Error setting session automation record: {str(e)}"
 
 @mcp.tool()
-def trigger_session_record(ctx: Context, record_length: float = None) -> str:
+async def trigger_session_record(ctx: Context, record_length: float = None) -> str:
     try:
-        ableton = get_ableton_connection()
+        ableton = await get_async_ableton_connection()
         params = {}
         if record_length is not None:
             params["record_length"] = record_length
-        ableton.send_command("trigger_session_record", params)
+        await ableton.send_command("trigger_session_record", params)
         return "Triggered session record"
     except Exception as e:
         logger.error(f"Error triggering session record: {str(e)}")
         return f"Error triggering session record: {str(e)}"
 
 @mcp.tool()
-def rename_cue_point(ctx: Context, cue_index: int, name: str) -> str:
+async def rename_cue_point(ctx: Context, cue_index: int, name: str) -> str:
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("rename_cue_point", {"cue_index": cue_index, "name": name})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("rename_cue_point", {"cue_index": cue_index, "name": name})
         return f"Renamed cue {cue_index} to '{result.get('new_name', name)}'"
     except Exception as e:
         logger.error(f"Error renaming cue point: {str(e)}")
         return f"Error renaming cue point: {str(e)}"
 
 @mcp.tool()
-def write_automation(
+async def write_automation(
     ctx: Context,
     track_index: int,
     clip_index: int,
@@ -866,7 +1795,7 @@ def write_automation(
         return "Error: You must provide either a parameter_index or a parameter_name."
 
     try:
-        ableton = get_ableton_connection()
+        ableton = await get_async_ableton_connection()
 
         params = {
             "track_index": track_index,
@@ -879,7 +1808,7 @@ def write_automation(
         if parameter_name is not None:
             params["parameter_name"] = parameter_name
 
-        result = ableton.send_command("write_automation", params)
+        result = await ableton.send_command("write_automation", params)
         point_count = result.get('point_count', len(points))
         param_name = result.get('parameter_name', 'Unknown')
         return f"Wrote {point_count} automation points for parameter '{param_name}'."
@@ -888,7 +1817,7 @@ def write_automation(
         return f"Error writing automation: {str(e)}"
 
 @mcp.tool()
-def create_midi_track(ctx: Context, index: int = -1) -> str:
+async def create_midi_track(ctx: Context, index: int = -1) -> str:
     """
     Create a new MIDI track in the Ableton session.
     
@@ -896,15 +1825,15 @@ def create_midi_track(ctx: Context, index: int = -1) -> str:
     - index: The index to insert the track at (-1 = end of list)
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("create_midi_track", {"index": index})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("create_midi_track", {"index": index})
         return f"Created new MIDI track: {result.get('name', 'unknown')}"
     except Exception as e:
         logger.error(f"Error creating MIDI track: {str(e)}")
         return f"Error creating MIDI track: {str(e)}"
 
 @mcp.tool()
-def create_audio_track(ctx: Context, index: int = -1) -> str:
+async def create_audio_track(ctx: Context, index: int = -1) -> str:
     """
     Create a new audio track in the Ableton session.
 
@@ -912,8 +1841,8 @@ def create_audio_track(ctx: Context, index: int = -1) -> str:
     - index: The index to insert the track at (-1 = end of list)
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("create_audio_track", {"index": index})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("create_audio_track", {"index": index})
         return f"Created new audio track: {result.get('name', 'unknown')}"
     except Exception as e:
         logger.error(f"Error creating audio track: {str(e)}")
@@ -921,7 +1850,7 @@ def create_audio_track(ctx: Context, index: int = -1) -> str:
 
 
 @mcp.tool()
-def set_track_name(ctx: Context, track_index: int, name: str) -> str:
+async def set_track_name(ctx: Context, track_index: int, name: str) -> str:
     """
     Set the name of a track.
     
@@ -930,15 +1859,15 @@ def set_track_name(ctx: Context, track_index: int, name: str) -> str:
     - name: The new name for the track
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_track_name", {"track_index": track_index, "name": name})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_track_name", {"track_index": track_index, "name": name})
         return f"Renamed track to: {result.get('name', name)}"
     except Exception as e:
         logger.error(f"Error setting track name: {str(e)}")
         return f"Error setting track name: {str(e)}"
 
 @mcp.tool()
-def create_clip(ctx: Context, track_index: int, clip_index: int, length: float = 4.0) -> str:
+async def create_clip(ctx: Context, track_index: int, clip_index: int, length: float = 4.0) -> str:
     """
     Create a new MIDI clip in the specified track and clip slot.
     
@@ -948,8 +1877,8 @@ def create_clip(ctx: Context, track_index: int, clip_index: int, length: float =
     - length: The length of the clip in beats (default: 4.0)
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("create_clip", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("create_clip", {
             "track_index": track_index, 
             "clip_index": clip_index, 
             "length": length
@@ -960,7 +1889,7 @@ def create_clip(ctx: Context, track_index: int, clip_index: int, length: float =
         return f"Error creating clip: {str(e)}"
 
 @mcp.tool()
-def add_notes_to_clip(
+async def add_notes_to_clip(
     ctx: Context, 
     track_index: int, 
     clip_index: int, 
@@ -975,8 +1904,8 @@ def add_notes_to_clip(
     - notes: List of note dictionaries, each with pitch, start_time, duration, velocity, and mute
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("add_notes_to_clip", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("add_notes_to_clip", {
             "track_index": track_index,
             "clip_index": clip_index,
             "notes": notes
@@ -987,7 +1916,7 @@ def add_notes_to_clip(
         return f"Error adding notes to clip: {str(e)}"
 
 @mcp.tool()
-def set_clip_name(ctx: Context, track_index: int, clip_index: int, name: str) -> str:
+async def set_clip_name(ctx: Context, track_index: int, clip_index: int, name: str) -> str:
     """
     Set the name of a clip.
     
@@ -997,8 +1926,8 @@ def set_clip_name(ctx: Context, track_index: int, clip_index: int, name: str) ->
     - name: The new name for the clip
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_clip_name", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_clip_name", {
             "track_index": track_index,
             "clip_index": clip_index,
             "name": name
@@ -1009,7 +1938,7 @@ def set_clip_name(ctx: Context, track_index: int, clip_index: int, name: str) ->
         return f"Error setting clip name: {str(e)}"
 
 @mcp.tool()
-def get_clip_info(ctx: Context, track_index: int, clip_index: int) -> str:
+async def get_clip_info(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Get detailed information about a specific clip.
 
@@ -1018,8 +1947,8 @@ def get_clip_info(ctx: Context, track_index: int, clip_index: int) -> str:
     - clip_index: The index of the clip slot.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_clip_info", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_clip_info", {
             "track_index": track_index,
             "clip_index": clip_index
         })
@@ -1029,7 +1958,7 @@ def get_clip_info(ctx: Context, track_index: int, clip_index: int) -> str:
         return f"Error getting clip info: {str(e)}"
 
 @mcp.tool()
-def set_tempo(ctx: Context, tempo: float) -> str:
+async def set_tempo(ctx: Context, tempo: float) -> str:
     """
     Set the tempo of the Ableton session.
     
@@ -1037,8 +1966,8 @@ def set_tempo(ctx: Context, tempo: float) -> str:
     - tempo: The new tempo in BPM
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("set_tempo", {"tempo": tempo})
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("set_tempo", {"tempo": tempo})
         return f"Set tempo to {tempo} BPM"
     except Exception as e:
         logger.error(f"Error setting tempo: {str(e)}")
@@ -1046,7 +1975,7 @@ def set_tempo(ctx: Context, tempo: float) -> str:
 
 
 @mcp.tool()
-def load_instrument_or_effect(ctx: Context, track_index: int, uri: str) -> str:
+async def load_instrument_or_effect(ctx: Context, track_index: int, uri: str) -> str:
     """
     Load an instrument, effect, or audio file from the browser onto a track using its URI.
     
@@ -1055,8 +1984,8 @@ def load_instrument_or_effect(ctx: Context, track_index: int, uri: str) -> str:
     - uri: The URI of the browser item to load (e.g., an instrument, audio effect, or an audio file).
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("load_browser_item", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("load_browser_item", {
             "track_index": track_index,
             "item_uri": uri
         })
@@ -1076,7 +2005,7 @@ def load_instrument_or_effect(ctx: Context, track_index: int, uri: str) -> str:
         return f"Error loading instrument by URI: {str(e)}"
 
 @mcp.tool()
-def fire_clip(ctx: Context, track_index: int, clip_index: int) -> str:
+async def fire_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Start playing a clip.
     
@@ -1085,8 +2014,8 @@ def fire_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     - clip_index: The index of the clip slot containing the clip
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("fire_clip", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("fire_clip", {
             "track_index": track_index,
             "clip_index": clip_index
         })
@@ -1096,7 +2025,7 @@ def fire_clip(ctx: Context, track_index: int, clip_index: int) -> str:
         return f"Error firing clip: {str(e)}"
 
 @mcp.tool()
-def stop_clip(ctx: Context, track_index: int, clip_index: int) -> str:
+async def stop_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     """
     Stop playing a clip.
     
@@ -1105,8 +2034,8 @@ def stop_clip(ctx: Context, track_index: int, clip_index: int) -> str:
     - clip_index: The index of the clip slot containing the clip
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("stop_clip", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("stop_clip", {
             "track_index": track_index,
             "clip_index": clip_index
         })
@@ -1116,49 +2045,51 @@ def stop_clip(ctx: Context, track_index: int, clip_index: int) -> str:
         return f"Error stopping clip: {str(e)}"
 
 @mcp.tool()
-def start_playback(ctx: Context) -> str:
+async def start_playback(ctx: Context) -> str:
     """Start playing the Ableton session."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("start_playback")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("start_playback")
         return "Started playback"
     except Exception as e:
         logger.error(f"Error starting playback: {str(e)}")
         return f"Error starting playback: {str(e)}"
 
 @mcp.tool()
-def stop_playback(ctx: Context) -> str:
+async def stop_playback(ctx: Context) -> str:
     """Stop playing the Ableton session."""
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("stop_playback")
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("stop_playback")
         return "Stopped playback"
     except Exception as e:
         logger.error(f"Error stopping playback: {str(e)}")
         return f"Error stopping playback: {str(e)}"
 
 @mcp.tool()
-def get_device_parameters(ctx: Context, track_index: int, device_index: int) -> str:
+async def get_device_parameters(ctx: Context, track_index: int, device_index: int, fields: List[str] = None,
+                                offset: int = 0, limit: int = None) -> str:
     """
     Get a list of parameters for a specific device on a track.
 
     Parameters:
     - track_index: The index of the track containing the device.
     - device_index: The index of the device on the track.
+    - fields: Optional keys to keep in each parameter entry, e.g. ["name", "value"].
+    - offset, limit: Optional page of the device's parameters to return.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_device_parameters", {
-            "track_index": track_index,
-            "device_index": device_index
-        })
+        ableton = await get_async_ableton_connection()
+        params = {"track_index": track_index, "device_index": device_index}
+        params.update(paging_params(fields, offset, limit))
+        result = await ableton.send_command("get_device_parameters", params)
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error getting device parameters: {str(e)}")
         return f"Error getting device parameters: {str(e)}"
 
 @mcp.tool()
-def get_device_details(ctx: Context, track_index: int, device_index: int) -> str:
+async def get_device_details(ctx: Context, track_index: int, device_index: int) -> str:
     """
     Get detailed information about a specific device on a track.
 
@@ -1167,8 +2098,8 @@ def get_device_details(ctx: Context, track_index: int, device_index: int) -> str
     - device_index: The index of the device on the track.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_device_details", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("get_device_details", {
             "track_index": track_index,
             "device_index": device_index
         })
@@ -1178,7 +2109,7 @@ def get_device_details(ctx: Context, track_index: int, device_index: int) -> str
         return f"Error getting device details: {str(e)}"
 
 @mcp.tool()
-def find_device_by_name(ctx: Context, track_index: int, device_name: str) -> str:
+async def find_device_by_name(ctx: Context, track_index: int, device_name: str) -> str:
     """
     Find the index of a device on a track by its name.
 
@@ -1187,8 +2118,8 @@ def find_device_by_name(ctx: Context, track_index: int, device_name: str) -> str
     - device_name: The name of the device to find.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("find_device_by_name", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("find_device_by_name", {
             "track_index": track_index,
             "device_name": device_name
         })
@@ -1201,7 +2132,7 @@ def find_device_by_name(ctx: Context, track_index: int, device_name: str) -> str
         return f"Error finding device by name: {str(e)}"
 
 @mcp.tool()
-def set_device_parameter(
+async def set_device_parameter(
     ctx: Context,
     track_index: int,
     device_index: int,
@@ -1223,7 +2154,7 @@ def set_device_parameter(
         return "Error: You must provide either a parameter_index or a parameter_name."
 
     try:
-        ableton = get_ableton_connection()
+        ableton = await get_async_ableton_connection()
 
         params = {
             "track_index": track_index,
@@ -1235,7 +2166,7 @@ def set_device_parameter(
         if parameter_name is not None:
             params["parameter_name"] = parameter_name
 
-        result = ableton.send_command("set_device_parameter", params)
+        result = await ableton.send_command("set_device_parameter", params)
 
         return f"Set parameter '{result.get('parameter_name')}' on device {device_index} of track {track_index} to {result.get('new_value', value)}"
     except Exception as e:
@@ -1243,7 +2174,7 @@ def set_device_parameter(
         return f"Error setting device parameter: {str(e)}"
 
 @mcp.tool()
-def delete_device(ctx: Context, track_index: int, device_index: int) -> str:
+async def delete_device(ctx: Context, track_index: int, device_index: int) -> str:
     """
     Delete a device from a track.
 
@@ -1252,8 +2183,8 @@ def delete_device(ctx: Context, track_index: int, device_index: int) -> str:
     - device_index: The index of the device to delete.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("delete_device", {
+        ableton = await get_async_ableton_connection()
+        result = await ableton.send_command("delete_device", {
             "track_index": track_index,
             "device_index": device_index
         })
@@ -1264,21 +2195,21 @@ def delete_device(ctx: Context, track_index: int, device_index: int) -> str:
         return f"Error deleting device: {str(e)}"
 
 @mcp.tool()
-def clear_arrangement(ctx: Context, track_indices: List[int] = None) -> str:
+async def clear_arrangement(ctx: Context, track_indices: List[int] = None) -> str:
     """
     Delete all arrangement clips on specified tracks or all tracks if None.
     """
     try:
-        ableton = get_ableton_connection()
+        ableton = await get_async_ableton_connection()
         params = {"track_indices": track_indices} if track_indices is not None else {}
-        result = ableton.send_command("clear_arrangement", params)
+        result = await ableton.send_command("clear_arrangement", params, on_progress=progress_reporter(ctx))
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error clearing arrangement: {str(e)}")
         return f"Error clearing arrangement: {str(e)}"
 
 @mcp.tool()
-def duplicate_track_clip_to_arrangement(
+async def duplicate_track_clip_to_arrangement(
     ctx: Context,
     track_index: int,
     clip_index: int,
@@ -1290,7 +2221,7 @@ def duplicate_track_clip_to_arrangement(
     Duplicate a Session clip to Arrangement at a given beat position and set its length/looping.
     """
     try:
-        ableton = get_ableton_connection()
+        ableton = await get_async_ableton_connection()
         params = {
             "track_index": track_index,
             "clip_index": clip_index,
@@ -1299,14 +2230,108 @@ def duplicate_track_clip_to_arrangement(
         }
         if loop is not None:
             params["loop"] = loop
-        result = ableton.send_command("duplicate_track_clip_to_arrangement", params)
+        result = await ableton.send_command("duplicate_track_clip_to_arrangement", params,
+                                            on_progress=progress_reporter(ctx))
         return json.dumps(result, indent=2)
     except Exception as e:
         logger.error(f"Error duplicating session clip to arrangement: {str(e)}")
         return f"Error duplicating session clip to arrangement: {str(e)}"
 
+async def crawl_browser_pages(category_type: str = "all", max_depth: int = BROWSER_CRAWL_DEPTH,
+                              page_size: int = BROWSER_CRAWL_PAGE_SIZE) -> AsyncIterator[Dict[str, Any]]:
+    """Yield crawl_browser pages until the crawl is done.
+
+    Each page holds a flat, depth-first list of nodes, so callers can process
+    the browser without holding all of it. A page that fails is requested
+    again with the same cursor, on a new connection if the old one dropped;
+    the Remote Script replays pages it already sent.
+    """
+    cursor = None
+    while True:
+        params = {"category_type": category_type, "max_depth": max_depth, "page_size": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        for attempt in range(1, BROWSER_CRAWL_RETRIES + 1):
+            try:
+                ableton = await get_async_ableton_connection()
+                page = await ableton.send_command("crawl_browser", params)
+                break
+            except Exception as e:
+                if attempt == BROWSER_CRAWL_RETRIES:
+                    raise
+                logger.warning(f"Retrying browser crawl page {cursor or 'start'}: {str(e)}")
+                await asyncio.sleep(RECONNECT_BACKOFF * 2 ** (attempt - 1))
+        yield page
+        cursor = page.get("cursor")
+        if not cursor:
+            return
+
+def index_browser_page(index: BrowserIndex, page: Dict[str, Any]) -> None:
+    """Add the items on one crawl_browser page to a search index"""
+    for node in page.get("nodes", []):
+        # Category roots are not items
+        if node.get("depth"):
+            index.add(node.get("name", ""), node["path"], node.get("uri"), node["category"],
+                      node.get("is_loadable"), node.get("is_device"), node.get("is_folder"))
+
+async def get_browser_search_index(refresh: bool = False) -> BrowserIndex:
+    """The browser search index for the running Live version and library.
+
+    Loaded once per server process: from disk when an index for the same Live
+    version and library fingerprint was saved before, otherwise from a full
+    crawl of the browser, which is then saved.
+    """
+    global _browser_search_index
+    async with _browser_search_lock:
+        if _browser_search_index is not None and not refresh:
+            return _browser_search_index
+
+        ableton = await get_async_ableton_connection()
+        version = await ableton.send_command("get_application_version")
+        live_version = str(version.get("version_string") or version)
+        shallow = await ableton.send_command("get_browser_tree", {"category_type": "all", "max_depth": 2})
+        library = fingerprint(shallow)
+
+        index = None if refresh else BrowserIndex.load(live_version, library)
+        if index is None:
+            logger.info("Crawling the Ableton browser to build the search index")
+            index = BrowserIndex(live_version, library)
+            async for page in crawl_browser_pages():
+                index_browser_page(index, page)
+            index.finish()
+            try:
+                logger.info(f"Saved browser search index to {index.save()}")
+            except OSError as e:
+                logger.warning(f"Could not save the browser search index: {str(e)}")
+        _browser_search_index = index
+        return index
+
+@mcp.tool()
+async def search_browser(ctx: Context, query: str, limit: int = 10, category: str = None,
+                         loadable_only: bool = False, refresh: bool = False) -> str:
+    """
+    Search Ableton's browser (instruments, sounds, drums, effects, plugins) by name and folder, tolerating typos.
+
+    The first search builds an index of the whole browser, or loads it from disk;
+    later searches do not touch Live.
+
+    Parameters:
+    - query: Words to look for, e.g. "808 kit" or "reverb hall"
+    - limit: Maximum number of results, best first
+    - category: Optional category to restrict to: instruments, sounds, drums, audio_effects, midi_effects or plugins
+    - loadable_only: Only return items that can be loaded onto a track
+    - refresh: Re-crawl the browser first, e.g. after installing new packs
+    """
+    try:
+        index = await get_browser_search_index(refresh)
+        results = index.search(query, limit=limit, category=category, loadable_only=loadable_only)
+        return json.dumps({"query": query, "results": results, "indexed_items": len(index.items)}, indent=2)
+    except Exception as e:
+        logger.error(f"Error searching browser: {str(e)}")
+        return f"Error searching browser: {str(e)}"
+
 @mcp.tool()
-def get_browser_tree(ctx: Context, category_type: str = "all", max_depth: int = 2) -> str:
+async def get_browser_tree(ctx: Context, category_type: str = "all", max_depth: int = 2) -> str:
     """
     Get a hierarchical tree of browser categories from Ableton, with recursive exploration.
     
@@ -1315,49 +2340,28 @@ def get_browser_tree(ctx: Context, category_type: str = "all", max_depth: int =
     - max_depth: How many levels of subfolders to explore. Defaults to 2.
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_browser_tree", {
-            "category_type": category_type,
-            "max_depth": max_depth
-        })
-        
-        # Check if we got any categories
-        if "available_categories" in result and len(result.get("categories", [])) == 0:
-            available_cats = result.get("available_categories", [])
-            return (f"No categories found for '{category_type}'. "
-                   f"Available browser categories: {', '.join(available_cats)}")
-        
-        # Format the tree in a more readable way
-        total_folders = result.get("total_folders", 0)
-        formatted_output = f"Browser tree for '{category_type}' (showing {total_folders} folders):\n\n"
-        
-        def format_tree(item, indent=0):
-            output = ""
-            if item:
-                prefix = "  " * indent
-                name = item.get("name", "Unknown")
-                path = item.get("path", "")
-                has_more = item.get("has_more", False)
-                
-                # Add this item
-                output += f"{prefix}• {name}"
-                if path:
-                    output += f" (path: {path})"
-                if has_more:
-                    output += " [...]"
-                output += "\n"
-                
-                # Add children
-                for child in item.get("children", []):
-                    output += format_tree(child, indent + 1)
-            return output
-        
-        # Format each category
-        for category in result.get("categories", []):
-            formatted_output += format_tree(category)
-            formatted_output += "\n"
-        
-        return formatted_output
+        # Format nodes as their pages arrive instead of fetching the whole tree first
+        lines = []
+        folders = 0
+        async for page in crawl_browser_pages(category_type, max_depth):
+            if page.get("page") == 1 and not page.get("categories"):
+                available_cats = page.get("available_categories", [])
+                return (f"No categories found for '{category_type}'. "
+                       f"Available browser categories: {', '.join(available_cats)}")
+            for node in page.get("nodes", []):
+                depth = node.get("depth", 0)
+                if depth == 0 and lines:
+                    lines.append("")
+                line = f"{'  ' * depth}• {node.get('name', 'Unknown')}"
+                if node.get("path"):
+                    line += f" (path: {node['path']})"
+                if node.get("has_more"):
+                    line += " [...]"
+                lines.append(line)
+                if node.get("is_folder"):
+                    folders += 1
+
+        return f"Browser tree for '{category_type}' (showing {folders} folders):\n\n" + "\n".join(lines) + "\n"
     except Exception as e:
         error_msg = str(e)
         if "Browser is not available" in error_msg:
@@ -1371,19 +2375,22 @@ def get_browser_tree(ctx: Context, category_type: str = "all", max_depth: int =
             return f"Error getting browser tree: {error_msg}"
 
 @mcp.tool()
-def get_browser_items_at_path(ctx: Context, path: str) -> str:
+async def get_browser_items_at_path(ctx: Context, path: str, fields: List[str] = None,
+                                    offset: int = 0, limit: int = None) -> str:
     """
     Get browser items at a specific path in Ableton's browser.
     
     Parameters:
     - path: Path in the format "category/folder/subfolder"
             where category is one of the available browser categories in Ableton
+    - fields: Optional keys to keep in each item, e.g. ["name", "uri"]
+    - offset, limit: Optional page of items to return; item_count is always the total
     """
     try:
-        ableton = get_ableton_connection()
-        result = ableton.send_command("get_browser_items_at_path", {
-            "path": path
-        })
+        ableton = await get_async_ableton_connection()
+        params = {"path": path}
+        params.update(paging_params(fields, offset, limit))
+        result = await ableton.send_command("get_browser_items_at_path", params)
         
         # Check if there was an error with available categories
         if "error" in result and "available_categories" in result:
@@ -1412,7 +2419,7 @@ def get_browser_items_at_path(ctx: Context, path: str) -> str:
             return f"Error getting browser items at path: {error_msg}"
 
 @mcp.tool()
-def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str) -> str:
+async def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str) -> str:
     """
     Load a drum rack and then load a specific drum kit into it.
     
@@ -1422,10 +2429,10 @@ def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str)
     - kit_path: Path to the drum kit inside the browser (e.g., 'drums/acoustic/kit1')
     """
     try:
-        ableton = get_ableton_connection()
+        ableton = await get_async_ableton_connection()
         
         # Step 1: Load the drum rack
-        result = ableton.send_command("load_browser_item", {
+        result = await ableton.send_command("load_browser_item", {
             "track_index": track_index,
             "item_uri": rack_uri
         })
@@ -1434,7 +2441,7 @@ def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str)
             return f"Failed to load drum rack with URI '{rack_uri}'"
         
         # Step 2: Get the drum kit items at the specified path
-        kit_result = ableton.send_command("get_browser_items_at_path", {
+        kit_result = await ableton.send_command("get_browser_items_at_path", {
             "path": kit_path
         })
         
@@ -1450,7 +2457,7 @@ def load_drum_kit(ctx: Context, track_index: int, rack_uri: str, kit_path: str)
         
         # Step 4: Load the first loadable kit
         kit_uri = loadable_kits[0].get("uri")
-        load_result = ableton.send_command("load_browser_item", {
+        load_result = await ableton.send_command("load_browser_item", {
             "track_index": track_index,
             "item_uri": kit_uri
         })
@@ -1494,7 +2501,7 @@ def modify_m4l_device_default(
         return f"Error modifying M4L device: {str(e)}"
 
 @mcp.tool()
-def show_message(ctx: Context, message: str) -> str:
+async def show_message(ctx: Context, message: str) -> str:
     """
     Display a message in Ableton's status bar.
 
@@ -1502,8 +2509,8 @@ def show_message(ctx: Context, message: str) -> str:
     - message: The message to display.
     """
     try:
-        ableton = get_ableton_connection()
-        ableton.send_command("show_message", {"message": message})
+        ableton = await get_async_ableton_connection()
+        await ableton.send_command("show_message", {"message": message})
         return f"Message '{message}' shown in Ableton."
     except Exception as e:
         logger.error(f"Error showing message: {str(e)}")
@@ -0,0 +1,131 @@
+"""Just enough of Live's API to run the Remote Script outside Live.
+
+``install_framework_stub()`` provides the ``_Framework.ControlSurface`` module
+the script imports, and ``song()`` builds a session of plain objects whose
+properties support Live's ``add_<prop>_listener`` protocol.
+"""
+import sys
+import types
+
+
+class LiveObject(object):
+    """An object whose attributes notify listeners when they are assigned"""
+
+    def __init__(self, **properties):
+        self.__dict__["_listeners"] = {}
+        self.__dict__.update(properties)
+
+    def __setattr__(self, name, value):
+        self.__dict__[name] = value
+        for callback in list(self._listeners.get(name, ())):
+            callback()
+
+    def __getattr__(self, name):
+        listeners = self.__dict__["_listeners"]
+        if name.startswith("add_") and name.endswith("_listener"):
+            return listeners.setdefault(name[len("add_"):-len("_listener")], []).append
+        if name.startswith("remove_") and name.endswith("_listener"):
+            return listeners.setdefault(name[len("remove_"):-len("_listener")], []).remove
+        if name.endswith("_has_listener"):
+            prop = name[:-len("_has_listener")]
+            return lambda callback: callback in listeners.get(prop, ())
+        raise AttributeError(name)
+
+    def listener_count(self):
+        return sum(len(callbacks) for callbacks in self._listeners.values())
+
+
+class ControlSurface(object):
+    """Stand-in for _Framework.ControlSurface.ControlSurface"""
+
+    def __init__(self, c_instance):
+        self._c_instance = c_instance
+
+    def log_message(self, *args):
+        pass
+
+    def show_message(self, *args):
+        pass
+
+    def song(self):
+        return self._c_instance.song
+
+    def application(self):
+        return self._c_instance.application
+
+    def update_display(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+
+class CInstance(object):
+    def __init__(self, song, application=None):
+        self.song = song
+        self.application = application or LiveObject(browser=None, control_surfaces=[])
+
+
+def install_framework_stub():
+    """Make ``from _Framework.ControlSurface import ControlSurface`` import the stub"""
+    if "_Framework.ControlSurface" not in sys.modules:
+        package = types.ModuleType("_Framework")
+        module = types.ModuleType("_Framework.ControlSurface")
+        module.ControlSurface = ControlSurface
+        package.ControlSurface = module
+        sys.modules["_Framework"] = package
+        sys.modules["_Framework.ControlSurface"] = module
+
+
+def parameter(name, value=0.0):
+    return LiveObject(name=name, value=value, min=0.0, max=1.0, is_quantized=False, is_enabled=True)
+
+
+def mixer():
+    return LiveObject(volume=parameter("Volume", 0.85), panning=parameter("Pan"), sends=[])
+
+
+def clip(name="Clip"):
+    return LiveObject(name=name, length=4.0, is_playing=False, is_recording=False, color=0, looping=True,
+                      loop_start=0.0, loop_end=4.0, start_marker=0.0, end_marker=4.0,
+                      signature_numerator=4, signature_denominator=4, is_audio_clip=False, is_midi_clip=True)
+
+
+def clip_slot(has_clip=False):
+    return LiveObject(has_clip=has_clip, playing_status=0, clip=clip() if has_clip else None)
+
+
+def device(name="Device", parameter_count=4):
+    return LiveObject(name=name, class_name="OriginalSimpler", type=1,
+                      parameters=[parameter("P%d" % i) for i in range(parameter_count)],
+                      can_have_chains=False, can_have_drum_pads=False)
+
+
+def track(index, scene_count=4):
+    return LiveObject(name="Track %d" % index, has_audio_input=False, has_midi_input=True,
+                      mute=False, solo=False, arm=False, mixer_device=mixer(),
+                      clip_slots=[clip_slot(has_clip=i % 2 == 0) for i in range(scene_count)],
+                      devices=[device("Device %d" % i) for i in range(2)], arrangement_clips=[])
+
+
+def song(track_count=2, scene_count=4):
+    return LiveObject(tempo=120.0, signature_numerator=4, signature_denominator=4, is_playing=False,
+                      current_song_time=0.0, tracks=[track(i, scene_count) for i in range(track_count)],
+                      return_tracks=[], master_track=LiveObject(mixer_device=mixer()),
+                      scenes=[LiveObject(name="Scene %d" % i) for i in range(scene_count)], cue_points=[])
+
+
+def browser_item(name, uri, children=(), is_loadable=False):
+    return LiveObject(name=name, uri=uri, children=list(children), is_folder=bool(children),
+                      is_device=False, is_loadable=is_loadable)
+
+
+def browser(folder_count=2, item_count=3):
+    """A browser whose categories each hold folders of loadable items"""
+    def category(name):
+        folders = [browser_item("Folder %d" % f, "query:%s#F%d" % (name, f), [
+            browser_item("Item %d.%d" % (f, i), "query:%s#F%d:I%d" % (name, f, i), is_loadable=True)
+            for i in range(item_count)]) for f in range(folder_count)]
+        return browser_item(name.replace("_", " ").title(), "query:" + name, folders)
+    return LiveObject(**dict((name, category(name)) for name in
+                             ("instruments", "sounds", "drums", "audio_effects", "midi_effects", "plugins")))
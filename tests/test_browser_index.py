@@ -0,0 +1,111 @@
+import asyncio
+import gzip
+import os
+import time
+
+from MCP_Server import server
+from MCP_Server.browser_index import BrowserIndex, fingerprint
+
+
+def _tree():
+    def item(name, uri, children=(), loadable=True):
+        return {"name": name, "uri": uri, "is_loadable": loadable, "is_device": not children,
+                "is_folder": bool(children), "children": list(children)}
+    return {"categories": [
+        item("Instruments", "query:Synths", [
+            item("Operator", "query:Synths#Operator", [item("Bass Pluck", "query:Synths#Operator:Bass%20Pluck")]),
+            item("Drift", "query:Synths#Drift"),
+        ], loadable=False),
+        item("Drums", "query:Drums", [
+            item("808 Core Kit.adg", "query:Drums#808%20Core%20Kit"),
+            item("909 Core Kit.adg", "query:Drums#909%20Core%20Kit"),
+        ], loadable=False),
+    ]}
+
+
+def _crawl_page():
+    """The tree as one crawl_browser page, as the Remote Script sends it"""
+    nodes = []
+    for category, root in zip(("instruments", "drums"), _tree()["categories"]):
+        pending = [(root, 0, category)]
+        while pending:
+            item, depth, path = pending.pop()
+            node = dict((key, value) for key, value in item.items() if key != "children")
+            nodes.append(dict(node, path=path, category=category, depth=depth))
+            pending.extend((child, depth + 1, f"{path}/{child['name']}") for child in reversed(item["children"]))
+    return {"nodes": nodes, "page": 1, "cursor": None}
+
+
+def _index() -> BrowserIndex:
+    index = BrowserIndex("12.1", fingerprint(_tree()))
+    server.index_browser_page(index, _crawl_page())
+    index.finish()
+    return index
+
+
+def test_search_ranks_name_matches_and_tolerates_typos() -> None:
+    index = _index()
+    assert index.search("808 kit")[0]["uri"] == "query:Drums#808%20Core%20Kit"
+    # "oprator" is close enough to "operator"; the device outranks its preset
+    results = index.search("oprator")
+    assert [r["name"] for r in results] == ["Operator", "Bass Pluck"]
+    assert results[1]["path"] == "instruments/Operator/Bass Pluck"
+    assert index.search("core", category="instruments") == []
+    assert len(index.search("kit", limit=1)) == 1
+
+
+def test_index_round_trips_through_disk(tmp_path) -> None:
+    index = _index()
+    index.save(str(tmp_path))
+    loaded = BrowserIndex.load("12.1", index.library_fingerprint, str(tmp_path))
+    assert loaded is not None
+    assert loaded.search("drift") == index.search("drift")
+    # A different Live version or library needs a new crawl
+    assert BrowserIndex.load("12.2", index.library_fingerprint, str(tmp_path)) is None
+
+
+def test_corrupt_index_is_discarded(tmp_path) -> None:
+    path = _index().save(str(tmp_path))
+    with open(path, "rb") as f:
+        data = f.read()
+    for corrupt in (data[:len(data) // 2], b"not gzip", gzip.compress(b"{truncated")):
+        with open(path, "wb") as f:
+            f.write(corrupt)
+        assert BrowserIndex.load("12.1", fingerprint(_tree()), str(tmp_path)) is None
+        assert not os.path.exists(path)
+
+
+def test_search_over_many_items_is_fast() -> None:
+    index = BrowserIndex()
+    for n in range(50000):
+        index.add(f"Preset {n} Bass Lead", f"sounds/Pack {n % 40}/Preset {n} Bass Lead", f"query:P{n}", "sounds")
+    index.finish()
+    started = time.perf_counter()
+    assert index.search("pack 7 lead", limit=5)
+    assert index.search("bsas")
+    assert time.perf_counter() - started < 1.0
+
+
+def test_crawl_pages_retry_with_the_same_cursor(monkeypatch) -> None:
+    sent = []
+
+    class FlakyConnection:
+        async def send_command(self, command_type, params=None):
+            sent.append(params.get("cursor"))
+            if len(sent) == 2:
+                raise Exception("Connection to Ableton lost")
+            if "cursor" not in params:
+                return {"nodes": [{"name": "Drums", "depth": 0}], "page": 1, "cursor": "1:2"}
+            return {"nodes": [{"name": "Kit", "depth": 1}], "page": 2, "cursor": None}
+
+    async def connection():
+        return FlakyConnection()
+
+    async def crawl():
+        return [page async for page in server.crawl_browser_pages("drums")]
+
+    monkeypatch.setattr(server, "get_async_ableton_connection", connection)
+    monkeypatch.setattr(server, "RECONNECT_BACKOFF", 0)
+    pages = asyncio.run(crawl())
+    assert [node["name"] for page in pages for node in page["nodes"]] == ["Drums", "Kit"]
+    assert sent == [None, "1:2", "1:2"]
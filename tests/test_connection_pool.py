@@ -0,0 +1,110 @@
+import json
+import socket
+import threading
+import time
+
+from MCP_Server.protocol import encode_frame, read_frame
+from MCP_Server.server import AbletonConnectionPool
+
+
+def _serve_framed_v1(accepted, hello=None, ping=None):
+    """Serve framed protocol v1 (no request ids) on any number of connections.
+
+    ``hello`` is merged into the hello reply and ``ping`` is the ping result.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("localhost", 0))
+    server.listen(8)
+
+    def handle(conn):
+        with conn:
+            buffer = b""
+            while True:
+                buffer += conn.recv(8192)
+                try:
+                    json.loads(buffer.decode("utf-8"))
+                    break
+                except ValueError:
+                    continue
+            result = dict(hello or {}, protocol_version=1)
+            conn.sendall(json.dumps({"status": "success", "result": result}).encode("utf-8"))
+            try:
+                while True:
+                    _, command = read_frame(conn)
+                    time.sleep(0.02)
+                    if command["type"] == "ping":
+                        result = ping or {}
+                    else:
+                        result = command["params"]
+                    conn.sendall(encode_frame({"status": "success", "result": result}, 1))
+            except ConnectionError:
+                return
+
+    def run():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            accepted.append(conn)
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=run, daemon=True).start()
+    return server
+
+
+def test_pool_serializes_callers_on_a_legacy_connection() -> None:
+    accepted = []
+    server = _serve_framed_v1(accepted)
+    pool = AbletonConnectionPool(port=server.getsockname()[1])
+    results = {}
+
+    def call(n):
+        results[n] = pool.send_command("get_track_info", {"track_index": n})
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    # Every caller got its own reply although they shared one socket
+    assert results == {n: {"track_index": n} for n in range(8)}
+    assert len(accepted) == 1
+    pool.close()
+    server.close()
+
+
+def test_pool_replaces_a_dead_connection() -> None:
+    accepted = []
+    server = _serve_framed_v1(accepted)
+    pool = AbletonConnectionPool(port=server.getsockname()[1])
+    assert pool.send_command("get_track_info", {"track_index": 1}) == {"track_index": 1}
+
+    with pool.connection() as conn:
+        conn.disconnect()
+    assert not pool.connected
+
+    assert pool.send_command("get_track_info", {"track_index": 2}) == {"track_index": 2}
+    assert len(accepted) == 2
+    pool.close()
+    server.close()
+
+
+def test_heartbeat_drops_connection_after_remote_script_restart() -> None:
+    accepted = []
+    server = _serve_framed_v1(accepted, hello={"commands": ["ping"], "server_start_time": 1.0},
+                              ping={"server_start_time": 2.0})
+    pool = AbletonConnectionPool(port=server.getsockname()[1], heartbeat_interval=0.05)
+    assert pool.send_command("get_track_info", {"track_index": 1}) == {"track_index": 1}
+
+    # The ping answers with another start time, so the heartbeat drops the connection
+    deadline = time.monotonic() + 5
+    while pool.connected and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert not pool.connected
+
+    assert pool.send_command("get_track_info", {"track_index": 2}) == {"track_index": 2}
+    assert len(accepted) == 2
+    pool.close()
+    server.close()
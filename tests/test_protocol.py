@@ -0,0 +1,408 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from MCP_Server.protocol import (
+    CHUNK_HEADER,
+    FRAME_HEADER,
+    FRAME_MAGIC,
+    PROTOCOL_VERSION,
+    STREAMED_LENGTH,
+    ProtocolError,
+    decode_header,
+    encode_frame,
+    read_frame,
+    read_frame_async,
+)
+from MCP_Server import server
+from MCP_Server.server import (
+    BUSY_RETRIES,
+    AbletonBusyError,
+    AbletonConnection,
+    AsyncAbletonConnection,
+    progress_reporter,
+)
+
+
+def _serve_once(handler):
+    """Accept a single connection on an ephemeral port and run handler(conn) in a thread."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("localhost", 0))
+    server.listen(1)
+
+    def run():
+        conn, _ = server.accept()
+        try:
+            handler(conn)
+        finally:
+            conn.close()
+            server.close()
+
+    threading.Thread(target=run, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def _read_legacy(conn: socket.socket):
+    buffer = b""
+    while True:
+        buffer += conn.recv(8192)
+        try:
+            return json.loads(buffer.decode("utf-8"))
+        except ValueError:
+            continue
+
+
+def test_frame_round_trip() -> None:
+    left, right = socket.socketpair()
+    try:
+        message = {"type": "get_track_info", "params": {"track_index": 3, "name": "Bäss"}}
+        left.sendall(encode_frame(message))
+        version, decoded = read_frame(right)
+        assert version == PROTOCOL_VERSION
+        assert decoded == message
+    finally:
+        left.close()
+        right.close()
+
+
+def _streamed_frame(message, chunk_size: int) -> bytes:
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] + [b""]
+    return FRAME_HEADER.pack(FRAME_MAGIC, 3, STREAMED_LENGTH) + b"".join(
+        CHUNK_HEADER.pack(len(chunk)) + chunk for chunk in chunks)
+
+
+def test_streamed_frames_are_joined_and_decoded_once() -> None:
+    message = {"status": "success", "result": {"names": [f"Bäss {i}" for i in range(2000)]}, "id": 4}
+    left, right = socket.socketpair()
+    try:
+        buffer = bytearray(16)
+        for chunk_size in (1000, 7):
+            left.sendall(_streamed_frame(message, chunk_size))
+            assert read_frame(right, buffer) == (3, message)
+        # A regular frame after a streamed one still reads correctly from the same buffer
+        left.sendall(encode_frame({"id": 5}, 3))
+        assert read_frame(right, buffer) == (3, {"id": 5})
+    finally:
+        left.close()
+        right.close()
+
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(_streamed_frame(message, 1000))
+        reader.feed_eof()
+        return await read_frame_async(reader)
+
+    assert asyncio.run(read()) == (3, message)
+
+
+def test_decode_header_rejects_bad_magic() -> None:
+    with pytest.raises(ProtocolError):
+        decode_header(FRAME_HEADER.pack(b"JSON", 1, 10))
+
+
+def test_connection_negotiates_framing() -> None:
+    def handler(conn):
+        hello = _read_legacy(conn)
+        assert hello["type"] == "hello"
+        conn.sendall(json.dumps({"status": "success", "result": {"protocol_version": 1}}).encode("utf-8"))
+        _, command = read_frame(conn)
+        conn.sendall(encode_frame({"status": "success", "result": {"echo": command["type"]}}, 1))
+
+    port = _serve_once(handler)
+    conn = AbletonConnection(host="localhost", port=port)
+    assert conn.connect()
+    assert conn.protocol_version == 1
+    assert conn.send_command("get_session_info") == {"echo": "get_session_info"}
+    conn.disconnect()
+
+
+def test_connection_falls_back_to_legacy() -> None:
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "error", "message": "Unknown command: hello"}).encode("utf-8"))
+        command = _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success", "result": {"echo": command["type"]}}).encode("utf-8"))
+
+    port = _serve_once(handler)
+    conn = AbletonConnection(host="localhost", port=port)
+    assert conn.connect()
+    assert conn.protocol_version == 0
+    assert conn.send_command("get_session_info") == {"echo": "get_session_info"}
+    conn.disconnect()
+
+
+def test_large_legacy_reply_is_received_into_a_growing_buffer() -> None:
+    names = [f"Preset {{{i}}} Bäss" for i in range(5000)]
+    reply = json.dumps({"status": "success", "result": {"names": names}}, ensure_ascii=False).encode("utf-8")
+    brace = reply.index(b"}") + 1
+    umlaut = reply.index("ä".encode("utf-8")) + 1
+
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "error", "message": "Unknown command: hello"}).encode("utf-8"))
+        for _ in range(2):
+            _read_legacy(conn)
+            # Split right after closing braces inside the reply and inside a multi-byte character
+            for part in (reply[:brace], reply[brace:umlaut], reply[umlaut:]):
+                conn.sendall(part)
+                time.sleep(0.01)
+
+    conn = AbletonConnection(host="localhost", port=_serve_once(handler), recv_buffer_size=1024)
+    assert conn.connect()
+    assert conn.send_command("get_browser_tree") == {"names": names}
+    assert conn.send_command("get_browser_tree") == {"names": names}
+    assert len(conn._recv_buffer) >= len(reply)
+    conn.disconnect()
+
+
+def test_pipelined_responses_are_matched_by_id() -> None:
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success", "result": {"protocol_version": 2}}).encode("utf-8"))
+        commands = [read_frame(conn)[1] for _ in range(3)]
+        # Answer in reverse order; the client must still pair each result with its request
+        for command in reversed(commands):
+            result = {"track_index": command["params"]["track_index"]}
+            conn.sendall(encode_frame({"status": "success", "result": result, "id": command["id"]}, 2))
+
+    port = _serve_once(handler)
+    conn = AbletonConnection(host="localhost", port=port)
+    assert conn.connect()
+    assert conn.protocol_version == 2
+    results = conn.send_commands([("get_track_info", {"track_index": i}) for i in range(3)])
+    assert [r["track_index"] for r in results] == [0, 1, 2]
+    conn.disconnect()
+
+
+
+def _reject_first_request(conn):
+    _read_legacy(conn)
+    conn.sendall(json.dumps({"status": "success", "result": {"protocol_version": 2}}).encode("utf-8"))
+    read_frame(conn)
+    conn.sendall(encode_frame({"status": "error", "message": "Invalid JSON: bad", "connection_error": True}, 2))
+    # Still connected; later requests are answered
+    command = read_frame(conn)[1]
+    conn.sendall(encode_frame({"status": "success", "result": {}, "id": command["id"]}, 2))
+
+
+def test_connection_errors_fail_waiting_requests() -> None:
+    conn = AbletonConnection(host="localhost", port=_serve_once(_reject_first_request))
+    assert conn.connect()
+    started = time.monotonic()
+    with pytest.raises(Exception, match="Invalid JSON"):
+        conn.submit("get_session_info").result(5)
+    assert time.monotonic() - started < 1.0
+    assert conn.send_command("ping") == {}
+    conn.disconnect()
+
+    async def scenario():
+        conn = AsyncAbletonConnection(host="localhost", port=_serve_once(_reject_first_request),
+                                      heartbeat_interval=0)
+        assert await conn.connect()
+        with pytest.raises(Exception, match="Invalid JSON"):
+            await conn.send_command("get_session_info")
+        assert await conn.send_command("ping") == {}
+        await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_busy_replies_are_retried_after_the_hint() -> None:
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success", "result": {"protocol_version": 2}}).encode("utf-8"))
+        for _ in range(2):
+            command = read_frame(conn)[1]
+            conn.sendall(encode_frame({"status": "error", "message": "Busy: 16 commands are pending",
+                                       "retry_after_ms": 5.0, "id": command["id"]}, 2))
+        command = read_frame(conn)[1]
+        conn.sendall(encode_frame({"status": "success", "result": {"tempo": 120.0}, "id": command["id"]}, 2))
+        # Refused every time: the caller gets the busy error in the end
+        for _ in range(BUSY_RETRIES + 1):
+            command = read_frame(conn)[1]
+            conn.sendall(encode_frame({"status": "error", "message": "Busy", "retry_after_ms": 1.0,
+                                       "id": command["id"]}, 2))
+
+    conn = AbletonConnection(host="localhost", port=_serve_once(handler))
+    assert conn.connect()
+    assert conn.send_command("set_tempo", {"tempo": 120.0}) == {"tempo": 120.0}
+    with pytest.raises(AbletonBusyError) as error:
+        conn.send_command("set_tempo", {"tempo": 121.0})
+    assert error.value.retry_after_ms == 1.0
+    conn.disconnect()
+
+def test_verify_rejects_value_not_applied() -> None:
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success", "result": {"protocol_version": 2}}).encode("utf-8"))
+        for reported in (128.0, 999.0):
+            command = read_frame(conn)[1]
+            response = {"status": "success", "result": {"tempo": reported}, "applied": True, "id": command["id"]}
+            conn.sendall(encode_frame(response, 2))
+
+    port = _serve_once(handler)
+    conn = AbletonConnection(host="localhost", port=port)
+    assert conn.connect()
+    assert conn.send_command("set_tempo", {"tempo": 128.0}, verify=True) == {"tempo": 128.0}
+    with pytest.raises(Exception, match="not applied"):
+        conn.send_command("set_tempo", {"tempo": 1200.0}, verify=True)
+    conn.disconnect()
+
+
+def test_async_connection_does_not_wait_behind_slow_command() -> None:
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success", "result": {"protocol_version": 2}}).encode("utf-8"))
+        slow = read_frame(conn)[1]
+        fast = read_frame(conn)[1]
+        conn.sendall(encode_frame({"status": "success", "result": {"beats": 1.0}, "id": fast["id"]}, 2))
+        time.sleep(0.3)
+        conn.sendall(encode_frame({"status": "success", "result": {"categories": []}, "id": slow["id"]}, 2))
+
+    async def scenario():
+        conn = AsyncAbletonConnection(host="localhost", port=_serve_once(handler))
+        assert await conn.connect()
+        slow = asyncio.ensure_future(conn.send_command("get_browser_tree"))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        assert await conn.send_command("get_current_song_time_beats") == {"beats": 1.0}
+        assert time.monotonic() - started < 0.2
+        assert await slow == {"categories": []}
+        await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_async_heartbeat_marks_silent_connection_dead() -> None:
+    hello = {"protocol_version": 2, "commands": ["ping"], "server_start_time": 1.0}
+
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success", "result": hello}).encode("utf-8"))
+        ping = read_frame(conn)[1]
+        conn.sendall(encode_frame({"status": "success", "result": {"server_start_time": 1.0}, "id": ping["id"]}, 2))
+        # Stop answering without closing the socket, like a hung Live
+        time.sleep(2.0)
+
+    async def scenario():
+        conn = AsyncAbletonConnection(host="localhost", port=_serve_once(handler), heartbeat_interval=0.05)
+        assert await conn.connect()
+        assert conn.server_info["server_start_time"] == 1.0
+        await asyncio.sleep(0.15)
+        assert conn.connected
+        # The second ping goes unanswered and times out after PING_TIMEOUT
+        for _ in range(60):
+            if not conn.connected:
+                break
+            await asyncio.sleep(0.05)
+        assert not conn.connected
+
+    asyncio.run(scenario())
+
+
+def test_async_connection_routes_pushed_events() -> None:
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success", "result": {"protocol_version": 2}}).encode("utf-8"))
+        command = read_frame(conn)[1]
+        assert command["type"] == "subscribe"
+        conn.sendall(encode_frame({"status": "success", "result": {"subscribed": ["tempo"], "seq": 0},
+                                   "id": command["id"]}, 2))
+        # Events carry no id and may arrive between any two replies
+        conn.sendall(encode_frame({"event": "changes", "seq": 1, "changes": [{"kind": "tempo", "value": 98.0}]}, 2))
+        command = read_frame(conn)[1]
+        conn.sendall(encode_frame({"status": "success", "result": {"tempo": 98.0}, "id": command["id"]}, 2))
+
+    async def scenario():
+        conn = AsyncAbletonConnection(host="localhost", port=_serve_once(handler))
+        events = []
+        conn.add_event_listener(events.append)
+        assert await conn.connect()
+        assert (await conn.subscribe(["tempo"]))["subscribed"] == ["tempo"]
+        assert await conn.send_command("get_session_info") == {"tempo": 98.0}
+        assert events == [{"event": "changes", "seq": 1, "changes": [{"kind": "tempo", "value": 98.0}]}]
+        await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_async_timeout_counts_from_last_progress() -> None:
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success", "result": {"protocol_version": 2}}).encode("utf-8"))
+        command = read_frame(conn)[1]
+        # Runs for twice the timeout, but never goes quiet for longer than a third of it
+        for completed in range(6):
+            time.sleep(0.1)
+            conn.sendall(encode_frame({"progress": {"completed": completed, "total": 6}, "id": command["id"]}, 2))
+        conn.sendall(encode_frame({"status": "success", "result": {"tracks_cleared": 6}, "id": command["id"]}, 2))
+
+    async def scenario():
+        conn = AsyncAbletonConnection(host="localhost", port=_serve_once(handler), heartbeat_interval=0)
+        assert await conn.connect()
+        conn.registry = {"clear_arrangement": {"timeout": 0.3, "mutating": True}}
+        progress = []
+        result = await conn.send_command("clear_arrangement", on_progress=progress.append)
+        assert result == {"tracks_cleared": 6}
+        assert [p["completed"] for p in progress] == list(range(6))
+        await conn.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_progress_notifications_are_held_until_sent() -> None:
+    sent = []
+
+    class Context:
+        async def report_progress(self, progress, total=None):
+            await asyncio.sleep(0.01)
+            sent.append((progress, total))
+
+    async def scenario():
+        report = progress_reporter(Context())
+        for completed in range(3):
+            report({"completed": completed, "total": 3})
+        assert len(server._progress_tasks) == 3
+        await asyncio.sleep(0.05)
+        assert not server._progress_tasks
+        assert sent == [(0, 3), (1, 3), (2, 3)]
+
+    asyncio.run(scenario())
+
+
+def test_async_timeout_cancels_the_command_in_live() -> None:
+    received = []
+
+    def handler(conn):
+        _read_legacy(conn)
+        conn.sendall(json.dumps({"status": "success",
+                                 "result": {"protocol_version": 2, "commands": ["cancel"]}}).encode("utf-8"))
+        received.append(read_frame(conn)[1])
+        # Never answered; the client gives up and cancels it
+        cancel = read_frame(conn)[1]
+        received.append(cancel)
+        conn.sendall(encode_frame({"status": "success", "id": cancel["id"],
+                                   "result": {"request_id": received[0]["id"], "cancelled": True}}, 2))
+
+    async def scenario():
+        conn = AsyncAbletonConnection(host="localhost", port=_serve_once(handler), heartbeat_interval=0)
+        assert await conn.connect()
+        conn.registry = {"set_tempo": {"timeout": 0.2, "mutating": True}}
+        started = time.time()
+        with pytest.raises(Exception, match="Timeout"):
+            await conn.send_command("set_tempo", {"tempo": 99.0})
+        # The cancel runs in the background, held until it finishes
+        assert len(conn._background_tasks) == 1
+        await asyncio.sleep(0.2)
+        assert not conn._background_tasks
+        command, cancel = received
+        assert started < command["deadline"] <= time.time()
+        assert cancel["type"] == "cancel" and cancel["params"] == {"request_id": command["id"]}
+        await conn.disconnect()
+
+    asyncio.run(scenario())
@@ -0,0 +1,803 @@
+import json
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+import fake_live
+from MCP_Server.protocol import CHUNK_HEADER, STREAMED_LENGTH, decode_header, encode_frame, read_frame
+from MCP_Server.server import AbletonConnection, command_timeout, is_mutating
+
+fake_live.install_framework_stub()
+import AbletonMCP_Remote_Script as remote  # noqa: E402
+
+
+class Live(object):
+    """A Remote Script instance on an ephemeral port, driven by the test as Live's main thread"""
+
+    def __init__(self, surface, song, port):
+        self.surface = surface
+        self.song = song
+        self.port = port
+        self.sockets = []
+
+    def connect(self, version=0):
+        """A raw client socket; a version switches it to framed messages with hello"""
+        sock = socket.create_connection(("localhost", self.port), timeout=5)
+        self.sockets.append(sock)
+        if version:
+            sock.sendall(_legacy_message("hello", {"protocol_version": version}))
+            assert _read_legacy(sock)["result"]["protocol_version"] == version
+        return sock
+
+    @contextmanager
+    def ticking(self):
+        """Call update_display every few milliseconds, as Live does"""
+        stop = threading.Event()
+
+        def run():
+            while not stop.is_set():
+                self.surface.update_display()
+                time.sleep(0.005)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join(5)
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _legacy_message(command_type, params=None):
+    return json.dumps({"type": command_type, "params": params or {}}).encode("utf-8")
+
+
+def _frame(command_type, params=None, request_id=None, version=2, **fields):
+    command = dict(fields, type=command_type, params=params or {})
+    if request_id is not None:
+        command["id"] = request_id
+    return encode_frame(command, version)
+
+
+def _recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        assert chunk, "connection closed"
+        data += chunk
+    return data
+
+
+def _read_legacy(sock):
+    buffer = b""
+    while True:
+        data = sock.recv(65536)
+        assert data, "connection closed"
+        buffer += data
+        try:
+            return json.loads(buffer.decode("utf-8"))
+        except ValueError:
+            continue
+
+
+def _subscribe(live, events):
+    """A framed client subscribed to events, with its listeners registered"""
+    sock = live.connect(version=2)
+    sock.sendall(_frame("subscribe", {"events": events}, 1))
+    with live.ticking():
+        assert read_frame(sock)[1]["status"] == "success"
+    for _ in range(3):
+        live.surface.update_display()
+    return sock
+
+
+@pytest.fixture
+def live(monkeypatch):
+    monkeypatch.setattr(remote, "DEFAULT_PORT", _free_port())
+    song = fake_live.song()
+    surface = remote.create_instance(fake_live.CInstance(song))
+    instance = Live(surface, song, remote.DEFAULT_PORT)
+    yield instance
+    for sock in instance.sockets:
+        sock.close()
+    surface.disconnect()
+
+
+def test_one_io_thread_serves_every_client(live) -> None:
+    threads = threading.active_count()
+    clients = [live.connect() for _ in range(20)]
+    for sock in clients:
+        sock.sendall(_legacy_message("ping"))
+
+    replies = [_read_legacy(sock) for sock in clients]
+    assert all(reply["status"] == "success" for reply in replies)
+    # Clients are multiplexed on the selector loop, not given threads
+    assert threading.active_count() == threads
+
+
+def test_command_params_are_bound_to_the_schema() -> None:
+    spec = remote.COMMANDS["get_track_info"]
+    kwargs = spec.bind({"track_index": "2", "fields": ["name"], "unknown": 1})
+    # Coerced to the declared types, defaults filled in, unknown params dropped
+    assert kwargs == {"track_index": 2, "fields": ["name"], "if_version": None, "offset": 0, "limit": None}
+    assert remote.COMMANDS["set_metronome"].bind({"on": 1}) == {"on": True}
+    assert remote.COMMANDS["cancel"].bind({"request_id": 7}) == {"request_id": 7}
+    with pytest.raises(ValueError, match="Missing parameter: request_id"):
+        remote.COMMANDS["cancel"].bind({})
+    with pytest.raises(ValueError):
+        remote.COMMANDS["set_tempo"].bind({"tempo": "fast"})
+
+
+def test_bad_params_get_an_error_reply(live) -> None:
+    sock = live.connect(version=2)
+    sock.sendall(_frame("cancel", {}, 1))
+    reply = read_frame(sock)[1]
+    assert (reply["id"], reply["status"], reply["message"]) == (1, "error", "Missing parameter: request_id")
+
+    with live.ticking():
+        sock.sendall(_frame("write_automation", {"track_index": 0, "clip_index": 0, "device_index": 0}, 2))
+        reply = read_frame(sock)[1]
+    assert (reply["id"], reply["status"], reply["message"]) == (2, "error", "Missing parameter: points")
+    assert live.song.tempo == 120.0
+
+
+def test_command_registry_describes_every_command(live) -> None:
+    sock = live.connect(version=2)
+    sock.sendall(_frame("get_command_registry", request_id=1))
+    registry = read_frame(sock)[1]["result"]["commands"]
+    assert set(registry) == set(remote.COMMANDS)
+    assert registry["set_tempo"] == {"thread": remote.MAIN_THREAD, "mutating": True, "timeout": 15.0,
+                                     "snapshot": False,
+                                     "params": [{"name": "tempo", "type": "float", "required": False,
+                                                 "default": 120.0}]}
+    assert registry["cancel"]["params"] == [{"name": "request_id", "type": "int", "required": True,
+                                             "default": None}]
+    assert registry["get_track_info"]["snapshot"] is True
+    assert registry["get_track_info"]["mutating"] is False
+
+    # Clients take timeouts and the mutating flag from it instead of their built-in lists
+    conn = AbletonConnection(host="localhost", port=live.port)
+    assert conn.connect()
+    try:
+        assert conn.registry == registry
+        for name, spec in remote.COMMANDS.items():
+            assert command_timeout(conn.registry, name) == spec.timeout
+            assert is_mutating(conn.registry, name) == spec.mutating
+    finally:
+        conn.disconnect()
+
+
+def test_wake_during_a_drain_is_not_lost(live) -> None:
+    surface = live.surface
+    # Stop the I/O thread so the test is the only reader of the wake socket
+    surface.running = False
+    surface._wake_pending = False
+    surface._wake()
+    surface.server_thread.join(5)
+    receiver = surface._wake_receiver
+
+    class Receiver(object):
+        """Lets the main thread wake the I/O thread halfway through a drain"""
+        def __init__(self):
+            self.calls = 0
+
+        def recv(self, size):
+            self.calls += 1
+            if self.calls == 1:
+                thread = threading.Thread(target=surface._wake)
+                thread.start()
+                thread.join()
+            return receiver.recv(size)
+
+    surface._wake()
+    surface._wake_receiver = Receiver()
+    try:
+        surface._drain_wake_socket()
+    finally:
+        surface._wake_receiver = receiver
+    # The next wake still reaches the socket
+    surface._wake()
+    receiver.settimeout(1)
+    assert receiver.recv(1) == b"\0"
+
+
+def test_frames_split_across_packets_are_reassembled(live) -> None:
+    sock = live.connect(version=2)
+    data = _frame("ping", request_id=1) + _frame("get_command_registry", request_id=2)
+    for start in range(0, len(data), 7):
+        sock.sendall(data[start:start + 7])
+        time.sleep(0.001)
+
+    replies = [read_frame(sock)[1] for _ in range(2)]
+    assert [reply["id"] for reply in replies] == [1, 2]
+    assert set(replies[1]["result"]["commands"]) == set(remote.COMMANDS)
+
+
+def test_invalid_frame_body_gets_an_error_and_keeps_the_connection(live) -> None:
+    sock = live.connect(version=2)
+    body = b"{not json"
+    sock.sendall(encode_frame({}, 2)[:5] + len(body).to_bytes(4, "big") + body)
+    reply = read_frame(sock)[1]
+    assert reply["message"].startswith("Invalid JSON")
+    # There is no id to answer, so it is flagged as concerning the whole connection
+    assert "id" not in reply
+    assert reply["connection_error"] is True
+
+    sock.sendall(_frame("ping", request_id=1))
+    assert read_frame(sock)[1]["status"] == "success"
+
+
+def test_legacy_client_sends_split_commands_on_one_connection(live) -> None:
+    sock = live.connect()
+    data = _legacy_message("set_tempo", {"tempo": 99.0})
+    with live.ticking():
+        sock.sendall(data[:9])
+        time.sleep(0.05)
+        sock.sendall(data[9:])
+        assert _read_legacy(sock)["status"] == "success"
+
+        sock.sendall(_legacy_message("get_session_info"))
+        assert _read_legacy(sock)["result"]["tempo"] == 99.0
+    assert live.song.tempo == 99.0
+
+
+def test_legacy_command_times_out_and_never_runs(live, monkeypatch) -> None:
+    monkeypatch.setattr(remote.COMMANDS["set_tempo"], "timeout", 0.2)
+    sock = live.connect()
+    sock.sendall(_legacy_message("set_tempo", {"tempo": 99.0}))
+
+    # Nothing ticks, so the main thread never gets to the command
+    reply = _read_legacy(sock)
+    assert reply == {"status": "error", "message": "Timeout waiting for operation to complete"}
+    live.surface.update_display()
+    assert live.song.tempo == 120.0
+
+    sock.sendall(_legacy_message("ping"))
+    assert _read_legacy(sock)["status"] == "success"
+
+
+def test_commands_over_the_client_limit_are_refused_as_busy(live, monkeypatch) -> None:
+    monkeypatch.setattr(remote, "MAX_PENDING_PER_CLIENT", 2)
+    sock = live.connect(version=2)
+    for request_id in (1, 2, 3):
+        sock.sendall(_frame("set_tempo", {"tempo": 100.0 + request_id}, request_id))
+
+    # Refused at once, before the main thread has run anything
+    busy = read_frame(sock)[1]
+    assert busy["id"] == 3
+    assert busy["status"] == "error"
+    assert busy["message"].startswith("Busy")
+    assert remote.BUSY_RETRY_MIN_MS <= busy["retry_after_ms"] <= remote.BUSY_RETRY_MAX_MS
+
+    with live.ticking():
+        replies = [read_frame(sock)[1] for _ in range(2)]
+        sock.sendall(_frame("get_main_thread_queue_stats", request_id=4))
+        stats = read_frame(sock)[1]["result"]
+    assert sorted((reply["id"], reply["status"]) for reply in replies) == [(1, "success"), (2, "success")]
+    assert live.song.tempo == 102.0
+    assert stats["rejected"] == 1
+    assert stats["pending"] == 0
+
+
+def test_queue_drain_stops_at_the_budget_and_leaves_the_rest(live, monkeypatch) -> None:
+    surface = live.surface
+    ran = []
+
+    def slow_set_tempo(tempo=120.0):
+        time.sleep(0.01)
+        ran.append(tempo)
+        return {"tempo": tempo}
+
+    monkeypatch.setattr(surface, "_set_tempo", slow_set_tempo)
+    sock = live.connect(version=2)
+    for request_id in range(1, 9):
+        sock.sendall(_frame("set_tempo", {"tempo": 100.0 + request_id}, request_id))
+    deadline = time.time() + 5
+    while surface._main_thread_queue.qsize() < 8 and time.time() < deadline:
+        time.sleep(0.001)
+
+    # With no budget exactly one command runs per tick
+    surface._main_thread_budget_ms = 0.0
+    for count in (1, 2):
+        surface.update_display()
+        assert len(ran) == count
+        assert surface._main_thread_queue.qsize() == 8 - count
+
+    # 10 ms commands against a 25 ms budget: a few run, the rest wait
+    surface._main_thread_budget_ms = 25.0
+    surface.update_display()
+    assert 2 < len(ran) < 8
+    assert surface._main_thread_queue.qsize() == 8 - len(ran)
+    while surface._main_thread_queue.qsize():
+        surface.update_display()
+    # In the order they were sent
+    assert ran == [100.0 + request_id for request_id in range(1, 9)]
+
+
+def test_command_past_its_deadline_is_dropped(live) -> None:
+    sock = live.connect(version=2)
+    sock.sendall(_frame("set_tempo", {"tempo": 99.0}, 1, deadline=time.time() - 1))
+
+    with live.ticking():
+        reply = read_frame(sock)[1]
+    assert reply["id"] == 1
+    assert reply["status"] == "error"
+    assert reply["cancelled"] is True
+    assert live.song.tempo == 120.0
+
+
+def test_cancel_drops_a_queued_command(live) -> None:
+    sock = live.connect(version=2)
+    sock.sendall(_frame("set_tempo", {"tempo": 99.0}, 1))
+    sock.sendall(_frame("cancel", {"request_id": 1}, 2))
+    assert read_frame(sock)[1]["result"] == {"request_id": 1, "cancelled": True, "state": "queued"}
+
+    with live.ticking():
+        reply = read_frame(sock)[1]
+    assert reply["id"] == 1
+    assert reply["cancelled"] is True
+    assert live.song.tempo == 120.0
+
+    sock.sendall(_frame("cancel", {"request_id": 1}, 3))
+    assert read_frame(sock)[1]["result"]["state"] == "finished"
+
+
+def test_cancel_needs_request_ids(live) -> None:
+    sock = live.connect(version=1)
+    sock.sendall(_frame("cancel", {"request_id": 1}, version=1))
+    assert read_frame(sock)[1]["status"] == "error"
+
+
+def _batch(live, commands, stop_on_error=True):
+    """Send a batch, run exactly one tick, then tick until it is answered"""
+    sock = live.connect(version=2)
+    sock.sendall(_frame("batch", {"commands": commands, "stop_on_error": stop_on_error}, 1))
+    # Wait for the I/O thread to queue it
+    deadline = time.time() + 5
+    while not live.surface._main_thread_queue.qsize() and time.time() < deadline:
+        time.sleep(0.001)
+    live.surface.update_display()
+    state = (live.song.tempo, live.song.tracks[0].name)
+    with live.ticking():
+        reply = read_frame(sock)[1]
+    assert reply["status"] == "success"
+    return reply["result"], state
+
+
+def test_batch_runs_every_item_in_one_tick(live) -> None:
+    result, state = _batch(live, [
+        {"type": "set_tempo", "params": {"tempo": 99.0}},
+        {"type": "set_track_name", "params": {"track_index": 0, "name": "Bass"}},
+        {"type": "get_track_info", "params": {"track_index": 0, "fields": ["name"]}},
+    ])
+    # Both changes were made by the first tick
+    assert state == (99.0, "Bass")
+    assert [item["status"] for item in result["results"]] == ["success"] * 3
+    assert [item["index"] for item in result["results"]] == [0, 1, 2]
+    assert result["results"][2]["result"]["name"] == "Bass"
+    assert all(item["elapsed_ms"] >= 0 for item in result["results"])
+    assert result["elapsed_ms"] >= sum(item["elapsed_ms"] for item in result["results"])
+    assert (result["count"], result["failed"], result["skipped"], result["stopped"]) == (3, 0, 0, False)
+
+
+def test_batch_stops_on_error_unless_asked_not_to(live) -> None:
+    commands = [
+        {"type": "set_track_name", "params": {"track_index": 9, "name": "Nope"}},
+        {"type": "batch", "params": {"commands": []}},
+        {"type": "no_such_command"},
+        {"type": "set_tempo", "params": {"tempo": 99.0}},
+    ]
+    result, _ = _batch(live, commands)
+    assert [item["status"] for item in result["results"]] == ["error", "skipped", "skipped", "skipped"]
+    assert (result["failed"], result["skipped"], result["stopped"]) == (1, 3, True)
+    assert "elapsed_ms" not in result["results"][1]
+    assert live.song.tempo == 120.0
+
+    result, _ = _batch(live, commands, stop_on_error=False)
+    items = result["results"]
+    assert [item["status"] for item in items] == ["error", "error", "error", "success"]
+    assert items[1]["message"] == "Nested batch commands are not supported"
+    assert items[2]["message"] == "Unknown command: no_such_command"
+    assert (result["failed"], result["skipped"], result["stopped"]) == (3, 0, False)
+    assert live.song.tempo == 99.0
+
+
+def test_snapshot_is_refreshed_a_part_at_a_time_within_the_budget(live, monkeypatch) -> None:
+    surface = live.surface
+    refreshed = []
+    refresh_part = surface._refresh_snapshot_part
+    monkeypatch.setattr(surface, "_refresh_snapshot_part", lambda part: refreshed.append(part) or refresh_part(part))
+    # With no budget left every tick still re-reads one part
+    monkeypatch.setattr(surface, "_main_thread_budget_ms", 0.0)
+
+    # Song-level parts, the track list and each track; published once all are read
+    for tick in range(len(remote.SNAPSHOT_LISTS) + 1 + len(live.song.tracks)):
+        assert surface._snapshot is None
+        surface.update_display()
+        assert len(refreshed) == tick + 1
+    assert surface._snapshot["session"]["tempo"] == 120.0
+
+    sock = live.connect(version=2)
+    sock.sendall(_frame("set_track_name", {"track_index": 1, "name": "Bass"}, 1))
+    sock.settimeout(0.02)
+    del refreshed[:]
+    for _ in range(250):
+        surface.update_display()
+        try:
+            reply = read_frame(sock)[1]
+            break
+        except socket.timeout:
+            continue
+    assert reply["status"] == "success"
+    # The reply was held until the track it changed had been re-read
+    assert ("track", 1) in refreshed
+    sock.settimeout(5)
+    sock.sendall(_frame("get_track_info", {"track_index": 1, "fields": ["name"]}, 2))
+    assert read_frame(sock)[1]["result"]["name"] == "Bass"
+
+
+def test_listener_changes_re_read_only_the_parts_they_touch(live, monkeypatch) -> None:
+    surface = live.surface
+    monkeypatch.setattr(remote, "SNAPSHOT_REFRESH_INTERVAL", 3600.0)
+    # Build the snapshot and let the first sweep finish
+    while surface._snapshot is None or surface._snapshot_sweep:
+        surface.update_display()
+    refreshed = []
+    refresh_part = surface._refresh_snapshot_part
+    monkeypatch.setattr(surface, "_refresh_snapshot_part", lambda part: refreshed.append(part) or refresh_part(part))
+
+    # Automation: parameters are not in the snapshot
+    for value in (0.25, 0.5, 0.75):
+        live.song.tracks[0].devices[0].parameters[0].value = value
+        surface.update_display()
+    assert refreshed == []
+
+    live.song.tracks[1].name = "Lead"
+    surface.update_display()
+    assert refreshed == [("track", 1)]
+
+    live.song.tempo = 90.0
+    surface.update_display()
+    assert refreshed == [("track", 1), "session"]
+    assert surface._snapshot["session"]["tempo"] == 90.0
+    assert surface._snapshot["tracks"][1]["name"] == "Lead"
+
+
+def test_listeners_are_rebound_only_where_objects_changed(live) -> None:
+    surface = live.surface
+    song = live.song
+    _subscribe(live, ["clip_slots", "device_parameters"])
+    track_listeners = dict((index, list(group)) for index, group in surface._track_listeners.items())
+    parameter_listeners = list(surface._parameter_listeners[0])
+
+    # Launching clips re-registers nothing
+    for track in song.tracks:
+        track.clip_slots[0].playing_status = 1
+    surface.update_display()
+    assert surface._track_listeners == track_listeners
+
+    # A new clip gets listeners of its own
+    slot = song.tracks[1].clip_slots[1]
+    slot.clip = fake_live.clip("New")
+    slot.has_clip = True
+    surface.update_display()
+    assert surface._track_listeners == track_listeners
+    assert len(surface._clip_listeners[(1, 1)]) == 1 + len(remote.CLIP_LISTENED_PROPERTIES)
+    slot.clip.name = "Renamed"
+    for _ in range(3):
+        surface.update_display()
+    assert surface._snapshot["clips"][1][1]["name"] == "Renamed"
+
+    # A new device only re-registers its track's parameter listeners
+    song.tracks[1].devices = song.tracks[1].devices + [fake_live.device("New")]
+    surface.update_display()
+    assert surface._parameter_listeners[0] == parameter_listeners
+    assert len(surface._parameter_listeners[1]) == sum(len(device.parameters) for device in song.tracks[1].devices)
+
+
+def test_send_levels_push_track_events(live) -> None:
+    song = live.song
+    mixer = song.tracks[1].mixer_device
+    mixer.sends = [fake_live.parameter("A")]
+    sock = _subscribe(live, ["tracks"])
+
+    def next_track_event():
+        with live.ticking():
+            while True:
+                message = read_frame(sock)[1]
+                changes = [c for c in message.get("changes", ()) if c["kind"] == "track"]
+                if changes:
+                    return changes[0]
+
+    mixer.sends[0].value = 0.5
+    assert next_track_event() == {"kind": "track", "track_index": 1, "name": "Track 1", "mute": False,
+                                  "solo": False, "arm": False, "volume": 0.85, "panning": 0.0, "sends": [0.5]}
+
+    # A new return track brings a send that is listened to as well
+    mixer.sends = mixer.sends + [fake_live.parameter("B")]
+    assert next_track_event()["sends"] == [0.5, 0.0]
+    for _ in range(3):
+        live.surface.update_display()
+    mixer.sends[1].value = 0.25
+    assert next_track_event()["sends"] == [0.5, 0.25]
+    assert len(live.surface._send_listeners[1]) == 2
+
+
+def _listener_count(song):
+    objects = [song]
+    for track in song.tracks:
+        objects += [track, track.mixer_device, track.mixer_device.volume, track.mixer_device.panning]
+        objects += track.mixer_device.sends
+        objects += track.clip_slots + [slot.clip for slot in track.clip_slots if slot.has_clip]
+        for device in track.devices:
+            objects += device.parameters
+    return sum(obj.listener_count() for obj in objects)
+
+
+def test_clip_and_parameter_listeners_exist_only_while_subscribed(live) -> None:
+    surface = live.surface
+    song = live.song
+    surface.update_display()
+    unsubscribed = _listener_count(song)
+    assert surface._clip_listeners == {}
+    assert surface._parameter_listeners == {}
+    assert song.tracks[0].devices[0].parameters[0].listener_count() == 0
+
+    sock = _subscribe(live, ["device_parameters"])
+    assert song.tracks[0].devices[0].parameters[0].listener_count() == 1
+    assert surface._clip_listeners == {}
+
+    sock.sendall(_frame("unsubscribe", request_id=2))
+    with live.ticking():
+        assert read_frame(sock)[1]["status"] == "success"
+    for _ in range(3):
+        surface.update_display()
+    assert _listener_count(song) == unsubscribed
+    assert not any(surface._parameter_listeners.values())
+
+
+def test_unheard_changes_still_bump_versions(live) -> None:
+    sock = live.connect(version=2)
+    with live.ticking():
+        def request(command_type, params):
+            sock.sendall(_frame(command_type, params, 1))
+            return read_frame(sock)[1]["result"]
+
+        params = {"track_index": 0, "device_index": 0}
+        parameters = request("get_device_parameters", params)
+        live.song.tracks[0].devices[0].parameters[0].value = 0.5
+        changed = request("get_device_parameters", dict(params, if_version=parameters["version"]))
+        assert changed["version"] != parameters["version"]
+        assert changed["parameters"][0]["value"] == 0.5
+
+        clip = request("get_clip_info", {"track_index": 0, "clip_index": 0})
+        live.song.tracks[0].clip_slots[0].clip.name = "Renamed"
+        live.surface._mark_snapshot([("track", 0)])
+        time.sleep(0.1)
+        renamed = request("get_clip_info", {"track_index": 0, "clip_index": 0, "if_version": clip["version"]})
+        assert renamed["name"] == "Renamed"
+        assert renamed["version"] != clip["version"]
+
+
+def test_changes_found_by_the_sweep_are_pushed(live, monkeypatch) -> None:
+    monkeypatch.setattr(remote, "SNAPSHOT_REFRESH_INTERVAL", 0.05)
+    # No clip listeners without a clip_slots subscriber
+    sock = _subscribe(live, ["tracks"])
+    live.song.tracks[0].clip_slots[0].clip.name = "Renamed"
+    with live.ticking():
+        while True:
+            changes = read_frame(sock)[1]["changes"]
+            if any(change["kind"] == "track" and change["track_index"] == 0 for change in changes):
+                break
+    assert live.surface._snapshot["clips"][0][0]["name"] == "Renamed"
+
+
+def test_session_snapshot_depths(live) -> None:
+    sock = live.connect(version=2)
+    with live.ticking():
+        snapshots = []
+        for depth in (0, 1, 2):
+            sock.sendall(_frame("get_session_snapshot", {"depth": depth}, depth))
+            snapshots.append(read_frame(sock)[1]["result"])
+
+    track = snapshots[0]["tracks"][1]
+    assert track["name"] == "Track 1"
+    assert track["sends"] == []
+    assert track["clip_slot_count"] == 4
+    assert not set(track) & {"clips", "clip_slots", "devices"}
+
+    track = snapshots[1]["tracks"][1]
+    assert [clip["index"] for clip in track["clips"]] == [0, 2]
+    assert track["clips"][0]["name"] == "Clip"
+    assert [device["name"] for device in track["devices"]] == ["Device 0", "Device 1"]
+    assert "parameters" not in track["devices"][0]
+
+    parameters = snapshots[2]["tracks"][1]["devices"][0]["parameters"]
+    assert [parameter["name"] for parameter in parameters] == ["P0", "P1", "P2", "P3"]
+    assert snapshots[2]["scenes"][3] == {"index": 3, "name": "Scene 3"}
+
+
+@pytest.fixture
+def browser(live):
+    live.surface._c_instance.application.browser = fake_live.browser()
+    return live.surface._c_instance.application.browser
+
+
+class Clock(object):
+    """Stands in for the time module: every reading is a millisecond later"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        self.now += 0.001
+        return self.now
+
+
+def _build_browser_index(surface, clock, step_ms=5):
+    steps = 0
+    while True:
+        surface._index_browser_step(clock.now + step_ms / 1000.0)
+        steps += 1
+        if surface._browser_index_pending is None:
+            return steps
+
+
+def test_browser_index_is_built_over_several_ticks(live, browser, monkeypatch) -> None:
+    surface = live.surface
+    clock = Clock()
+    monkeypatch.setattr(remote, "time", clock)
+    old = {"query:gone": object()}
+    surface._browser_index = old
+
+    surface._index_browser_step(clock.now + 0.005)
+    # Still building: lookups use the old index and what is indexed so far
+    assert surface._browser_index is old
+    assert 0 < len(surface._browser_index_next) < 5 * 9
+    assert surface._find_browser_item(browser, "query:instruments#F0") is browser.instruments.children[0]
+    assert surface._browser_index_stats["hits"] == 1
+
+    steps = _build_browser_index(surface, clock)
+    assert steps > 1
+    # The finished index replaces the old one; plugins are not indexed
+    assert surface._browser_index_next is None
+    assert "query:gone" not in surface._browser_index
+    assert len(surface._browser_index) == 5 * 9
+    assert surface._browser_index["query:drums#F1:I2"] is browser.drums.children[1].children[2]
+    assert surface._browser_index_stats["builds"] == 1
+    # Not rebuilt until BROWSER_INDEX_REFRESH_INTERVAL has passed
+    surface._index_browser_step(clock.now + 0.005)
+    assert surface._browser_index_pending is None
+
+
+def test_browser_index_misses_walk_the_browser_and_stale_uris_force_a_rebuild(live, browser, monkeypatch) -> None:
+    surface = live.surface
+    item = browser.drums.children[1].children[2]
+    assert surface._find_browser_item(browser, "query:drums#F1:I2") is item
+    assert surface._find_browser_item(browser, "query:drums#F1:I2") is item
+    assert surface._find_browser_item(browser, "query:missing") is None
+    stats = surface._browser_index_stats
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 2, 0)
+
+    surface._browser_index_built_at = time.time()
+    item.uri = "query:moved"
+    assert surface._find_browser_item(browser, "query:drums#F1:I2") is None
+    assert (stats["misses"], stats["stale"]) == (3, 1)
+    assert "query:drums#F1:I2" not in surface._browser_index
+    # The next idle ticks rebuild the index
+    assert surface._browser_index_built_at == 0.0
+    clock = Clock()
+    monkeypatch.setattr(remote, "time", clock)
+    _build_browser_index(surface, clock)
+    assert stats["builds"] == 1
+    assert surface._browser_index["query:moved"] is item
+
+
+def test_browser_paths_resume_from_the_longest_cached_prefix(live, browser) -> None:
+    surface = live.surface
+    folder = browser.drums.children[1]
+    item, depth = surface._resolve_browser_path(browser, ["drums", "folder 1", "item 1.2"])
+    assert (item, depth) == (folder.children[2], 3)
+    assert list(surface._browser_path_cache) == ["drums", "drums/folder 1", "drums/folder 1/item 1.2"]
+
+    # Cut the folder off from its category: only a walk from the cached folder finds its items
+    browser.drums.children = []
+    assert surface._resolve_browser_path(browser, ["drums", "folder 1", "item 1.0"]) == (folder.children[0], 3)
+    assert surface._resolve_browser_path(browser, ["drums", "folder 1", "item 1.2"]) == (folder.children[2], 3)
+    assert surface._resolve_browser_path(browser, ["drums", "folder 0"]) == (browser.drums, 1)
+    stats = surface._browser_index_stats
+    assert (stats["path_hits"], stats["path_misses"]) == (1, 3)
+
+
+def test_browser_path_cache_drops_renamed_and_least_recently_used_items(live, browser, monkeypatch) -> None:
+    surface = live.surface
+    monkeypatch.setattr(remote, "BROWSER_PATH_CACHE_SIZE", 4)
+    folder = browser.drums.children[0]
+    for index in range(3):
+        surface._resolve_browser_path(browser, ["drums", "folder 0", "item 0.%d" % index])
+    # Later walks start at the cached folder, so the category was used least recently
+    assert list(surface._browser_path_cache) == ["drums/folder 0/item 0.0", "drums/folder 0/item 0.1",
+                                                 "drums/folder 0", "drums/folder 0/item 0.2"]
+
+    # A cached item that no longer has the name it was found under is not used
+    folder.children[2].name = "Renamed"
+    assert surface._resolve_browser_path(browser, ["drums", "folder 0", "item 0.2"]) == (folder, 2)
+    assert "drums/folder 0/item 0.2" not in surface._browser_path_cache
+
+
+def test_browser_path_cache_is_cleared_when_the_index_is_rebuilt(live, browser, monkeypatch) -> None:
+    surface = live.surface
+    surface._resolve_browser_path(browser, ["drums", "folder 0"])
+    assert surface._browser_path_cache
+    surface._refresh_browser_index()
+    assert not surface._browser_path_cache
+
+    surface._resolve_browser_path(browser, ["drums", "folder 0"])
+    clock = Clock()
+    monkeypatch.setattr(remote, "time", clock)
+    _build_browser_index(surface, clock)
+    assert not surface._browser_path_cache
+
+
+def test_stream_frame_encodes_bounded_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(remote, "STREAM_CHUNK_SIZE", 64)
+    message = {"items": [{"name": "Pad ä %d" % i} for i in range(100)]}
+
+    parts = list(remote._stream_frame(message, 3))
+    assert decode_header(parts[0]) == (3, STREAMED_LENGTH)
+    assert parts[-1] == CHUNK_HEADER.pack(0)
+    body = b""
+    for part in parts[1:-1]:
+        (size,) = CHUNK_HEADER.unpack_from(part)
+        assert size == len(part) - CHUNK_HEADER.size
+        assert 0 < size < 4 * 64
+        body += part[CHUNK_HEADER.size:]
+    assert json.loads(body.decode("utf-8")) == message
+
+
+def test_longer_than_stops_at_the_limit() -> None:
+    assert not remote._longer_than({"name": "short"}, 100)
+    assert remote._longer_than({"names": ["x" * 10] * 1000}, 100)
+
+
+def test_large_replies_are_streamed_to_version_3_clients(live, monkeypatch) -> None:
+    monkeypatch.setattr(remote, "STREAM_THRESHOLD", 300)
+    monkeypatch.setattr(remote, "STREAM_CHUNK_SIZE", 128)
+    registry = json.loads(json.dumps({name: spec.describe() for name, spec in remote.COMMANDS.items()}))
+
+    sock = live.connect(version=3)
+    sock.sendall(_frame("get_command_registry", request_id=1, version=3) + _frame("ping", request_id=2, version=3))
+    assert decode_header(_recv_exactly(sock, remote.FRAME_HEADER.size)) == (3, STREAMED_LENGTH)
+    body = b""
+    while True:
+        (size,) = CHUNK_HEADER.unpack(_recv_exactly(sock, CHUNK_HEADER.size))
+        if not size:
+            break
+        assert size < 4 * 128
+        body += _recv_exactly(sock, size)
+    assert json.loads(body.decode("utf-8")) == {"status": "success", "result": {"commands": registry}, "id": 1}
+    # The small reply queued behind the stream follows it intact
+    assert read_frame(sock)[1]["id"] == 2
+
+    # Older clients get the same reply as one frame
+    old = live.connect(version=2)
+    old.sendall(_frame("get_command_registry", request_id=1))
+    assert decode_header(_recv_exactly(old, remote.FRAME_HEADER.size))[1] != STREAMED_LENGTH
+
+    conn = AbletonConnection(host="localhost", port=live.port)
+    assert conn.connect()
+    try:
+        assert conn.protocol_version == 3
+        assert conn.registry == registry
+        assert conn.ping()["server_start_time"] == conn.server_info["server_start_time"]
+    finally:
+        conn.disconnect()
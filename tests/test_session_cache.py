@@ -0,0 +1,108 @@
+from MCP_Server.cache import SessionCache
+
+
+def _cache() -> SessionCache:
+    cache = SessionCache()
+    cache.enable()
+    return cache
+
+
+def _fill(cache: SessionCache, command_type: str, params, result) -> None:
+    assert cache.get(command_type, params) is None
+    cache.store(command_type, params, result, cache.begin())
+
+
+def test_events_invalidate_only_what_they_touch() -> None:
+    cache = _cache()
+    _fill(cache, "get_track_info", {"track_index": 0}, {"name": "Bass"})
+    _fill(cache, "get_track_info", {"track_index": 1}, {"name": "Drums"})
+    _fill(cache, "get_device_parameters", {"track_index": 1, "device_index": 0}, {"parameters": []})
+
+    cache.apply_event({"event": "changes", "seq": 1,
+                       "changes": [{"kind": "clip_slot", "track_index": 0, "clip_index": 2}]})
+    assert cache.get("get_track_info", {"track_index": 0}) is None
+    assert cache.get("get_track_info", {"track_index": 1}) == {"name": "Drums"}
+    assert cache.get("get_device_parameters", {"track_index": 1, "device_index": 0}) == {"parameters": []}
+
+    # Inserting a track shifts indices, so every track-scoped entry goes
+    cache.apply_event({"event": "changes", "seq": 2, "changes": [{"kind": "tracks", "track_count": 3}]})
+    assert cache.get("get_track_info", {"track_index": 1}) is None
+    assert cache.get("get_device_parameters", {"track_index": 1, "device_index": 0}) is None
+
+
+def test_mutations_invalidate_and_unknown_ones_clear_all_but_static() -> None:
+    cache = _cache()
+    _fill(cache, "get_session_info", {}, {"tempo": 120.0})
+    _fill(cache, "list_scenes", {}, {"scenes": []})
+    _fill(cache, "get_application_version", {}, {"major_version": 12})
+
+    cache.apply_mutation("set_tempo", {"tempo": 128.0})
+    assert cache.get("get_session_info") is None
+    assert cache.get("list_scenes") == {"scenes": []}
+
+    cache.apply_mutation("some_future_command", {})
+    assert cache.get("list_scenes") is None
+    assert cache.get("get_application_version") == {"major_version": 12}
+
+
+def test_batch_invalidates_what_its_commands_touch() -> None:
+    cache = _cache()
+    _fill(cache, "get_session_info", {}, {"tempo": 120.0})
+    _fill(cache, "get_track_info", {"track_index": 0}, {"name": "Bass"})
+    _fill(cache, "get_track_info", {"track_index": 1}, {"name": "Drums"})
+    _fill(cache, "list_scenes", {}, {"scenes": []})
+
+    cache.apply_mutation("batch", {"commands": [
+        {"type": "set_tempo", "params": {"tempo": 128.0}},
+        {"type": "set_track_name", "params": {"track_index": 1, "name": "Perc"}},
+    ]})
+    assert cache.get("get_session_info") is None
+    assert cache.get("get_track_info", {"track_index": 1}) is None
+    assert cache.get("get_track_info", {"track_index": 0}) == {"name": "Bass"}
+    assert cache.get("list_scenes") == {"scenes": []}
+
+    # An unknown command inside a batch clears everything, as it would alone
+    cache.apply_mutation("batch", {"commands": [{"type": "some_future_command"}]})
+    assert cache.get("get_track_info", {"track_index": 0}) is None
+
+
+def test_read_in_flight_during_invalidation_is_not_stored() -> None:
+    cache = _cache()
+    token = cache.begin()
+    cache.apply_mutation("set_track_name", {"track_index": 2, "name": "Lead"})
+    cache.store("get_track_info", {"track_index": 2}, {"name": "Old"}, token)
+    assert cache.get("get_track_info", {"track_index": 2}) is None
+    # An unrelated invalidation does not discard the read
+    token = cache.begin()
+    cache.apply_mutation("rename_scene", {"scene_index": 0, "name": "Intro"})
+    cache.store("get_track_info", {"track_index": 2}, {"name": "Lead"}, token)
+    assert cache.get("get_track_info", {"track_index": 2}) == {"name": "Lead"}
+    stats = cache.stats()
+    assert stats["stale_stores"] == 1 and stats["hits"] == 1
+
+
+def test_reset_disables_until_resubscribed() -> None:
+    cache = _cache()
+    _fill(cache, "list_locators", {}, {"locators": []})
+    cache.reset()
+    assert not cache.cacheable("list_locators")
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidated_versioned_reply_is_kept_for_revalidation() -> None:
+    cache = _cache()
+    params = {"track_index": 0, "device_index": 1}
+    _fill(cache, "get_device_parameters", params, {"parameters": [], "version": 7})
+    _fill(cache, "list_scenes", {}, {"scenes": []})
+
+    cache.invalidate([("device", 0, 1), ("scenes",)])
+    assert cache.get("get_device_parameters", params) is None
+    assert cache.stale("get_device_parameters", params) == {"parameters": [], "version": 7}
+    # Replies without a version cannot be revalidated
+    assert cache.stale("list_scenes") is None
+
+    token = cache.begin()
+    cache.store("get_device_parameters", params, {"parameters": [], "version": 7}, token, not_modified=True)
+    assert cache.get("get_device_parameters", params) == {"parameters": [], "version": 7}
+    assert cache.stale("get_device_parameters", params) is None
+    assert cache.stats()["not_modified"] == 1